@@ -0,0 +1,150 @@
+# actors.py
+# 🔥 [NEW] 방 단위 액터 (메일박스)
+#
+# 한 방의 GameState를 바꾸는 모든 작업(소켓 이벤트, 턴 타이머, 게임 시작 같은 백그라운드 작업)은
+# room_actors.post(room_id, fn, *args)로 그 방의 메일박스에 넣습니다.
+# 방마다 메일박스를 비우는 태스크가 최대 하나만 돌며 작업을 들어온 순서대로 하나씩 실행하므로,
+# 작업이 emit/sleep 중에 양보하더라도 같은 방의 다른 작업이 끼어들지 않습니다 (락 불필요).
+# 서로 다른 방은 각자의 태스크(그린스레드)에서 동시에 진행됩니다.
+#
+# 소켓 이벤트에서 post하면 요청의 sid/namespace를 함께 담아 두었다가, 실행할 때
+# 같은 sid로 요청 컨텍스트를 다시 만들어 줍니다 (request.sid, emit 등이 그대로 동작).
+# 작업 하나가 낸 emit은 outbox에 모였다가 작업이 끝날 때(요청 컨텍스트 안에서) 한 번에 나갑니다.
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from flask import current_app, has_request_context, request
+
+import metrics
+import outbox
+import profiler
+from logs import get_logger
+
+log = get_logger("game")
+
+
+class _Mail:
+    __slots__ = ("fn", "args", "app", "sid", "namespace", "posted_at", "label")
+
+    def __init__(self, fn: Callable, args: tuple, app, sid: Optional[str], namespace: Optional[str],
+                 label: Optional[str] = None):
+        self.fn = fn
+        self.args = args
+        self.label = label or getattr(fn, "__name__", "task")
+        self.app = app
+        self.sid = sid
+        self.namespace = namespace
+        self.posted_at = time.monotonic()
+
+
+class RoomActor:
+    __slots__ = ("room_id", "mailbox", "running")
+
+    def __init__(self, room_id: str):
+        self.room_id = room_id
+        self.mailbox: Deque[_Mail] = deque()
+        self.running = False
+
+
+class RoomActors:
+    def __init__(self, spawn: Optional[Callable] = None):
+        self._spawn = spawn
+        self._actors: Dict[str, RoomActor] = {}
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.errors = 0
+        self.max_depth = 0      # 메일박스 최대 깊이 (전체 방 중)
+        self.max_wait = 0.0     # post -> 실행 시작까지 최대 대기 (초)
+
+    def post(self, room_id: str, fn: Callable, *args,
+             sid: Optional[str] = None, namespace: Optional[str] = None, app=None,
+             label: Optional[str] = None) -> None:
+        """
+        room_id의 메일박스에 fn(*args) 추가. 소켓 이벤트 안이면 현재 sid를 자동으로 담음.
+        label은 지표(/metrics)에 쓰는 작업 이름 (기본 fn.__name__)
+        """
+        if sid is None and has_request_context() and getattr(request, "sid", None):
+            sid = request.sid
+            namespace = getattr(request, "namespace", "/")
+            app = current_app._get_current_object()
+        mail = _Mail(fn, args, app, sid, namespace or "/", label)
+        with self._lock:
+            actor = self._actors.get(room_id)
+            if actor is None:
+                actor = self._actors[room_id] = RoomActor(room_id)
+            actor.mailbox.append(mail)
+            if len(actor.mailbox) > self.max_depth:
+                self.max_depth = len(actor.mailbox)
+            if actor.running:
+                return
+            actor.running = True
+        self._start(actor)
+
+    def _start(self, actor: RoomActor):
+        if self._spawn is None:
+            from extensions import socketio
+            self._spawn = socketio.start_background_task
+        self._spawn(self._drain, actor)
+
+    def _drain(self, actor: RoomActor):
+        while True:
+            with self._lock:
+                if not actor.mailbox:
+                    actor.running = False
+                    # 빈 액터는 지워서 끝난 방이 남지 않게 함 (다음 post에서 새로 생성)
+                    if self._actors.get(actor.room_id) is actor:
+                        del self._actors[actor.room_id]
+                    return
+                mail = actor.mailbox.popleft()
+            started = time.monotonic()
+            wait = started - mail.posted_at
+            if wait > self.max_wait:
+                self.max_wait = wait
+            metrics.room_task_wait.observe(wait)
+            self._run(actor, mail)
+            self.processed += 1
+            metrics.room_task_duration.observe(time.monotonic() - started, mail.label)
+
+    def _run(self, actor: RoomActor, mail: _Mail):
+        tagged = profiler.active and profiler.tag_frame(sys._getframe(), room=actor.room_id, task=mail.label)
+        try:
+            if mail.sid is not None and mail.app is not None:
+                with mail.app.test_request_context("/socket.io/"):
+                    request.sid = mail.sid
+                    request.namespace = mail.namespace
+                    with outbox.collect():
+                        mail.fn(*mail.args)
+            else:
+                with outbox.collect():
+                    mail.fn(*mail.args)
+        except Exception as e:
+            self.errors += 1
+            log.exception("❌ Room actor error (%s, %s): %s", actor.room_id, getattr(mail.fn, "__name__", mail.fn), e)
+        finally:
+            if tagged:
+                profiler.untag_frame(sys._getframe())
+
+    def depth(self, room_id: str) -> int:
+        actor = self._actors.get(room_id)
+        return len(actor.mailbox) if actor else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """메일박스 깊이 지표 (활성 방 수, 현재/최대 깊이, 최대 대기 시간)"""
+        with self._lock:
+            actors = list(self._actors.values())
+        depths = [len(a.mailbox) for a in actors]
+        return {
+            "active_rooms": len(actors),
+            "queued": sum(depths),
+            "max_depth_now": max(depths, default=0),
+            "max_depth_seen": self.max_depth,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "processed": self.processed,
+            "errors": self.errors,
+        }
+
+
+room_actors = RoomActors()
@@ -0,0 +1,166 @@
+# aio.py
+# 🔥 [NEW] asyncio 서버 모드 (python-socketio AsyncServer + ASGI)
+#
+# eventlet 몽키패치 없이 하나의 asyncio 이벤트 루프에서 돌아갑니다.
+# 기존 핸들러(general/lobby/game_events)는 그대로 두고, 각 이벤트를 greenlet 위의 코루틴으로 실행합니다.
+#   - greenlet_spawn(fn, *args): 동기 함수 fn을 greenlet에서 실행하는 코루틴
+#   - await_only(coro): greenlet_spawn 안의 동기 코드에서 코루틴을 await (루프로 양보)
+# socketio.emit / join_room / socketio.sleep / start_background_task 등은 AsyncServerBridge가
+# await_only로 AsyncServer의 코루틴에 연결하므로, 핸들러 코드는 두 모드에서 동일합니다.
+#
+# 한계: 단일 프로세스 전용 (멀티 워커 cluster/store 구독은 블로킹 redis 클라이언트를 씀)
+#
+#     uvicorn asgi:app --host 0.0.0.0 --port 5000
+import asyncio
+import sys
+import time
+from typing import Any, Callable, Optional
+
+import greenlet
+import socketio as socketio_pkg
+
+from logs import get_logger
+
+log = get_logger("game")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class _BridgeGreenlet(greenlet.greenlet):
+    """greenlet_spawn이 만든 greenlet. driver는 코루틴을 대신 await해 주는 부모 greenlet"""
+
+    def __init__(self, fn: Callable, driver: greenlet.greenlet):
+        super().__init__(fn, driver)
+        self.driver = driver
+
+
+def in_bridge() -> bool:
+    """현재 greenlet_spawn 안(= await_only 사용 가능)인지"""
+    return isinstance(greenlet.getcurrent(), _BridgeGreenlet)
+
+
+def await_only(awaitable) -> Any:
+    """greenlet_spawn 안의 동기 코드에서 awaitable을 기다림 (이벤트 루프는 그동안 다른 작업을 처리)"""
+    current = greenlet.getcurrent()
+    if not isinstance(current, _BridgeGreenlet):
+        raise RuntimeError("await_only() must be called inside greenlet_spawn()")
+    return current.driver.switch(awaitable)
+
+
+async def greenlet_spawn(fn: Callable, *args, **kwargs) -> Any:
+    """fn(*args, **kwargs)을 greenlet에서 실행. fn이 await_only로 넘긴 awaitable은 여기서 await"""
+    context = _BridgeGreenlet(fn, greenlet.getcurrent())
+    result = context.switch(*args, **kwargs)
+    while not context.dead:
+        try:
+            value = await result
+        except BaseException:
+            result = context.throw(*sys.exc_info())
+        else:
+            result = context.switch(value)
+    return result
+
+
+def _run(coro) -> Any:
+    """동기 코드에서 AsyncServer 코루틴 실행: greenlet 안이면 await, 루프 스레드면 태스크로, 다른 스레드면 루프에 위임"""
+    if in_bridge():
+        return await_only(coro)
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is not None:
+        return running.create_task(coro)
+    if _loop is None:
+        coro.close()
+        raise RuntimeError("asyncio server loop is not running")
+    return asyncio.run_coroutine_threadsafe(coro, _loop)
+
+
+class AsyncServerBridge:
+    """
+    Flask-SocketIO의 socketio.server 자리에 들어가는 동기 API.
+    extensions.socketio / flask_socketio.emit / join_room 등이 부르는 메서드만 AsyncServer로 연결합니다.
+    """
+
+    def __init__(self, sio: socketio_pkg.AsyncServer):
+        self.sio = sio
+        self.async_mode = "asgi"
+        self.eio = sio.eio
+
+    @property
+    def manager(self):
+        return self.sio.manager
+
+    def emit(self, event, *args, namespace=None, to=None, skip_sid=None, callback=None, **kwargs):
+        to = to or kwargs.pop("room", None)
+        data = args[0] if len(args) == 1 else (args or None)
+        return _run(self.sio.emit(event, data, to=to, skip_sid=skip_sid, namespace=namespace,
+                                  callback=callback, **kwargs))
+
+    def send(self, data, namespace=None, to=None, skip_sid=None, callback=None, **kwargs):
+        return _run(self.sio.send(data, to=to, skip_sid=skip_sid, namespace=namespace, callback=callback, **kwargs))
+
+    def enter_room(self, sid, room, namespace=None):
+        return _run(self.sio.enter_room(sid, room, namespace=namespace))
+
+    def leave_room(self, sid, room, namespace=None):
+        return _run(self.sio.leave_room(sid, room, namespace=namespace))
+
+    def close_room(self, room, namespace=None):
+        return _run(self.sio.close_room(room, namespace=namespace))
+
+    def rooms(self, sid, namespace=None):
+        return self.sio.rooms(sid, namespace=namespace)
+
+    def disconnect(self, sid, namespace=None):
+        return _run(self.sio.disconnect(sid, namespace=namespace))
+
+    def get_environ(self, sid, namespace=None):
+        return self.sio.get_environ(sid, namespace=namespace)
+
+    def start_background_task(self, target: Callable, *args, **kwargs):
+        return self.sio.start_background_task(greenlet_spawn, target, *args, **kwargs)
+
+    def sleep(self, seconds: float = 0):
+        if in_bridge():
+            return await_only(asyncio.sleep(seconds))
+        # greenlet 밖(HTTP 라우트 스레드 등)에서는 그 스레드만 멈춤
+        time.sleep(seconds)
+
+
+def _bridge_handler(flask_app, handler: Callable, message: str) -> Callable:
+    """Flask-SocketIO가 보관한 (sid, *args) 핸들러를 AsyncServer용 코루틴 핸들러로 감쌈"""
+
+    async def coroutine_handler(sid, *args):
+        if message == "connect" and args and isinstance(args[0], dict):
+            # Flask-SocketIO가 요청 컨텍스트를 만들 때 쓰는 키 (WSGI 모드에서는 미들웨어가 넣어 줌)
+            args[0]["flask.app"] = flask_app
+        return await greenlet_spawn(handler, sid, *args)
+
+    coroutine_handler.__name__ = getattr(handler, "__name__", message)
+    return coroutine_handler
+
+
+def init_app(flask_app, socketio_ext, message_queue: Optional[str] = None, **server_options):
+    """
+    extensions.socketio(Flask-SocketIO)를 AsyncServer에 연결하고 ASGI 앱을 반환.
+    Flask 라우트(/api/leaderboard 등)는 asgiref의 WsgiToAsgi로 스레드 풀에서 실행됩니다.
+    """
+    if message_queue:
+        raise RuntimeError("ASGI mode runs a single worker; unset SOCKETIO_MESSAGE_QUEUE")
+    from asgiref.wsgi import WsgiToAsgi
+
+    sio = socketio_pkg.AsyncServer(async_mode="asgi", **server_options)
+    for message, handler, namespace in socketio_ext.handlers:
+        sio.on(message, _bridge_handler(flask_app, handler, message), namespace=namespace)
+    socketio_ext.server = AsyncServerBridge(sio)
+    socketio_ext.async_mode = "asgi"
+    flask_app.extensions["socketio"] = socketio_ext
+
+    def _on_startup():
+        global _loop
+        _loop = asyncio.get_running_loop()
+        log.info("🚀 ASGI Socket.IO server ready")
+
+    return socketio_pkg.ASGIApp(sio, other_asgi_app=WsgiToAsgi(flask_app), on_startup=_on_startup)
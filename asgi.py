@@ -0,0 +1,9 @@
+"""ASGI entry point (asyncio 모드, eventlet 불필요)
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+import os
+
+os.environ.setdefault("SOCKETIO_SERVER", "asgi")
+
+from main import asgi_app as app  # noqa: E402
@@ -0,0 +1,69 @@
+"""
+방 단위 액터(메일박스) vs 이벤트마다 백그라운드 태스크(legacy): 같은 방 상태 갱신의 정확성/비용
+
+--rooms개의 방에 각각 --events개의 작업을 동시에 넣습니다. 각 작업은 방 카운터를 읽고,
+emit처럼 한 번 양보(sleep 0)한 뒤 +1을 씁니다. legacy는 작업들이 서로 끼어들어 갱신이 사라지고,
+actor는 방마다 순서대로 실행되므로 카운터가 정확히 --events가 됩니다.
+메일박스 지표(최대 깊이/최대 대기)도 함께 출력합니다.
+
+    python bench/bench_actors.py --rooms 500 --events 20
+    python bench/bench_actors.py --rooms 500 --events 20 --mode legacy
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402,F401
+from actors import room_actors  # noqa: E402
+from extensions import socketio  # noqa: E402
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--mode", choices=["actor", "legacy"], default="actor")
+    args = parser.parse_args()
+
+    counters = {f"room{r}": 0 for r in range(args.rooms)}
+    done = {"n": 0}
+
+    def apply(room_id):
+        value = counters[room_id]
+        socketio.sleep(0)  # emit 등에서 양보하는 지점
+        counters[room_id] = value + 1
+        done["n"] += 1
+
+    total = args.rooms * args.events
+    started = time.perf_counter()
+    for _ in range(args.events):
+        for room_id in counters:
+            if args.mode == "actor":
+                room_actors.post(room_id, apply, room_id)
+            else:
+                socketio.start_background_task(apply, room_id)
+    while done["n"] < total:
+        socketio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+
+    lost = sum(args.events - v for v in counters.values())
+    result = {
+        "mode": args.mode,
+        "rooms": args.rooms,
+        "events_per_room": args.events,
+        "elapsed_ms": round(elapsed * 1e3, 1),
+        "us_per_event": round(elapsed / total * 1e6, 2),
+        "lost_updates": lost,
+        "rooms_with_lost_updates": sum(1 for v in counters.values() if v != args.events),
+    }
+    if args.mode == "actor":
+        result["mailbox"] = room_actors.stats()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,63 @@
+"""
+eventlet(WSGI, gunicorn) vs asyncio(ASGI, uvicorn) 단일 워커 비교
+
+모드마다 서버를 새로 띄우고 bench/loadtest.py 봇 부하를 걸어
+연결 수(connected), 초당 이벤트(actions_per_s), 액션 왕복 지연(p50/p95/p99)을 비교합니다.
+
+    python bench/bench_asgi.py --bots 200 --duration 60
+    python bench/bench_asgi.py --modes asgi --bots 1000 --ramp 0.005
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import loadtest  # noqa: E402
+from bench_scaleout import stop, wait_http  # noqa: E402
+
+
+def start_server(mode, port):
+    env = dict(os.environ)
+    env.pop("SOCKETIO_MESSAGE_QUEUE", None)
+    if mode == "eventlet":
+        env.update(GUNICORN_WORKERS="1", GUNICORN_BIND=f"127.0.0.1:{port}")
+        cmd = ["gunicorn", "-c", "gunicorn_config.py", "wsgi:app"]
+    else:
+        cmd = ["uvicorn", "asgi:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=["eventlet", "asgi"], default=["eventlet", "asgi"])
+    parser.add_argument("--bots", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--think", type=float, default=0.2)
+    parser.add_argument("--ramp", type=float, default=0.02)
+    parser.add_argument("--port", type=int, default=5300)
+    args = parser.parse_args()
+
+    results = []
+    for i, mode in enumerate(args.modes):
+        port = args.port + i
+        server = start_server(mode, port)
+        try:
+            url = f"http://127.0.0.1:{port}"
+            if not wait_http(url):
+                results.append({"mode": mode, "error": "server did not start"})
+                continue
+            result = loadtest.run(url, args.bots, args.duration, think=args.think, ramp=args.ramp)
+            result["mode"] = mode
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+        finally:
+            stop(server)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+broadcast_in_game_state 마이크로벤치마크: 공개 뷰 캐시 vs 수신자별 전체 직렬화(legacy)
+
+실제 emit 대신 페이로드만 모으고, 브로드캐스트 1회당
+- 소요 시간 (µs)
+- 브로드캐스트 동안 새로 할당된 메모리 피크 (tracemalloc, 바이트)
+를 측정합니다. 매 브로드캐스트 사이에 타일 공개/삽입 같은 한 수를 흉내 냅니다.
+
+    python bench/bench_broadcast.py --players 4 --hand 8 --reveal 0.4
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+from game_logic import prepare_tiles, deal_initial_hands, auto_insert_index  # noqa: E402
+from models import GameState, Player  # noqa: E402
+from state import rooms  # noqa: E402
+
+
+def make_room(room_id: str, n_players: int, hand_size: int, reveal_ratio: float) -> GameState:
+    gs = GameState(
+        players=[], piles={"black": [], "white": []}, same_number_order="black-first",
+        current_turn=0, drawn_tile=None, pending_placement=False, can_place_anywhere=False,
+        next_tile_id=0,
+    )
+    for i in range(n_players):
+        gs.players.append(Player(sid=f"sid{i}", uid=f"uid{i}", id=i, name=f"p{i}", nickname=f"p{i}",
+                                 money=100000, bet_amount=10000))
+    prepare_tiles(gs)
+    deal_initial_hands(gs)
+    for p in gs.players:
+        while len(p.hand) < hand_size and (gs.piles["black"] or gs.piles["white"]):
+            pile = gs.piles["black"] or gs.piles["white"]
+            t = pile.pop()
+            p.hand.insert(auto_insert_index(gs, p.hand, t), t)
+        for t in p.hand:
+            t.revealed = random.random() < reveal_ratio
+    gs.recount()  # 손패/공개를 직접 만졌으므로 카운터 재계산
+    gs.game_started = True
+    gs.turn_phase = "GUESSING"
+    gs.turn_start_time = time.time()
+    rooms[room_id] = gs
+    return gs
+
+
+def legacy_broadcast(room_id: str, sink: list):
+    """변경 전 broadcast_in_game_state의 뷰 생성 방식 (비교용)"""
+    gs = rooms[room_id]
+    for p_to_send in gs.players:
+        sink.append({
+            "players": [utils.serialize_player(p, is_self=(p.sid == p_to_send.sid)) for p in gs.players],
+            "piles": {"black": len(gs.piles["black"]), "white": len(gs.piles["white"])},
+            "sameNumberOrder": gs.same_number_order,
+            "currentTurn": gs.current_turn,
+            "pendingPlacement": gs.pending_placement,
+            "canPlaceAnywhere": gs.can_place_anywhere,
+            "drawnTile": utils.serialize_tile(gs.drawn_tile, is_self=False),
+            "phase": gs.turn_phase,
+            "remainingTime": 0,
+            "payoutResults": gs.payout_results,
+        })
+
+
+def simulate_move(gs: GameState):
+    """한 수 흉내: 아직 안 뒤집힌 타일 하나를 공개"""
+    hidden = [t for p in gs.players for t in p.hand if not t.revealed]
+    if hidden:
+        random.choice(hidden).revealed = True
+    else:
+        for p in gs.players:
+            for t in p.hand:
+                t.revealed = False
+
+
+def measure(fn, gs, iterations):
+    # 시간
+    started = time.perf_counter()
+    for _ in range(iterations):
+        simulate_move(gs)
+        fn()
+    elapsed = (time.perf_counter() - started) / iterations
+
+    # 할당 (tracemalloc: 브로드캐스트 1회 동안 새로 잡힌 메모리의 피크)
+    peaks = 0
+    tracemalloc.start()
+    for _ in range(iterations):
+        simulate_move(gs)
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks += peak - base
+    tracemalloc.stop()
+    return {"us_per_broadcast": elapsed * 1e6, "alloc_peak_bytes": peaks / iterations}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--hand", type=int, default=8)
+    parser.add_argument("--reveal", type=float, default=0.4)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    random.seed(42)
+
+    payloads = []
+    utils.socketio.emit = lambda event, payload, **kw: payloads.append(payload)
+
+    gs = make_room("bench", args.players, args.hand, args.reveal)
+
+    # 정합성: 캐시 경로와 legacy 경로가 같은 뷰를 만드는지 확인
+    legacy = []
+    legacy_broadcast("bench", legacy)
+    payloads.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        utils.broadcast_in_game_state("bench")
+    for a, b in zip(legacy, payloads):
+        assert a["players"] == b["players"], "cached view differs from legacy serialization"
+
+    with contextlib.redirect_stdout(io.StringIO()):  # 브로드캐스트 디버그 출력 제외
+        cached = measure(lambda: (payloads.clear(), utils.broadcast_in_game_state("bench")), gs, args.iterations)
+        legacy = measure(lambda: legacy_broadcast("bench", []), gs, args.iterations)
+    result = {
+        "players": args.players,
+        "hand": args.hand,
+        "reveal": args.reveal,
+        "cached": cached,
+        "legacy": legacy,
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
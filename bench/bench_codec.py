@@ -0,0 +1,124 @@
+"""
+Socket.IO 패킷 코덱 벤치마크: JSON 텍스트 vs MessagePack (codec.py)
+
+4인 방(초반/후반 손패 x 공개 비율 0.2/0.7)에서 실제로 나가는 메시지를 만들어 종류별로 비교합니다.
+- state_update          : 수신자별 전체 스냅샷 (broadcast_in_game_state)
+- state_delta           : 타일 하나가 공개된 뒤의 델타 (델타 모드 + ack한 수신자)
+- game:turn_phase_start : DRAWING 페이즈 알림
+- game:payout_result    : 4명 정산 결과
+
+메시지 종류마다
+- bytes       : 전송되는 프레임 크기 (JSON은 engine.io "4" 접두사 포함 텍스트, msgpack은 바이너리 본문)
+- encode_us   : 패킷 -> 프레임 (서버 emit 1회에 한 번)
+- decode_us   : 프레임 -> 패킷 (Python 쪽: 봇/서버가 받는 방향)
+를 --repeat번 중 가장 빠른 값으로 기록합니다.
+negotiated_overhead_us는 협상 모드(CodecPacket)가 JSON 수신자만 있는 emit에 더하는 비용입니다.
+
+    python bench/bench_codec.py --number 2000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from engineio import packet as eio_packet  # noqa: E402
+from socketio import packet  # noqa: E402
+
+import utils  # noqa: E402
+from bench_broadcast import make_room  # noqa: E402
+from codec import CodecPacket, encode_msgpack  # noqa: E402
+from state import rooms  # noqa: E402
+from state_sync import ClientSync  # noqa: E402
+
+
+def capture(fn):
+    sent = []
+    utils.socketio.emit = lambda event, data=None, **kw: sent.append((event, data))
+    fn()
+    return sent
+
+
+def room_messages(hand, reveal):
+    """한 방에서 나가는 (event, data) 목록"""
+    gs = make_room("codec", 4, hand, reveal)
+    for p in gs.players:
+        gs.client_sync[p.sid] = ClientSync(delta=True)
+    messages = capture(lambda: utils.broadcast_in_game_state("codec"))
+    for sync in gs.client_sync.values():
+        sync.acked_version = sync.sent_version
+    hidden = [t for p in gs.players for t in p.hand if not t.revealed]
+    if hidden:
+        random.choice(hidden).revealed = True
+        messages += capture(lambda: utils.broadcast_in_game_state("codec"))
+    messages.append(("game:turn_phase_start", {
+        "phase": "DRAWING", "timer": 30, "currentTurnUid": gs.players[0].uid, "reason": None,
+        "available_piles": ["black", "white"],
+    }))
+    messages.append(("game:payout_result", [{
+        "uid": p.uid, "nickname": p.nickname, "rank": rank, "bet": p.bet_amount,
+        "net_change": p.bet_amount * 3 if rank == 1 else -p.bet_amount, "new_total": p.money,
+    } for rank, p in enumerate(gs.players, start=1)]))
+    rooms.clear()
+    return messages
+
+
+def best_us(fn, number, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best * 1e6
+
+
+def measure(event, data, number, repeat):
+    pkt = packet.Packet(packet.EVENT, data=[event, data])
+    text = pkt.encode()
+    binary = encode_msgpack(pkt)
+    json_frame = eio_packet.Packet(eio_packet.MESSAGE, text).encode()
+    codec_pkt = CodecPacket(packet.EVENT, data=[event, data])
+    return {
+        "json_bytes": len(json_frame.encode("utf-8")),
+        "msgpack_bytes": len(binary),
+        "json_encode_us": best_us(pkt.encode, number, repeat),
+        "msgpack_encode_us": best_us(lambda: encode_msgpack(pkt), number, repeat),
+        "json_decode_us": best_us(lambda: packet.Packet(encoded_packet=text), number, repeat),
+        "msgpack_decode_us": best_us(lambda: CodecPacket(encoded_packet=binary), number, repeat),
+        "negotiated_overhead_us": best_us(codec_pkt.encode, number, repeat) - best_us(pkt.encode, number, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="측정 1회당 반복 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(7)
+    by_kind = {}
+    for hand in (3, 6):
+        for reveal in (0.2, 0.7):
+            for event, data in room_messages(hand, reveal):
+                by_kind.setdefault(event, []).append(measure(event, data, args.number, args.repeat))
+
+    result = {}
+    for event, rows in by_kind.items():
+        avg = {key: sum(r[key] for r in rows) / len(rows) for key in rows[0]}
+        result[event] = {
+            "messages": len(rows),
+            **{key: round(value, 1 if key.endswith("bytes") else 3) for key, value in avg.items()},
+            "bytes_ratio": round(avg["msgpack_bytes"] / avg["json_bytes"], 3),
+            "encode_ratio": round(avg["msgpack_encode_us"] / avg["json_encode_us"], 3),
+            "decode_ratio": round(avg["msgpack_decode_us"] / avg["json_decode_us"], 3),
+        }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
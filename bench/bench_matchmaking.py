@@ -0,0 +1,93 @@
+"""
+매칭 대기열 벤치마크: MatchQueue(deque + uid/sid 인덱스) vs 기존 리스트 대기열(legacy)
+
+대기 인원을 --waiting명으로 채운 뒤 입장/이탈/재접속 1회 비용(µs)과,
+한 번의 매칭 패스로 꺼낸 그룹 수와 소요 시간을 측정합니다.
+legacy는 기존 on_join_queue(선형 탐색), on_leave_queue(리스트 재생성), check_queue_match(pop(0) x4, 1그룹)와 같습니다.
+
+    python bench/bench_matchmaking.py --waiting 10000 --ops 2000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matchmaking import MatchQueue  # noqa: E402
+
+UPDATE_KEYS = ("sid", "money", "bet_amount")
+
+
+def entry(i, sid=None):
+    return {"sid": sid or f"sid{i}", "uid": f"uid{i}", "name": f"p{i}", "money": 100000, "bet_amount": 1000}
+
+
+class LegacyQueue:
+    def __init__(self):
+        self.queue = []
+
+    def upsert(self, e, update_keys):
+        for p in self.queue:
+            if p["uid"] == e["uid"]:
+                old = p["sid"]
+                for k in update_keys:
+                    p[k] = e[k]
+                return old
+        self.queue.append(e)
+        return None
+
+    def remove_sid(self, sid):
+        self.queue = [p for p in self.queue if p["sid"] != sid]
+
+    def pop_groups(self, n):
+        if len(self.queue) < n:
+            return []
+        return [[self.queue.pop(0) for _ in range(n)]]
+
+
+def timed(fn, args_list):
+    started = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - started) / max(1, len(args_list)) * 1e6
+
+
+def run(make, waiting, ops, rng):
+    q = make()
+    for i in range(waiting):
+        q.upsert(entry(i), UPDATE_KEYS)
+    n = waiting
+    joins = [(entry(n + k), UPDATE_KEYS) for k in range(ops)]
+    reconnects = [(entry(i, sid=f"re{i}"), UPDATE_KEYS) for i in rng.sample(range(waiting), ops)]
+    leaves = [(f"re{args[0]['uid'][3:]}",) for args in reconnects]
+    result = {
+        "join_us": timed(q.upsert, joins),
+        "reconnect_us": timed(q.upsert, reconnects),
+        "leave_us": timed(q.remove_sid, leaves),
+    }
+    started = time.perf_counter()
+    groups = q.pop_groups(4)
+    result["match_pass_ms"] = (time.perf_counter() - started) * 1e3
+    result["groups_per_pass"] = len(groups)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--waiting", type=int, default=10000)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    result = {
+        "waiting": args.waiting,
+        "match_queue": run(MatchQueue, args.waiting, args.ops, random.Random(1)),
+        "legacy": run(LegacyQueue, args.waiting, args.ops, random.Random(1)),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+/metrics 계측 오버헤드: 계측 on vs off (METRICS_ENABLED=0 + 기록 함수 no-op)
+
+--rooms개의 4인 게임을 매칭으로 시작한 뒤, 모든 플레이어가 request_game_state(방 액터 -> 개인화 상태
+브로드캐스트)를 --rounds번 보내는 동안의 CPU 시간을 모드별로 측정합니다.
+각 모드는 별도 프로세스에서 번갈아 --repeat번 돌리고 최솟값으로 비교합니다 (계측은 임포트 시점에 설치되므로).
+
+    python bench/bench_metrics.py --rooms 50 --rounds 40
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_workload(rooms, rounds):
+    sys.path.insert(0, ROOT)
+    import metrics
+    if not metrics.METRICS_ENABLED:
+        # 방 액터/브로드캐스트/Firestore 기록까지 모두 끈 기준선
+        metrics.Counter.inc = lambda *a, **k: None
+        metrics.Histogram.observe = lambda *a, **k: None
+    import main
+    from extensions import socketio
+    from actors import room_actors
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        clients = [socketio.test_client(main.app) for _ in range(rooms * 4)]
+        for i, c in enumerate(clients):
+            c.emit("join_queue", {"uid": f"u{i}", "nickname": f"n{i}", "money": 10 ** 9, "betAmount": 1000})
+        socketio.sleep(2.0)
+    room_of = {}
+    for i, c in enumerate(clients):
+        for ev in c.get_received():
+            if ev["name"] == "match:success":
+                room_of[i] = ev["args"][0]["roomId"]
+
+    cpu0 = time.process_time()
+    events = 0
+    for _ in range(rounds):
+        for i, room_id in room_of.items():
+            clients[i].emit("request_game_state", {"roomId": room_id})
+            events += 1
+        target = room_actors.processed + len(room_of)
+        while room_actors.processed < target:
+            socketio.sleep(0)
+        for c in clients:
+            c.get_received()
+    cpu = time.process_time() - cpu0
+    return {"events": events, "cpu_s": cpu, "us_per_event": cpu / max(1, events) * 1e6}
+
+
+def measure_direct(n=200000):
+    """이벤트 하나가 거치는 계측 코드만 따로: 핸들러 래퍼 + 액터 대기/실행 + 브로드캐스트 시간/팬아웃 기록"""
+    sys.path.insert(0, ROOT)
+    import metrics
+
+    def handler(data):
+        return data
+
+    timed = metrics.timed_handler("bench", handler)
+    started = time.perf_counter()
+    for _ in range(n):
+        handler(None)
+    base = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(n):
+        timed(None)
+        metrics.room_task_wait.observe(0.0001)
+        metrics.room_task_duration.observe(0.002, "bench")
+        metrics.broadcast_duration.observe(0.001)
+        metrics.broadcast_fanout.observe(4)
+    return (time.perf_counter() - started - base) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_workload(args.rooms, args.rounds)))
+        return
+
+    result = {"rooms": args.rooms, "rounds": args.rounds}
+    runs = {"off": [], "on": []}
+    for _ in range(args.repeat):
+        # 번갈아 실행해 기계 상태 변화가 한쪽에만 몰리지 않게 함
+        for mode, enabled in (("off", "0"), ("on", "1")):
+            env = dict(os.environ, METRICS_ENABLED=enabled, LOG_LEVEL="WARNING")
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker",
+                                  "--rooms", str(args.rooms), "--rounds", str(args.rounds)],
+                                 env=env, capture_output=True, text=True, check=True).stdout
+            runs[mode].append(json.loads(out.strip().splitlines()[-1]))
+    for mode, samples in runs.items():
+        result[mode] = {
+            "events": samples[0]["events"],
+            "us_per_event_min": round(min(r["us_per_event"] for r in samples), 2),
+            "us_per_event_median": round(statistics.median(r["us_per_event"] for r in samples), 2),
+        }
+    off, on = result["off"]["us_per_event_min"], result["on"]["us_per_event_min"]
+    result["overhead_pct"] = round((on - off) / off * 100, 2) if off else None
+    # 종단 간 비교는 잡음이 커서, 계측 코드 자체의 비용도 함께 보고
+    direct = measure_direct()
+    result["instrumentation_us_per_event"] = round(direct, 2)
+    result["instrumentation_pct_of_off"] = round(direct / off * 100, 3) if off else None
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
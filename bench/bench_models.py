@@ -0,0 +1,80 @@
+"""
+게임 모델 메모리/수당 CPU 벤치마크
+
+- bytes_per_room : 4인 방(패 분배 + 더미에서 몇 장씩 더 뽑은 중반 상태)을 --rooms개 만들 때
+                   tracemalloc으로 잰 방 하나당 메모리 (GameState + Player + Tile 전부)
+- us_per_turn    : 헤드리스 시뮬레이터(random 정책, 1프로세스)로 --games판을 돌린 턴당 CPU 시간
+                   (뽑기/자동 배치/추리/탈락 판정/정산이 모두 포함된 규칙 엔진 비용)
+- us_per_insert  : auto_insert_index 1회 (후반 손패, 조커 포함)
+
+    python bench/bench_models.py --rooms 2000 --games 3000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_broadcast import make_room  # noqa: E402
+from game_logic import auto_insert_index  # noqa: E402
+from simulator import RandomPolicy, play_game  # noqa: E402
+from state import rooms  # noqa: E402
+
+
+def bytes_per_room(n_rooms):
+    random.seed(1)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    kept = [make_room(f"mem{i}", 4, 6, 0.3) for i in range(n_rooms)]
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rooms.clear()
+    del kept
+    return (used - base) / n_rooms
+
+
+def us_per_turn(games):
+    random.seed(2)
+    rng = random.Random(2)
+    turns = 0
+    started = time.process_time()
+    for _ in range(games):
+        record = play_game([RandomPolicy(random.Random(rng.random())) for _ in range(4)], [10000] * 4)
+        turns += record["turns"]
+    return (time.process_time() - started) / turns * 1e6
+
+
+def us_per_insert(n=200000):
+    random.seed(3)
+    gs = make_room("insert", 2, 12, 0.3)
+    hand = gs.players[0].hand
+    probes = [t for t in gs.players[1].hand if not t.is_joker]
+    rooms.clear()
+    started = time.process_time()
+    for i in range(n):
+        auto_insert_index(gs, hand, probes[i % len(probes)])
+    return (time.process_time() - started) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--games", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    result = {
+        "bytes_per_room": round(min(bytes_per_room(args.rooms) for _ in range(args.repeat))),
+        "us_per_turn": round(min(us_per_turn(args.games) for _ in range(args.repeat)), 2),
+        "us_per_insert": round(min(us_per_insert() for _ in range(args.repeat)), 3),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
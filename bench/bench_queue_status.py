@@ -0,0 +1,91 @@
+"""
+대기열 입장 폭주 시 queue_status 전송 비용: 방 emit + 디바운스 vs 플레이어별 emit(legacy)
+
+--players명의 테스트 클라이언트가 --storm초 동안 고르게 join_queue를 보내고,
+그 동안의 queue_status emit 호출 수, 클라이언트가 받은 메시지 수, CPU 시간을 측정합니다.
+매칭은 끄고(check_queue_match 비활성) 상태 전송만 봅니다.
+legacy는 O(N²)이라 수천 명이면 수 분이 걸립니다.
+
+    python bench/bench_queue_status.py --players 5000 --storm 2
+    python bench/bench_queue_status.py --players 2000 --storm 2 --mode legacy
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+import lobby_events  # noqa: E402
+from extensions import socketio  # noqa: E402
+from store import store  # noqa: E402
+
+
+def legacy_broadcast_queue_status():
+    """변경 전: 대기열의 모든 sid에게 한 명씩 emit, 변경마다 즉시"""
+    sids = store.queue_sids()
+    count = len(sids)
+    for sid in sids:
+        socketio.emit("queue_status", {"status": "waiting", "count": count, "max": 4}, to=sid)
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--storm", type=float, default=2.0, help="입장 폭주 지속 시간(초)")
+    parser.add_argument("--mode", choices=["room", "legacy"], default="room")
+    args = parser.parse_args()
+
+    lobby_events.check_queue_match = lambda: None
+    if args.mode == "legacy":
+        lobby_events.broadcast_queue_status = legacy_broadcast_queue_status
+
+    counts = {"emit_calls": 0}
+    original_emit = socketio.emit
+
+    def counting_emit(event, *a, **kw):
+        if event == "queue_status":
+            counts["emit_calls"] += 1
+        return original_emit(event, *a, **kw)
+
+    socketio.emit = counting_emit
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        clients = [socketio.test_client(main.app) for _ in range(args.players)]
+
+    batch = 50
+    pause = args.storm / max(1, args.players // batch)
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, c in enumerate(clients):
+            c.emit("join_queue", {"uid": f"u{i}", "nickname": f"n{i}", "money": 100000, "betAmount": 1000})
+            if i % batch == batch - 1:
+                socketio.sleep(pause)
+        socketio.sleep(1.0)  # 마지막 디바운스 전송 대기
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+
+    received = 0
+    final = []
+    for c in clients:
+        statuses = [e["args"][0]["count"] for e in c.get_received() if e["name"] == "queue_status"]
+        received += len(statuses)
+        final = statuses or final
+    result = {
+        "mode": args.mode,
+        "players": args.players,
+        "storm_s": args.storm,
+        "emit_calls": counts["emit_calls"],
+        "messages_received": received,
+        "cpu_s": round(cpu, 3),
+        "wall_s": round(wall, 3),
+        "final_count_seen": final[-1] if final else None,
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,95 @@
+"""
+스케일아웃 벤치마크: gunicorn 워커 수(1/2/4/8)별 봇 부하 처리량
+
+워커 수마다 대역 브로커(bench/standin_broker.py) + gunicorn을 새로 띄우고
+bench/loadtest.py 봇 부하를 걸어 games/min, actions/s, 액션 왕복 지연을 비교합니다.
+실제 Redis를 쓰려면 --redis redis://host:6379/0 (브로커를 띄우지 않음).
+
+    python bench/bench_scaleout.py --workers 1 2 4 8 --bots 64 --duration 60
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import loadtest  # noqa: E402
+
+
+def wait_http(url, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url + "/socket.io/?EIO=4&transport=polling", timeout=1).read()
+            return True
+        except Exception:
+            time.sleep(0.2)
+    return False
+
+
+def start_broker(port):
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "bench", "standin_broker.py"), "--port", str(port)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    return proc
+
+
+def start_gunicorn(workers, port, queue_url):
+    env = dict(os.environ,
+               GUNICORN_WORKERS=str(workers),
+               GUNICORN_BIND=f"127.0.0.1:{port}",
+               SOCKETIO_MESSAGE_QUEUE=queue_url,
+               STORE_PREFIX=f"bench{port}")
+    return subprocess.Popen(["gunicorn", "-c", "gunicorn_config.py", "wsgi:app"], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop(proc):
+    if proc is None:
+        return
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--bots", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--think", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=5200)
+    parser.add_argument("--broker-port", type=int, default=6399)
+    parser.add_argument("--redis", default=None, help="실제 Redis URL (없으면 대역 브로커 사용)")
+    args = parser.parse_args()
+
+    results = []
+    for i, workers in enumerate(args.workers):
+        port = args.port + i
+        broker = None if args.redis else start_broker(args.broker_port)
+        queue_url = args.redis or f"redis://127.0.0.1:{args.broker_port}/0"
+        server = start_gunicorn(workers, port, queue_url)
+        try:
+            url = f"http://127.0.0.1:{port}"
+            if not wait_http(url):
+                results.append({"workers": workers, "error": "server did not start"})
+                continue
+            result = loadtest.run(url, args.bots, args.duration, think=args.think)
+            result["workers"] = workers
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+        finally:
+            stop(server)
+            stop(broker)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+연결 끊김 폭주 시 sid -> 방/플레이어 조회 비용: 세션 디렉터리 vs 모든 방 순회(legacy)
+
+--rooms개의 4인 방을 만들고 --disconnects개의 sid를 조회하는 데 걸리는 시간을 측정합니다.
+(패배 처리/정산 자체는 제외하고 조회만 비교)
+
+    python bench/bench_sessions.py --rooms 5000 --disconnects 2000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import GameState, Player  # noqa: E402
+from state import rooms, sessions  # noqa: E402
+from utils import find_room_and_player_by_sid  # noqa: E402
+
+
+def legacy_lookup(sid):
+    """변경 전 on_disconnect: 모든 방을 돌며 find_player_by_sid"""
+    for room_id, gs in list(rooms.items()):
+        for p in gs.players:
+            if p.sid == sid:
+                return room_id, gs, p
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=5000)
+    parser.add_argument("--disconnects", type=int, default=2000)
+    args = parser.parse_args()
+
+    for r in range(args.rooms):
+        room_id = f"room{r}"
+        gs = GameState(players=[], piles={"black": [], "white": []}, same_number_order="black-first",
+                       current_turn=0, drawn_tile=None, pending_placement=False, can_place_anywhere=False,
+                       next_tile_id=0)
+        gs.players = [Player(sid=f"s{r}-{i}", uid=f"u{r}-{i}", id=i, name="p") for i in range(4)]
+        rooms[room_id] = gs
+        sessions.bind_room(room_id, gs)
+
+    rng = random.Random(1)
+    sids = [f"s{rng.randrange(args.rooms)}-{rng.randrange(4)}" for _ in range(args.disconnects)]
+
+    result = {"rooms": args.rooms, "disconnects": args.disconnects}
+    for name, fn in (("directory", find_room_and_player_by_sid), ("legacy", legacy_lookup)):
+        started = time.perf_counter()
+        for sid in sids:
+            assert fn(sid) is not None
+        elapsed = time.perf_counter() - started
+        result[name] = {"total_ms": elapsed * 1e3, "us_per_disconnect": elapsed / len(sids) * 1e6}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
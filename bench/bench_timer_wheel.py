@@ -0,0 +1,140 @@
+"""
+턴 타이머 벤치마크: 공유 타이머 휠(scheduler.TimerWheel) vs 방마다 threading.Timer
+
+방마다 타이머 하나를 유지하면서 페이즈 변경처럼 취소/재예약을 반복하고,
+실제 실행 시각과 예약 시각의 차이(jitter)와 OS 스레드 수를 측정합니다.
+
+    python bench/bench_timer_wheel.py --rooms 10000 --duration 10
+    python bench/bench_timer_wheel.py --mode threads --rooms 2000 --duration 10
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[k]
+
+
+def run_wheel(args):
+    import eventlet
+    from scheduler import TimerWheel
+
+    wheel = TimerWheel(tick=args.tick, spawn=eventlet.spawn, sleep=eventlet.sleep)
+    jitter = []
+    handles = {}
+    fired = [0]
+
+    def on_fire(room, deadline):
+        jitter.append(time.monotonic() - deadline)
+        fired[0] += 1
+        schedule(room)
+
+    def schedule(room):
+        delay = random.uniform(args.min_delay, args.max_delay)
+        handles[room] = wheel.call_later(delay, on_fire, room, time.monotonic() + delay)
+
+    for room in range(args.rooms):
+        schedule(room)
+
+    # 페이즈 변경 흉내: 초당 churn 비율만큼 취소 후 재예약
+    peak_threads = threading.active_count()
+    started = time.monotonic()
+    churned = 0
+    while time.monotonic() - started < args.duration:
+        for _ in range(int(args.rooms * args.churn * 0.1)):
+            room = random.randrange(args.rooms)
+            handles[room].cancel()
+            schedule(room)
+            churned += 1
+        peak_threads = max(peak_threads, threading.active_count())
+        eventlet.sleep(0.1)
+    wheel.stop()
+    return jitter, fired[0], churned, peak_threads, len(wheel)
+
+
+def run_threads(args):
+    jitter = []
+    handles = {}
+    fired = [0]
+    lock = threading.Lock()
+
+    def on_fire(room, deadline):
+        with lock:
+            jitter.append(time.monotonic() - deadline)
+            fired[0] += 1
+        schedule(room)
+
+    def schedule(room):
+        delay = random.uniform(args.min_delay, args.max_delay)
+        t = threading.Timer(delay, on_fire, (room, time.monotonic() + delay))
+        t.daemon = True
+        handles[room] = t
+        t.start()
+
+    for room in range(args.rooms):
+        schedule(room)
+
+    peak_threads = threading.active_count()
+    started = time.monotonic()
+    churned = 0
+    while time.monotonic() - started < args.duration:
+        for _ in range(int(args.rooms * args.churn * 0.1)):
+            room = random.randrange(args.rooms)
+            handles[room].cancel()
+            schedule(room)
+            churned += 1
+        peak_threads = max(peak_threads, threading.active_count())
+        time.sleep(0.1)
+    for t in list(handles.values()):
+        t.cancel()
+    return jitter, fired[0], churned, peak_threads, len(handles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["wheel", "threads"], default="wheel")
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--min-delay", type=float, default=0.5)
+    parser.add_argument("--max-delay", type=float, default=3.0)
+    parser.add_argument("--churn", type=float, default=0.2, help="초당 취소/재예약 비율 (방 수 대비)")
+    parser.add_argument("--tick", type=float, default=0.05)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    runner = run_wheel if args.mode == "wheel" else run_threads
+    jitter, fired, churned, peak_threads, pending = runner(args)
+
+    result = {
+        "mode": args.mode,
+        "rooms": args.rooms,
+        "duration": args.duration,
+        "fired": fired,
+        "churned": churned,
+        "pending": pending,
+        "peak_threads": peak_threads,
+        "jitter_ms": {
+            "p50": percentile(jitter, 50) * 1000,
+            "p99": percentile(jitter, 99) * 1000,
+            "max": (max(jitter) if jitter else 0.0) * 1000,
+        },
+    }
+    print(json.dumps(result, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
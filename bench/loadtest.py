@@ -0,0 +1,486 @@
+"""
+Socket.IO 봇 부하 테스트
+
+봇 N개가 실제 클라이언트처럼 접속해 join_queue -> 매칭 -> 게임 플레이(뽑기/조커 배치/추리/애니메이션 완료)
+-> game_over 후 다시 대기열 입장을 반복합니다 (--games-per-bot을 채우면 접속을 끊고 나감).
+멀티 워커 구성에서는 sticky session이 없으므로 websocket transport만 사용합니다.
+
+측정값
+- games / rooms_per_s : 끝난 게임 수 (game_over 수신 봇 기준, 방 단위)와 초당 처리량
+- actions             : 봇이 보낸 게임 액션 수
+- action_rtt_ms       : 액션 emit -> 다음 state_update(guess_value는 start_guess_animation) 수신까지
+                        (p50/p95/p99), rtt_by_event_ms는 이벤트별
+- match_wait_ms       : join_queue -> match:success
+- game_duration_s     : match:success -> game_over
+- received_per_action : 봇이 받은 서버 메시지 수 / 액션 수 (received_by_event는 이벤트별)
+- errors_by_kind      : connect(접속 실패) / emit(전송 실패) / disconnect(서버가 끊음) / stall(--stall초 동안 응답 없음)
+- timeline            : 1초마다 현재 접속 수(live)/누적 매칭 수/누적 액션 수 (램프업 구간 확인용)
+
+램프업 프로파일 (--profile)
+- linear : --ramp초 간격으로 한 명씩
+- step   : --steps번에 나눠 한꺼번에 (전체 램프 시간은 linear와 같음)
+- spike  : 전원 동시 접속
+
+--codec msgpack이면 봇이 MessagePack 파서로 접속합니다 (서버의 codec.py 협상 확인/비교용).
+봇이 수천 개면 --procs로 여러 프로세스에 나눠 돌립니다 (클라이언트마다 스레드를 씀).
+--serve PORT는 Firebase를 끈(FIREBASE_DISABLED=1) 로컬 gunicorn 워커를 띄워 거기에 부하를 겁니다.
+이때 사용자 저장소는 --userdb (userdb.py의 USERDB_URL, 기본 memory://) -> 지연을 넣은 대역으로 Firestore I/O를 흉내 낼 수 있습니다.
+
+    python bench/loadtest.py --url http://127.0.0.1:5000 --bots 40 --duration 60
+    python bench/loadtest.py --serve 5400 --bots 2000 --procs 8 --profile step --out results.json
+    python bench/loadtest.py --serve 5400 --bots 40 --userdb "sqlite:///tmp/users.db?latency=0.03&jitter=0.02&autocreate=100000"
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import socketio
+
+PROFILES = ("linear", "step", "spike")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[k]
+
+
+def _pcts(values, scale=1000.0):
+    values = [v * scale for v in values]
+    return {
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+    }
+
+
+def ramp_offsets(bots, profile="linear", ramp=0.02, steps=4):
+    """봇별 접속 시각(시작 기준 초)"""
+    if profile == "spike":
+        return [0.0] * bots
+    if profile == "step":
+        steps = max(1, min(steps, bots or 1))
+        per_step = -(-bots // steps)
+        interval = ramp * bots / steps
+        return [(i // per_step) * interval for i in range(bots)]
+    if profile == "linear":
+        return [i * ramp for i in range(bots)]
+    raise ValueError(f"unknown ramp profile: {profile}")
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rtts = defaultdict(list)   # 이벤트 -> 왕복 지연(초)
+        self.match_waits = []
+        self.game_durations = []
+        self.actions = 0
+        self.games = set()
+        self.matches = 0
+        self.errors = Counter()
+        self.received = Counter()       # 받은 서버 이벤트 수
+        self.connected = 0              # 접속에 성공한 봇 수 (누적)
+        self.live = 0                   # 지금 접속 중인 봇 수
+        self.timeline = []
+
+    def error(self, kind):
+        with self.lock:
+            self.errors[kind] += 1
+
+    def snapshot(self, t):
+        with self.lock:
+            self.timeline.append({"t": round(t, 1), "live": self.live,
+                                  "matches": self.matches, "actions": self.actions})
+
+    def export(self):
+        """다른 프로세스로 넘길 원자료 (merge()로 합침)"""
+        with self.lock:
+            return {
+                "rtts": dict(self.rtts), "match_waits": self.match_waits, "game_durations": self.game_durations,
+                "actions": self.actions, "games": sorted(self.games), "matches": self.matches,
+                "errors": dict(self.errors), "received": dict(self.received),
+                "connected": self.connected, "live": self.live,
+                "timeline": self.timeline,
+            }
+
+    def merge(self, raw):
+        with self.lock:
+            for event, values in raw["rtts"].items():
+                self.rtts[event].extend(values)
+            self.match_waits.extend(raw["match_waits"])
+            self.game_durations.extend(raw["game_durations"])
+            self.actions += raw["actions"]
+            self.games.update(raw["games"])
+            self.matches += raw["matches"]
+            self.errors.update(raw["errors"])
+            self.received.update(raw["received"])
+            self.connected += raw["connected"]
+            self.live += raw["live"]
+            for i, point in enumerate(raw["timeline"]):
+                if i < len(self.timeline):
+                    for key in ("live", "matches", "actions"):
+                        self.timeline[i][key] += point[key]
+                else:
+                    self.timeline.append(dict(point))
+
+    def summary(self, elapsed):
+        with self.lock:
+            all_rtts = [r for values in self.rtts.values() for r in values]
+            return {
+                "elapsed_s": round(elapsed, 2),
+                "matches": self.matches,
+                "games": len(self.games),
+                "games_per_min": round(len(self.games) / elapsed * 60, 2) if elapsed else 0.0,
+                "rooms_per_s": round(len(self.games) / elapsed, 3) if elapsed else 0.0,
+                "actions": self.actions,
+                "actions_per_s": round(self.actions / elapsed, 2) if elapsed else 0.0,
+                "action_rtt_ms": _pcts(all_rtts),
+                "rtt_by_event_ms": {event: dict(_pcts(values), n=len(values))
+                                    for event, values in sorted(self.rtts.items())},
+                "match_wait_ms": _pcts(self.match_waits),
+                "game_duration_s": _pcts(self.game_durations, scale=1.0),
+                "received_per_action": (round(sum(self.received.values()) / self.actions, 2)
+                                        if self.actions else 0.0),
+                "received_by_event": dict(self.received.most_common()),
+                "errors": sum(self.errors.values()),
+                "errors_by_kind": dict(self.errors),
+                "connected": self.connected,
+                "timeline": list(self.timeline),
+            }
+
+
+class Bot:
+    def __init__(self, index, url, stats, bet, think, rng, games_per_bot=0, codec="json"):
+        self.uid = f"bot-{os.getpid()}-{index}"
+        self.url = url
+        self.stats = stats
+        self.bet = bet
+        self.think = think
+        self.rng = rng
+        self.games_left = games_per_bot or None
+        self.room_id = None
+        self.state = None
+        self.my_turn_phase = None     # 내 차례로 시작된 페이즈 (state_update에서 처리)
+        self.sent_at = None
+        self.sent_event = None
+        self.queued_at = None
+        self.matched_at = None
+        self.last_seen = time.monotonic()
+        self.running = True
+        self.sio = socketio.Client(reconnection=False, serializer="msgpack" if codec == "msgpack" else "default")
+        self._register()
+
+    # --- 이벤트 ---
+
+    def _register(self):
+        def on(event, handler):
+            def counted(*args):
+                self._received(event)
+                return handler(*args)
+            self.sio.on(event, counted)
+
+        on("match:success", self._on_match)
+        on("game:turn_phase_start", self._on_turn_phase_start)
+        on("state_update", self._on_state_update)
+        on("game:start_guess_animation", self._on_guess_animation)
+        on("game_over", self._on_game_over)
+        self.sio.on("*", lambda event, *args: self._received(event))  # 나머지 이벤트는 세기만
+        self.sio.on("disconnect", self._on_disconnect)
+
+    def _received(self, event):
+        with self.stats.lock:
+            self.stats.received[event] += 1
+
+    def _on_match(self, data):
+        now = time.perf_counter()
+        self.room_id = data["roomId"]
+        self.matched_at = now
+        self.last_seen = time.monotonic()
+        with self.stats.lock:
+            self.stats.matches += 1
+            if self.queued_at is not None:
+                self.stats.match_waits.append(now - self.queued_at)
+        self.queued_at = None
+
+    def _on_turn_phase_start(self, data):
+        self.last_seen = time.monotonic()
+        if data.get("currentTurnUid") == self.uid:
+            self.my_turn_phase = data.get("phase")
+
+    def _record_rtt(self):
+        if self.sent_at is not None:
+            with self.stats.lock:
+                self.stats.rtts[self.sent_event].append(time.perf_counter() - self.sent_at)
+            self.sent_at = None
+
+    def _on_state_update(self, data):
+        self.last_seen = time.monotonic()
+        self._record_rtt()
+        self.state = data
+        phase = self.my_turn_phase
+        if phase is None or data.get("phase") != phase:
+            return
+        players = data.get("players") or []
+        turn = data.get("currentTurn")
+        if turn is None or turn >= len(players) or players[turn]["uid"] != self.uid:
+            return
+        self.my_turn_phase = None
+        self.sio.start_background_task(self._act, phase, data)
+
+    def _on_guess_animation(self, data):
+        self.last_seen = time.monotonic()
+        if data.get("guesser_id") == self.uid:
+            # guess_value의 응답은 state_update가 아니라 애니메이션 시작
+            self._record_rtt()
+            self.sio.start_background_task(self._animation_done, data.get("correct"))
+
+    def _on_game_over(self, data):
+        with self.stats.lock:
+            self.stats.games.add(self.room_id)
+            if self.matched_at is not None:
+                self.stats.game_durations.append(time.perf_counter() - self.matched_at)
+        self.room_id = None
+        self.state = None
+        self.my_turn_phase = None
+        self.matched_at = None
+        if self.games_left is not None:
+            self.games_left -= 1
+            if self.games_left <= 0:
+                self.sio.start_background_task(self.stop)
+                return
+        if self.running:
+            self.sio.start_background_task(self._requeue)
+
+    def _on_disconnect(self, *args):
+        if self.running:
+            self.running = False
+            self.stats.error("disconnect")
+        with self.stats.lock:
+            self.stats.live -= 1
+
+    # --- 행동 ---
+
+    def _emit(self, event, payload):
+        self.sent_at = time.perf_counter()
+        self.sent_event = event
+        try:
+            self.sio.emit(event, payload)
+        except socketio.exceptions.SocketIOError:
+            # 워커 종료 등으로 연결이 끊긴 봇
+            self.sent_at = None
+            self.stats.error("emit")
+            return
+        with self.stats.lock:
+            self.stats.actions += 1
+
+    def _act(self, phase, state):
+        time.sleep(self.think * self.rng.random())
+        if phase == "DRAWING":
+            piles = state.get("piles") or {}
+            colors = [c for c in ("black", "white") if piles.get(c)]
+            if colors:
+                self._emit("draw_tile", {"roomId": self.room_id, "color": self.rng.choice(colors)})
+        elif phase == "PLACE_JOKER":
+            self._emit("place_joker", {"roomId": self.room_id, "index": 0})
+        elif phase in ("GUESSING", "POST_SUCCESS_GUESS"):
+            targets = [
+                (p["id"], i)
+                for p in state["players"] if p["uid"] != self.uid and not p.get("rank")
+                for i, t in enumerate(p["hand"]) if not t["revealed"]
+            ]
+            if not targets:
+                return
+            target_id, index = self.rng.choice(targets)
+            value = "JOKER" if self.rng.random() < 0.05 else self.rng.randint(0, 11)
+            self._emit("guess_value", {"roomId": self.room_id, "targetId": target_id,
+                                       "index": index, "value": value})
+
+    def _animation_done(self, correct):
+        time.sleep(self.think * self.rng.random())
+        self._emit("game:animation_done", {"roomId": self.room_id, "guesserUid": self.uid, "correct": correct})
+
+    def _requeue(self):
+        time.sleep(1.0 + self.rng.random())
+        if self.running and self.sio.connected:
+            self.join_queue()
+
+    def join_queue(self):
+        self.queued_at = time.perf_counter()
+        self.last_seen = time.monotonic()
+        self.sio.emit("join_queue", {"uid": self.uid, "nickname": self.uid, "name": self.uid,
+                                     "money": 10 ** 9, "betAmount": self.bet})
+
+    def stalled(self, now, limit):
+        """게임 중인데 limit초 동안 서버에서 아무 이벤트도 못 받음 (한 번만 보고)"""
+        if self.running and self.room_id is not None and now - self.last_seen > limit:
+            self.last_seen = now
+            return True
+        return False
+
+    def start(self):
+        try:
+            self.sio.connect(self.url, transports=["websocket"])
+            with self.stats.lock:
+                self.stats.connected += 1
+                self.stats.live += 1
+            self.join_queue()
+        except Exception as e:
+            print(f"⚠️ {self.uid} connect failed: {e}", file=sys.stderr)
+            self.running = False
+            self.stats.error("connect")
+
+    def stop(self):
+        self.running = False
+        if self.sio.connected:
+            self.sio.disconnect()
+
+
+def _collect(url, bots, duration, bet, think, ramp, seed, profile, steps, games_per_bot, stall, index_base=0,
+             codec="json"):
+    """봇 부하를 걸고 Stats를 반환 (run()과 프로세스별 워커가 공유)"""
+    stats = Stats()
+    rng = random.Random(seed)
+    fleet = [Bot(index_base + i, url, stats, bet, think, random.Random(rng.random()), games_per_bot, codec)
+             for i in range(bots)]
+    offsets = ramp_offsets(bots, profile, ramp, steps)
+    started = time.perf_counter()
+    done = threading.Event()
+
+    def watch():
+        # 1초마다 타임라인 기록 + 멈춘 게임 감지
+        while not done.wait(1.0):
+            stats.snapshot(time.perf_counter() - started)
+            now = time.monotonic()
+            for bot in fleet:
+                if bot.stalled(now, stall):
+                    stats.error("stall")
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    for bot, offset in zip(fleet, offsets):
+        delay = offset - (time.perf_counter() - started)
+        if delay > 0:
+            time.sleep(delay)
+        bot.start()
+    remaining = duration - (time.perf_counter() - started)
+    if remaining > 0:
+        time.sleep(remaining)
+    elapsed = time.perf_counter() - started
+    done.set()
+    watcher.join()
+    raw = stats.export()
+    for bot in fleet:
+        bot.stop()
+    return stats, raw, elapsed
+
+
+def run(url, bots, duration, bet=1000, think=0.2, ramp=0.02, seed=0,
+        profile="linear", steps=4, games_per_bot=0, stall=30.0, codec="json"):
+    """봇 부하를 duration초 동안 걸고 요약 dict를 반환 (다른 벤치마크에서 재사용)"""
+    stats, _, elapsed = _collect(url, bots, duration, bet, think, ramp, seed, profile, steps, games_per_bot, stall,
+                                 codec=codec)
+    result = stats.summary(elapsed)
+    result["bots"] = bots
+    result["profile"] = profile
+    result["codec"] = codec
+    return result
+
+
+def _worker(kwargs):
+    _, raw, _ = _collect(**kwargs)
+    return raw
+
+
+def run_multi(url, bots, duration, procs, bet=1000, think=0.2, ramp=0.02, seed=0,
+              profile="linear", steps=4, games_per_bot=0, stall=30.0, codec="json"):
+    """봇을 procs개 프로세스에 나눠 돌리고 결과를 합침 (램프 간격은 전체 기준으로 유지)"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if procs <= 1:
+        return run(url, bots, duration, bet, think, ramp, seed, profile, steps, games_per_bot, stall, codec)
+    shares = [bots // procs + (1 if i < bots % procs else 0) for i in range(procs)]
+    jobs = []
+    base = 0
+    for i, share in enumerate(shares):
+        jobs.append(dict(url=url, bots=share, duration=duration, bet=bet, think=think, ramp=ramp * procs,
+                         seed=seed + i, profile=profile, steps=steps, games_per_bot=games_per_bot,
+                         stall=stall, index_base=base, codec=codec))
+        base += share
+    stats = Stats()
+    with ProcessPoolExecutor(procs, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for raw in pool.map(_worker, jobs):
+            stats.merge(raw)
+    result = stats.summary(duration)
+    result["bots"] = bots
+    result["procs"] = procs
+    result["profile"] = profile
+    result["codec"] = codec
+    return result
+
+
+def serve(port, userdb=None):
+    """Firebase를 끈 로컬 gunicorn 워커 하나를 띄움 (Popen 반환). userdb: 사용자 저장소 URL (USERDB_URL)"""
+    import subprocess
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, FIREBASE_DISABLED="1", GUNICORN_WORKERS="1",
+               GUNICORN_BIND=f"127.0.0.1:{port}", LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"))
+    env.pop("SOCKETIO_MESSAGE_QUEUE", None)
+    if userdb:
+        env["USERDB_URL"] = userdb
+    return subprocess.Popen(["gunicorn", "-c", "gunicorn_config.py", "wsgi:app"], cwd=root, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Firebase 없이 로컬 서버를 띄워 테스트")
+    parser.add_argument("--bots", type=int, default=8, help="4의 배수 권장 (4인 매칭)")
+    parser.add_argument("--procs", type=int, default=1, help="봇을 나눠 돌릴 프로세스 수")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--bet", type=int, default=1000)
+    parser.add_argument("--think", type=float, default=0.2, help="행동 전 최대 대기 시간(초)")
+    parser.add_argument("--profile", choices=PROFILES, default="linear", help="램프업 프로파일")
+    parser.add_argument("--ramp", type=float, default=0.02, help="봇 접속 간격(초)")
+    parser.add_argument("--steps", type=int, default=4, help="step 프로파일의 단계 수")
+    parser.add_argument("--games-per-bot", type=int, default=0, help="이만큼 게임하면 나감 (0: 끝까지)")
+    parser.add_argument("--stall", type=float, default=30.0, help="게임 중 무응답을 에러로 볼 시간(초)")
+    parser.add_argument("--codec", choices=("json", "msgpack"), default="json", help="봇의 Socket.IO 패킷 형식")
+    parser.add_argument("--userdb", help="--serve 서버의 사용자 저장소 URL (예: memory://?latency=0.02&autocreate=100000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if args.serve:
+        from bench_scaleout import stop, wait_http
+        server = serve(args.serve, args.userdb)
+        url = f"http://127.0.0.1:{args.serve}"
+        if not wait_http(url):
+            stop(server)
+            sys.exit("server did not start")
+    try:
+        result = run_multi(url, args.bots, args.duration, args.procs, args.bet, args.think, args.ramp,
+                           args.seed, args.profile, args.steps, args.games_per_bot, args.stall, args.codec)
+    finally:
+        if server is not None:
+            stop(server)
+    result["config"] = {k: v for k, v in vars(args).items() if k != "out"}
+    result["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    print(json.dumps({k: v for k, v in result.items() if k != "timeline"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
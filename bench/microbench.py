@@ -0,0 +1,301 @@
+"""
+수마다 도는 게임 로직/직렬화 함수 마이크로벤치마크 + 저장된 기준선과 비교
+
+대상: prepare_tiles, deal_initial_hands, auto_insert_index, guess_tile, get_alive_players,
+      serialize_player, broadcast_in_game_state (emit은 아무것도 하지 않음)
+픽스처: 2~4인 방 x 손패 크기(초반/후반) x 공개 비율(0.2/0.7), 시드 고정
+
+케이스마다
+- ops_per_s / us_per_op : --min-time초 이상 돌리는 측정을 --repeat번 해서 가장 빠른 값
+- alloc_peak_bytes       : 호출 1회 동안 새로 잡힌 메모리 피크 (tracemalloc)
+를 기록합니다.
+
+    python bench/microbench.py --save                  # 기준선 저장 (bench/baselines/microbench.json)
+    python bench/microbench.py --compare --threshold 0.2   # 기준선보다 20% 넘게 느려진 케이스 표시, 있으면 exit 1
+    python bench/microbench.py --filter broadcast --quick
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils  # noqa: E402
+from bench_broadcast import make_room  # noqa: E402
+from game_logic import (prepare_tiles, deal_initial_hands, auto_insert_index, guess_tile,  # noqa: E402
+                        get_alive_players)
+from models import GameState, Player, Tile  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "microbench.json")
+REVEAL_RATIOS = (0.2, 0.7)
+
+
+def fixtures(quick=False):
+    """(이름, players, hand, reveal) 목록. 손패 크기는 초기 패와 덱을 거의 다 나눈 후반"""
+    out = []
+    for n in ((4,) if quick else (2, 3, 4)):
+        initial = 3 if n == 4 else 4
+        for hand in ((initial,) if quick else (initial, 26 // n - 1)):
+            for reveal in (REVEAL_RATIOS[:1] if quick else REVEAL_RATIOS):
+                out.append((f"p{n}-h{hand}-r{reveal}", n, hand, reveal))
+    return out
+
+
+def empty_room(n_players):
+    gs = GameState(
+        players=[], piles={"black": [], "white": []}, same_number_order="black-first",
+        current_turn=0, drawn_tile=None, pending_placement=False, can_place_anywhere=False,
+        next_tile_id=0,
+    )
+    for i in range(n_players):
+        gs.players.append(Player(sid=f"sid{i}", uid=f"uid{i}", id=i, name=f"p{i}", nickname=f"p{i}",
+                                 money=100000, bet_amount=10000))
+    return gs
+
+
+# --- 케이스: 호출할 때마다 한 번 실행되는 인자 없는 함수를 돌려줌 ---
+
+def case_prepare_tiles(n, hand, reveal):
+    gs = empty_room(n)
+    return lambda: prepare_tiles(gs)
+
+
+def case_deal_initial_hands(n, hand, reveal):
+    gs = empty_room(n)
+    prepare_tiles(gs)
+    black, white = list(gs.piles["black"]), list(gs.piles["white"])
+
+    def op():
+        # 더미 복사(리스트 2개)만 추가 비용
+        gs.piles["black"] = list(black)
+        gs.piles["white"] = list(white)
+        deal_initial_hands(gs)
+    return op
+
+
+def case_auto_insert_index(n, hand, reveal):
+    gs = make_room("micro", n, hand, reveal)
+    me = gs.players[0]
+    probes = [Tile(id=100 + v, color=c, value=v, is_joker=False) for v in range(12) for c in ("black", "white")]
+    it = iter(range(1 << 62))
+    return lambda: auto_insert_index(gs, me.hand, probes[next(it) % len(probes)])
+
+
+def case_guess_tile(n, hand, reveal):
+    """맞힘/틀림을 번갈아: 공개된 타일은 다음 호출 전에 되돌림 (상태가 변하지 않도록)"""
+    gs = make_room("micro", n, hand, reveal)
+    guesser = gs.players[0]
+    targets = [(p, i, t) for p in gs.players[1:] for i, t in enumerate(p.hand) if not t.revealed]
+    hidden_own = [t for t in guesser.hand if not t.revealed]
+    if not targets:
+        return None
+    it = iter(range(1 << 62))
+
+    def op():
+        k = next(it)
+        target, index, tile = targets[k % len(targets)]
+        correct = k % 2 == 0
+        value = ("JOKER" if tile.is_joker else tile.value) if correct else -1
+        guess_tile(gs, guesser, target.id, index, value)
+        # 되돌리면서 증분 카운터도 원래대로
+        if tile.revealed:
+            tile.revealed = False
+            target.unrevealed += 1
+            gs.alive.add(target.uid)
+        for t in hidden_own:
+            if t.revealed:
+                t.revealed = False
+                guesser.unrevealed += 1
+    return op
+
+
+def case_get_alive_players(n, hand, reveal):
+    gs = make_room("micro", n, hand, reveal)
+    return lambda: get_alive_players(gs)
+
+
+def case_serialize_player(n, hand, reveal):
+    gs = make_room("micro", n, hand, reveal)
+    p = gs.players[0]
+    it = iter(range(1 << 62))
+    return lambda: utils.serialize_player(p, is_self=next(it) % 2 == 0)
+
+
+def case_broadcast_in_game_state(n, hand, reveal):
+    """매번 타일 하나를 뒤집었다 되돌려 (한 수) 뷰 캐시 일부가 무효화되는 상황"""
+    gs = make_room("micro", n, hand, reveal)
+    tiles = [t for p in gs.players for t in p.hand]
+    it = iter(range(1 << 62))
+
+    def op():
+        t = tiles[next(it) % len(tiles)]
+        t.revealed = not t.revealed
+        utils.broadcast_in_game_state("micro")
+    return op
+
+
+# prepare/deal은 손패 크기/공개 비율과 무관하므로 인원수별로 한 번만
+CASES = [
+    ("prepare_tiles", case_prepare_tiles, True),
+    ("deal_initial_hands", case_deal_initial_hands, True),
+    ("auto_insert_index", case_auto_insert_index, False),
+    ("guess_tile", case_guess_tile, False),
+    ("get_alive_players", case_get_alive_players, False),
+    ("serialize_player", case_serialize_player, False),
+    ("broadcast_in_game_state", case_broadcast_in_game_state, False),
+]
+
+
+def time_op(op, min_time, repeat):
+    """op 1회당 최소 시간(초): number를 min_time을 넘길 때까지 늘린 뒤 repeat번 중 최솟값"""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        if elapsed < min_time / 10:
+            number *= 10
+        else:
+            number = int(number * min_time / elapsed * 1.1) + 1
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def alloc_peak(op, iterations=200):
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(iterations):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        op()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks += peak - base
+    tracemalloc.stop()
+    return peaks / iterations
+
+
+def iter_cases(quick=False, name_filter=None):
+    """(key, 케이스 팩토리, players, hand, reveal)"""
+    for case_name, factory, size_independent in CASES:
+        if name_filter and name_filter not in case_name:
+            continue
+        seen = set()
+        for fixture, n, hand, reveal in fixtures(quick):
+            key = f"{case_name}[p{n}]" if size_independent else f"{case_name}[{fixture}]"
+            if key not in seen:
+                seen.add(key)
+                yield key, factory, n, hand, reveal
+
+
+def build_op(factory, n, hand, reveal):
+    random.seed(42)
+    return factory(n, hand, reveal)
+
+
+def run_suite(min_time=0.05, repeat=5, quick=False, name_filter=None):
+    results = {}
+    for key, factory, n, hand, reveal in iter_cases(quick, name_filter):
+        op = build_op(factory, n, hand, reveal)
+        if op is not None:
+            per_op = time_op(op, min_time, repeat)
+            results[key] = {
+                "ops_per_s": round(1.0 / per_op, 1),
+                "us_per_op": round(per_op * 1e6, 3),
+                "alloc_peak_bytes": round(alloc_peak(op), 1),
+            }
+            print(f"{key:55s} {per_op * 1e6:10.2f} µs  {results[key]['alloc_peak_bytes']:10.0f} B",
+                  file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold, remeasure=None):
+    """
+    기준선 대비 ops/s 비율. 1 - threshold 아래면 regression.
+    remeasure(key)가 있으면 걸린 케이스를 다시 재서 더 빠른 쪽을 씀 (잡음으로 인한 오탐 줄이기)
+    """
+    report, regressions = {}, []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        ratio = current["ops_per_s"] / base["ops_per_s"] if base["ops_per_s"] else 0.0
+        if ratio < 1.0 - threshold and remeasure is not None:
+            per_op = remeasure(key)
+            if 1.0 / per_op > current["ops_per_s"]:
+                current["ops_per_s"] = round(1.0 / per_op, 1)
+                current["us_per_op"] = round(per_op * 1e6, 3)
+            ratio = current["ops_per_s"] / base["ops_per_s"]
+        entry = {"ratio": round(ratio, 3),
+                 "alloc_delta_bytes": round(current["alloc_peak_bytes"] - base["alloc_peak_bytes"], 1)}
+        if ratio < 1.0 - threshold:
+            entry["regression"] = True
+            regressions.append(key)
+        report[key] = entry
+    return report, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=BASELINE, help="기준선 JSON 경로")
+    parser.add_argument("--save", action="store_true", help="이번 결과를 기준선으로 저장")
+    parser.add_argument("--compare", action="store_true", help="기준선과 비교해 느려진 케이스 표시")
+    parser.add_argument("--threshold", type=float, default=0.2, help="regression으로 볼 ops/s 감소 비율")
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--confirm", type=int, default=3, help="regression 후보를 다시 재는 횟수 (0: 끔)")
+    parser.add_argument("--filter", help="이름에 이 문자열이 들어간 케이스만")
+    parser.add_argument("--quick", action="store_true", help="4인/초기 손패/공개 0.2 픽스처만 (기준선의 부분집합)")
+    args = parser.parse_args()
+
+    utils.socketio.emit = lambda *a, **kw: None
+    results = run_suite(args.min_time, args.repeat, args.quick, args.filter)
+    output = {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                 "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z")},
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            sys.exit(f"baseline not found: {args.baseline} (run with --save first)")
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        cases = {key: rest for key, *rest in iter_cases(args.quick, args.filter)}
+
+        def remeasure(key):
+            op = build_op(*cases[key])
+            return min(time_op(op, args.min_time * 2, args.repeat) for _ in range(args.confirm))
+
+        report, regressions = compare(results, baseline["results"], args.threshold,
+                                      remeasure if args.confirm > 0 else None)
+        output["compare"] = {"baseline": baseline["meta"], "threshold": args.threshold,
+                             "cases": report, "regressions": regressions}
+        for key in regressions:
+            print(f"⚠️ regression: {key} x{report[key]['ratio']}", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(output, f, indent=2, sort_keys=True)
+            f.write("\n")
+    print(json.dumps(output, indent=2))
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+로컬 테스트용 Redis 대역 브로커 (RESP2, 단일 프로세스 asyncio)
+
+실제 Redis 없이 멀티 워커 구성(SOCKETIO_MESSAGE_QUEUE / STORE_URL)을 돌려보기 위한 것으로,
+서버와 python-socketio RedisManager가 쓰는 명령만 구현합니다.
+(문자열/리스트/해시/정렬셋 일부, SET NX/PX, PUBLISH/SUBSCRIBE, 키 만료)
+
+    python bench/standin_broker.py --port 6399
+    SOCKETIO_MESSAGE_QUEUE=redis://127.0.0.1:6399/0 gunicorn -c gunicorn_config.py wsgi:app
+"""
+import argparse
+import asyncio
+import fnmatch
+import time
+from typing import Dict, List, Optional, Set
+
+
+class RespError(Exception):
+    pass
+
+
+class Broker:
+    def __init__(self):
+        self.data: Dict[bytes, object] = {}
+        self.expires: Dict[bytes, float] = {}
+        self.channels: Dict[bytes, Set["Client"]] = {}
+        self.patterns: Dict[bytes, Set["Client"]] = {}
+        self.commands = 0
+
+    # --- 키 공간 ---
+
+    def _alive(self, key: bytes) -> bool:
+        exp = self.expires.get(key)
+        if exp is not None and exp <= time.monotonic():
+            self.data.pop(key, None)
+            del self.expires[key]
+            return False
+        return key in self.data
+
+    def get(self, key: bytes, kind=None, create=False):
+        if not self._alive(key):
+            if not create:
+                return None
+            self.data[key] = kind()
+        value = self.data[key]
+        if kind is not None and not isinstance(value, kind):
+            raise RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def delete(self, key: bytes) -> bool:
+        existed = self._alive(key)
+        self.data.pop(key, None)
+        self.expires.pop(key, None)
+        return existed
+
+    def cleanup(self, key: bytes):
+        value = self.data.get(key)
+        if isinstance(value, (list, dict, set)) and not value:
+            self.delete(key)
+
+
+class Client:
+    def __init__(self, broker: Broker, writer: asyncio.StreamWriter):
+        self.broker = broker
+        self.writer = writer
+        self.subscriptions: Set[bytes] = set()
+        self.psubscriptions: Set[bytes] = set()
+
+    def send(self, payload: bytes):
+        self.writer.write(payload)
+
+
+# --- RESP 인코딩 ---
+
+def enc(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, str):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, RespError):
+        return b"-" + str(value).encode() + b"\r\n"
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(enc(v) for v in value)
+    raise TypeError(type(value))
+
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.strip().split()  # inline command
+    count = int(line[1:])
+    args = []
+    for _ in range(count):
+        header = await reader.readline()
+        size = int(header[1:])
+        data = await reader.readexactly(size + 2)
+        args.append(data[:-2])
+    return args
+
+
+def _index(lst: list, i: int) -> int:
+    return i + len(lst) if i < 0 else i
+
+
+def _slice(lst: list, start: int, stop: int) -> list:
+    start, stop = _index(lst, start), _index(lst, stop)
+    start = max(start, 0)
+    return lst[start:stop + 1] if stop >= start else []
+
+
+def execute(broker: Broker, client: Client, args: List[bytes]):
+    cmd = args[0].upper().decode()
+    a = args[1:]
+    broker.commands += 1
+
+    if cmd == "PING":
+        if client.subscriptions or client.psubscriptions:
+            return [b"pong", a[0] if a else b""]
+        return a[0] if a else "PONG"
+    if cmd in ("SELECT", "CLIENT", "READONLY", "HELLO"):
+        if cmd == "HELLO":
+            return RespError("ERR unknown command 'HELLO'")
+        return "OK"
+    if cmd == "ECHO":
+        return a[0]
+    if cmd == "INFO":
+        return b"# Server\r\nredis_version:7.0.0-standin\r\n"
+    if cmd == "FLUSHALL" or cmd == "FLUSHDB":
+        broker.data.clear()
+        broker.expires.clear()
+        return "OK"
+
+    # --- 문자열 ---
+    if cmd == "GET":
+        return broker.get(a[0], bytes)
+    if cmd == "SET":
+        key, value = a[0], a[1]
+        opts = [x.upper() for x in a[2:]]
+        ttl = None
+        i = 0
+        while i < len(opts):
+            if opts[i] in (b"PX", b"EX"):
+                n = float(a[2 + i + 1])
+                ttl = n / 1000.0 if opts[i] == b"PX" else n
+                i += 2
+                continue
+            i += 1
+        exists = broker._alive(key)
+        if b"NX" in opts and exists:
+            return None
+        if b"XX" in opts and not exists:
+            return None
+        broker.data[key] = value
+        broker.expires.pop(key, None)
+        if ttl is not None:
+            broker.expires[key] = time.monotonic() + ttl
+        return "OK"
+    if cmd == "INCRBY" or cmd == "INCR":
+        cur = int(broker.get(a[0], bytes) or b"0")
+        cur += int(a[1]) if cmd == "INCRBY" else 1
+        broker.data[a[0]] = str(cur).encode()
+        return cur
+    if cmd == "DEL" or cmd == "UNLINK":
+        return sum(1 for k in a if broker.delete(k))
+    if cmd == "EXISTS":
+        return sum(1 for k in a if broker._alive(k))
+    if cmd in ("EXPIRE", "PEXPIRE"):
+        if not broker._alive(a[0]):
+            return 0
+        n = float(a[1])
+        broker.expires[a[0]] = time.monotonic() + (n if cmd == "EXPIRE" else n / 1000.0)
+        return 1
+    if cmd == "KEYS":
+        pattern = a[0].decode()
+        return [k for k in list(broker.data) if broker._alive(k) and fnmatch.fnmatchcase(k.decode(), pattern)]
+
+    # --- 리스트 ---
+    if cmd in ("RPUSH", "LPUSH"):
+        lst = broker.get(a[0], list, create=True)
+        for v in a[1:]:
+            if cmd == "RPUSH":
+                lst.append(v)
+            else:
+                lst.insert(0, v)
+        return len(lst)
+    if cmd in ("LPOP", "RPOP"):
+        lst = broker.get(a[0], list)
+        if not lst:
+            return None
+        count = int(a[1]) if len(a) > 1 else None
+        n = 1 if count is None else min(count, len(lst))
+        out = [lst.pop(0) if cmd == "LPOP" else lst.pop() for _ in range(n)]
+        broker.cleanup(a[0])
+        return out[0] if count is None else out
+    if cmd == "LLEN":
+        return len(broker.get(a[0], list) or [])
+    if cmd == "LRANGE":
+        return _slice(broker.get(a[0], list) or [], int(a[1]), int(a[2]))
+    if cmd == "LTRIM":
+        lst = broker.get(a[0], list)
+        if lst is not None:
+            lst[:] = _slice(lst, int(a[1]), int(a[2]))
+            broker.cleanup(a[0])
+        return "OK"
+    if cmd == "LREM":
+        lst = broker.get(a[0], list)
+        if not lst:
+            return 0
+        count, value = int(a[1]), a[2]
+        removed = 0
+        if count >= 0:
+            i = 0
+            while i < len(lst) and (count == 0 or removed < count):
+                if lst[i] == value:
+                    del lst[i]
+                    removed += 1
+                else:
+                    i += 1
+        else:
+            i = len(lst) - 1
+            while i >= 0 and removed < -count:
+                if lst[i] == value:
+                    del lst[i]
+                    removed += 1
+                i -= 1
+        broker.cleanup(a[0])
+        return removed
+
+    # --- 해시 ---
+    if cmd in ("HSET", "HMSET"):
+        h = broker.get(a[0], dict, create=True)
+        added = 0
+        for i in range(1, len(a), 2):
+            if a[i] not in h:
+                added += 1
+            h[a[i]] = a[i + 1]
+        return added if cmd == "HSET" else "OK"
+    if cmd == "HSETNX":
+        h = broker.get(a[0], dict, create=True)
+        if a[1] in h:
+            return 0
+        h[a[1]] = a[2]
+        return 1
+    if cmd == "HGET":
+        return (broker.get(a[0], dict) or {}).get(a[1])
+    if cmd == "HMGET":
+        h = broker.get(a[0], dict) or {}
+        return [h.get(f) for f in a[1:]]
+    if cmd == "HDEL":
+        h = broker.get(a[0], dict)
+        if not h:
+            return 0
+        n = sum(1 for f in a[1:] if h.pop(f, None) is not None)
+        broker.cleanup(a[0])
+        return n
+    if cmd == "HEXISTS":
+        return int(a[1] in (broker.get(a[0], dict) or {}))
+    if cmd == "HLEN":
+        return len(broker.get(a[0], dict) or {})
+    if cmd == "HKEYS":
+        return list((broker.get(a[0], dict) or {}).keys())
+    if cmd == "HVALS":
+        return list((broker.get(a[0], dict) or {}).values())
+    if cmd == "HGETALL":
+        out = []
+        for k, v in (broker.get(a[0], dict) or {}).items():
+            out += [k, v]
+        return out
+    if cmd == "HINCRBY":
+        h = broker.get(a[0], dict, create=True)
+        h[a[1]] = str(int(h.get(a[1], b"0")) + int(a[2])).encode()
+        return int(h[a[1]])
+
+    # --- 셋 ---
+    if cmd == "SADD":
+        s = broker.get(a[0], set, create=True)
+        before = len(s)
+        s.update(a[1:])
+        return len(s) - before
+    if cmd == "SREM":
+        s = broker.get(a[0], set)
+        if not s:
+            return 0
+        n = sum(1 for m in a[1:] if m in s and not s.discard(m))
+        broker.cleanup(a[0])
+        return n
+    if cmd == "SMEMBERS":
+        return list(broker.get(a[0], set) or [])
+    if cmd == "SCARD":
+        return len(broker.get(a[0], set) or [])
+
+    # --- Pub/Sub ---
+    if cmd == "PUBLISH":
+        channel, message = a[0], a[1]
+        n = 0
+        for sub in list(broker.channels.get(channel, ())):
+            sub.send(enc([b"message", channel, message]))
+            n += 1
+        for pattern, subs in list(broker.patterns.items()):
+            if fnmatch.fnmatchcase(channel.decode(), pattern.decode()):
+                for sub in list(subs):
+                    sub.send(enc([b"pmessage", pattern, channel, message]))
+                    n += 1
+        return n
+    if cmd in ("SUBSCRIBE", "PSUBSCRIBE"):
+        table = broker.channels if cmd == "SUBSCRIBE" else broker.patterns
+        mine = client.subscriptions if cmd == "SUBSCRIBE" else client.psubscriptions
+        kind = b"subscribe" if cmd == "SUBSCRIBE" else b"psubscribe"
+        for ch in a:
+            table.setdefault(ch, set()).add(client)
+            mine.add(ch)
+            client.send(enc([kind, ch, len(client.subscriptions) + len(client.psubscriptions)]))
+        return NotImplemented
+    if cmd in ("UNSUBSCRIBE", "PUNSUBSCRIBE"):
+        table = broker.channels if cmd == "UNSUBSCRIBE" else broker.patterns
+        mine = client.subscriptions if cmd == "UNSUBSCRIBE" else client.psubscriptions
+        kind = b"unsubscribe" if cmd == "UNSUBSCRIBE" else b"punsubscribe"
+        targets = a or list(mine)
+        if not targets:
+            client.send(enc([kind, None, 0]))
+        for ch in targets:
+            table.get(ch, set()).discard(client)
+            mine.discard(ch)
+            client.send(enc([kind, ch, len(client.subscriptions) + len(client.psubscriptions)]))
+        return NotImplemented
+
+    return RespError(f"ERR unknown command '{cmd}'")
+
+
+async def serve(host: str, port: int):
+    broker = Broker()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = Client(broker, writer)
+        try:
+            while True:
+                args = await read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                try:
+                    reply = execute(broker, client, args)
+                except RespError as e:
+                    reply = e
+                except Exception as e:  # 잘못된 인자 등
+                    reply = RespError(f"ERR {e}")
+                if reply is not NotImplemented:
+                    client.send(enc(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for ch in client.subscriptions:
+                broker.channels.get(ch, set()).discard(client)
+            for ch in client.psubscriptions:
+                broker.patterns.get(ch, set()).discard(client)
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"🧪 stand-in broker listening on redis://{host}:{port}/0", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6399)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+# cluster.py
+# 🔥 [NEW] 멀티 워커 라우팅
+#
+# GameState는 방을 소유한 워커의 메모리에만 있습니다. 다른 워커에 붙은 클라이언트가
+# 그 방의 이벤트를 보내면, 저장소의 방 디렉터리(room_id -> worker_id)를 보고
+# 소유 워커로 이벤트를 전달(forward)하여 원래 sid 그대로 핸들러를 실행합니다.
+# 클라이언트로 나가는 emit은 Flask-SocketIO message_queue가 각 워커로 전달합니다.
+#
+# 방 배치 (샤딩)
+# - 살아 있는 워커(하트비트)로 일관 해싱 링을 만들고, 새 방은 room_id의 링 소유자에게 생성됩니다.
+# - 워커가 늘면: 아직 게임이 시작되지 않은 방만 새 링 소유자에게 인계 (진행 중인 게임은 끝날 때까지 유지)
+# - 워커가 정상 종료하면: 진행 중인 게임까지 남은 워커에게 인계 (스냅샷 -> 디렉터리 변경 -> adopt)
+# - 워커가 비정상 종료하면 그 워커의 게임은 복구되지 않습니다 (단일 워커 재시작과 동일)
+import atexit
+import functools
+import os
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import has_request_context, request
+from actors import room_actors
+from extensions import socketio
+from models import GameState
+from sharding import HashRing
+from state import rooms, sessions
+from store import store, worker_id
+from logs import get_logger
+
+log = get_logger("cluster")
+
+BROADCAST_CHANNEL = "workers"
+HEARTBEAT_INTERVAL = float(os.environ.get("CLUSTER_HEARTBEAT_INTERVAL", "2.0"))
+WORKER_TTL = HEARTBEAT_INTERVAL * 3
+
+ring = HashRing([worker_id()])
+
+_app = None
+_handlers: Dict[str, Callable] = {}
+_routed = set()  # owner_routed 핸들러 키 (실행 직전에 소유 워커를 다시 확인)
+
+
+def _channel(owner: str) -> str:
+    return f"worker:{owner}"
+
+
+def _key(fn: Callable) -> str:
+    return f"{fn.__module__}.{fn.__name__}"
+
+
+def init_app(app):
+    """app 등록 + (공유 저장소일 때) 이 워커 앞으로 온 메시지 구독, 하트비트 시작"""
+    global _app
+    _app = app
+    if store.is_shared:
+        store.subscribe([_channel(worker_id()), BROADCAST_CHANNEL], _on_message)
+        store.heartbeat(worker_id(), WORKER_TTL)
+        _update_ring()
+        socketio.start_background_task(_membership_loop)
+        atexit.register(shutdown)
+        log.info("🌐 Cluster worker %s subscribed (store=%s)", worker_id(), store.url)
+
+
+def remote(fn: Callable) -> Callable:
+    """다른 워커에서 call_on_owner/call_on_others로 호출할 수 있도록 등록"""
+    _handlers[_key(fn)] = fn
+    return fn
+
+
+# --- 방 배치 ---
+
+def ring_owner(room_id: str) -> str:
+    return ring.owner(room_id) or worker_id()
+
+
+def allocate_room_id(length: int) -> Tuple[str, str]:
+    """새 room_id를 만들어 링 소유 워커 이름으로 디렉터리에 등록. (room_id, owner) 반환"""
+    while True:
+        room_id = str(uuid.uuid4())[:length]
+        owner = ring_owner(room_id)
+        if room_id not in rooms and store.claim_room(room_id, owner):
+            return room_id, owner
+
+
+def run_on(owner: str, fn: Callable, data: Any):
+    """owner가 이 워커면 바로 실행, 아니면 현재 요청의 sid로 전달 (fn은 @remote 등록 필요)"""
+    if owner == worker_id():
+        return fn(data)
+    call_on_owner(owner, fn, request.sid if has_request_context() else None, data)
+    return None
+
+
+def owner_of(room_id: Optional[str]) -> Optional[str]:
+    """방을 가진 워커 ID (이 워커에 있거나 알 수 없으면 None)"""
+    if not store.is_shared or not room_id or room_id in rooms:
+        return None
+    owner = store.room_owner(room_id)
+    if owner == worker_id():
+        return None
+    return owner
+
+
+def ensure_local(room_id: Optional[str]) -> None:
+    """이 워커로 인계 중인 방이면 스냅샷을 받아 복원 (adopt 메시지보다 이벤트가 먼저 온 경우)"""
+    if not store.is_shared or not room_id or room_id in rooms:
+        return
+    snapshot = store.take_room_snapshot(room_id)
+    if snapshot is None:
+        return
+    rooms[room_id] = GameState.from_dict(snapshot)
+    sessions.bind_room(room_id, rooms[room_id])
+    log.info("📥 방 인계 받음: %s", room_id)
+    from game_events import resume_room
+    resume_room(room_id)
+
+
+def owner_routed(fn: Callable) -> Callable:
+    """
+    방 이벤트 핸들러 데코레이터. @socketio.on(...) 바로 아래에 둡니다.
+    🔥 [NEW] data["roomId"] 방의 액터 메일박스에 넣어 그 방의 다른 작업과 순서대로 실행하고,
+    실행 직전에 소유 워커가 다른 곳이면 그쪽으로 이벤트를 넘깁니다.
+    """
+    remote(fn)
+    _routed.add(_key(fn))
+
+    @functools.wraps(fn)
+    def wrapper(data=None, *args):
+        room_id = data.get("roomId") if isinstance(data, dict) else None
+        if not room_id:
+            return fn(data, *args)
+        room_actors.post(room_id, _dispatch_event, fn, data, *args, label=fn.__name__)
+        return None
+
+    return wrapper
+
+
+def _dispatch_event(fn: Callable, data: Dict[str, Any], *args):
+    """(방 액터 안에서) 로컬 소켓 이벤트: 메일박스에서 기다리는 동안 연결이 끊긴 클라이언트면 버림"""
+    if not socketio.server.manager.is_connected(request.sid, request.namespace):
+        return
+    _dispatch(fn, data, *args)
+
+
+def _dispatch(fn: Callable, data: Dict[str, Any], *args):
+    """(방 액터 안에서) 소유 워커가 다른 곳이면 전달, 아니면 실행"""
+    room_id = data.get("roomId")
+    owner = owner_of(room_id)
+    if owner:
+        call_on_owner(owner, fn, request.sid, data)
+        return
+    ensure_local(room_id)
+    fn(data, *args)
+
+
+def call_on_owner(owner: str, fn: Callable, sid: str, data: Any):
+    store.publish(_channel(owner), {"fn": _key(fn), "sid": sid, "data": data, "from": worker_id()})
+
+
+def call_on_others(fn: Callable, sid: str, data: Any):
+    """모든 다른 워커에서 fn 실행 (예: 연결 끊김 처리)"""
+    if store.is_shared:
+        store.publish(BROADCAST_CHANNEL, {"fn": _key(fn), "sid": sid, "data": data, "from": worker_id()})
+
+
+def _on_message(message: Dict[str, Any]):
+    if message.get("from") == worker_id():
+        # 브로드캐스트는 보낸 워커 자신에게도 돌아오므로 무시
+        return
+    fn = _handlers.get(message.get("fn"))
+    if fn is None:
+        log.warning("⚠️ Unknown forwarded handler: %s", message.get("fn"))
+        return
+    data = message.get("data")
+    room_id = data.get("roomId") if isinstance(data, dict) else None
+    if room_id:
+        # 🔥 [NEW] 방 작업은 그 방의 액터에서 순서대로 (원래 sid로 요청 컨텍스트 복원)
+        sid = message.get("sid")
+        if message.get("fn") in _routed:
+            room_actors.post(room_id, _dispatch, fn, data, sid=sid, app=_app, label=fn.__name__)
+        else:
+            room_actors.post(room_id, fn, data, sid=sid, app=_app)
+        return
+    socketio.start_background_task(_run_forwarded, fn, message.get("sid"), data)
+
+
+def _run_forwarded(fn: Callable, sid: str, data: Any):
+    """원래 클라이언트의 sid로 요청 컨텍스트를 만들어 핸들러 실행 (emit/join_room이 그 sid를 대상으로 동작)"""
+    with _app.test_request_context("/socket.io/"):
+        request.sid = sid
+        request.namespace = "/"
+        try:
+            fn(data)
+        except Exception as e:
+            log.exception("❌ Forwarded handler error (%s): %s", _key(fn), e)
+
+
+# --- 워커 목록 / 재배치 ---
+
+def _update_ring() -> bool:
+    live = store.live_workers()
+    if worker_id() not in live:
+        live.append(worker_id())
+    return ring.set_nodes(live)
+
+
+def _membership_loop():
+    while True:
+        socketio.sleep(HEARTBEAT_INTERVAL)
+        try:
+            store.heartbeat(worker_id(), WORKER_TTL)
+            if _update_ring():
+                log.info("🌐 Cluster membership changed: %s", list(ring.nodes))
+                rebalance()
+        except Exception as e:
+            log.warning("⚠️ Cluster heartbeat error: %s", e)
+
+
+def rebalance(include_games: bool = False, direct: bool = False):
+    """
+    링 소유자가 바뀐 로컬 방을 인계. 기본은 게임 시작 전 방만, include_games면 진행 중인 게임도.
+    인계는 방 액터에서 실행 (direct=True는 종료 시처럼 액터가 더 돌지 않을 때)
+    """
+    for room_id in list(rooms):
+        if direct:
+            handoff(room_id, include_games)
+        else:
+            room_actors.post(room_id, handoff, room_id, include_games)
+
+
+def handoff(room_id: str, include_games: bool = False):
+    """방 스냅샷 저장 -> 디렉터리 소유자 변경 -> 로컬 삭제 -> 새 소유자에게 adopt 요청"""
+    gs = rooms.get(room_id)
+    target = ring_owner(room_id)
+    if gs is None or target == worker_id():
+        return
+    if gs.payout_results:
+        return  # 끝난 게임: 곧 삭제되므로 옮기지 않음
+    if gs.game_started and not include_games:
+        return
+    if gs.turn_timer:
+        gs.turn_timer.cancel()
+        gs.turn_timer = None
+    store.save_room_snapshot(room_id, gs.to_dict())
+    store.set_room_owner(room_id, target)
+    del rooms[room_id]
+    sessions.drop_room(room_id, gs)
+    call_on_owner(target, adopt_room, None, {"roomId": room_id})
+    log.info("📤 방 인계: %s -> %s", room_id, target)
+
+
+@remote
+def adopt_room(data):
+    ensure_local(data.get("roomId"))
+
+
+def shutdown():
+    """정상 종료: 워커 목록에서 빠지고 남은 워커에게 방 인계"""
+    if not store.is_shared:
+        return
+    try:
+        store.remove_worker(worker_id())
+        live = [w for w in store.live_workers() if w != worker_id()]
+        if not live:
+            return
+        ring.set_nodes(live)
+        rebalance(include_games=True, direct=True)
+    except Exception as e:
+        log.warning("⚠️ Cluster shutdown handoff failed: %s", e)
@@ -0,0 +1,195 @@
+# codec.py
+# 🔥 [NEW] Socket.IO 패킷 코덱 협상 (JSON 텍스트 / MessagePack 바이너리)
+#
+# 클라이언트가 socket.io-msgpack-parser로 접속하면 첫 패킷(CONNECT)부터 바이너리 프레임으로 옵니다.
+# 서버는 그걸 보고 그 연결(eio sid)을 msgpack으로 표시하고, 이후 그 연결로 나가는 패킷을 전부 msgpack으로 보냅니다.
+# 파서를 바꾸지 않은 클라이언트는 지금처럼 JSON (기본값이자 폴백).
+#
+#     import msgpackParser from "socket.io-msgpack-parser";
+#     const socket = io(URL, { parser: msgpackParser });
+#
+# 방 브로드캐스트는 python-socketio 매니저가 패킷을 한 번만 인코딩해 모든 수신자에게 재사용하므로,
+# CodecPacket.encode()가 돌려주는 JSON 문자열(_Encoded)에 같은 패킷의 msgpack 프레임을 필요할 때 한 번만 만들어 붙입니다.
+# -> emit 한 번에 JSON 1회 + (방에 msgpack 수신자가 있으면) msgpack 1회 인코딩.
+# 멀티 워커(message_queue)에서도 각 워커가 자기 연결로 보낼 때 인코딩하므로 그대로 동작합니다.
+#
+# MSGPACK_ENABLED=0이면 설치하지 않음 (바이너리로 접속하는 클라이언트는 디코딩에 실패)
+#
+# install()은 python-socketio/engineio의 내부 메서드(_send_packet, _send_eio_packet, _binary_packet,
+# eio 핸들러)를 감싸므로, 확인된 버전(TESTED_VERSIONS, requirements.txt 고정 버전)이 아니면 시작할 때 실패합니다.
+# 업그레이드 시 tests/test_codec.py를 돌려 보고 TESTED_VERSIONS를 올리세요.
+import asyncio
+import os
+from importlib import metadata
+from typing import Any, Dict, Optional, Set
+
+import msgpack
+from engineio import packet as eio_packet
+from socketio import packet
+
+MSGPACK_ENABLED = os.environ.get("MSGPACK_ENABLED", "1") != "0"
+
+# 패키지 -> 확인된 (major, minor)
+TESTED_VERSIONS = {
+    "python-socketio": (5, 14),
+    "python-engineio": (4, 12),
+}
+_PATCHED_ATTRS = ("_send_packet", "_send_eio_packet", "_binary_packet", "_handle_eio_message", "_handle_eio_disconnect")
+
+_msgpack_sids: Set[str] = set()  # msgpack으로 협상된 engine.io 세션
+
+
+def encode_msgpack(pkt: packet.Packet) -> bytes:
+    """socket.io-msgpack-parser 형식 ({type, data, nsp, id}). 바이너리는 본문에 그대로 들어가므로 BINARY_* 대신 EVENT/ACK"""
+    d = pkt._to_dict()
+    if pkt.packet_type == packet.BINARY_EVENT:
+        d["type"] = packet.EVENT
+    elif pkt.packet_type == packet.BINARY_ACK:
+        d["type"] = packet.ACK
+    return msgpack.packb(d)
+
+
+class _Encoded(str):
+    """JSON으로 인코딩된 패킷 텍스트 + 원본 패킷 (msgpack 수신자용 프레임은 처음 필요할 때 만듦)"""
+
+    def binary_frame(self) -> eio_packet.Packet:
+        frame = getattr(self, "frame", None)
+        if frame is None:
+            frame = self.frame = eio_packet.Packet(eio_packet.MESSAGE, encode_msgpack(self.packet))
+        return frame
+
+
+class _Attachment(bytes):
+    """JSON 모드의 바이너리 첨부 패킷 (msgpack 수신자에게는 본문에 이미 들어 있으므로 보내지 않음)"""
+
+
+def _wrap(text: str, pkt: packet.Packet) -> _Encoded:
+    encoded = _Encoded(text)
+    encoded.packet = pkt
+    return encoded
+
+
+class CodecPacket(packet.Packet):
+    """JSON으로 인코딩하되 msgpack 버전을 만들 수 있게 원본을 붙여 두고, 바이너리 프레임은 msgpack으로 디코딩"""
+
+    def encode(self):
+        encoded = super().encode()
+        if isinstance(encoded, list):
+            return [_wrap(encoded[0], self)] + [_Attachment(a) for a in encoded[1:]]
+        return _wrap(encoded, self)
+
+    def decode(self, encoded_packet):
+        if isinstance(encoded_packet, bytes):
+            decoded = msgpack.unpackb(encoded_packet)
+            self.packet_type = decoded["type"]
+            self.data = decoded.get("data")
+            self.id = decoded.get("id")
+            self.namespace = decoded.get("nsp") or "/"
+            return 0
+        return super().decode(encoded_packet)
+
+
+def server_options() -> Dict[str, Any]:
+    """socketio.init_app / AsyncServer에 넘길 옵션"""
+    return {"serializer": CodecPacket} if MSGPACK_ENABLED else {}
+
+
+def msgpack_clients() -> int:
+    return len(_msgpack_sids)
+
+
+def _frame_for_msgpack(eio_pkt: eio_packet.Packet) -> Optional[eio_packet.Packet]:
+    """msgpack 연결로 보낼 엔진 패킷 (None: 보내지 않음)"""
+    data = eio_pkt.data
+    if isinstance(data, _Encoded):
+        return data.binary_frame()
+    if isinstance(data, _Attachment):
+        return None
+    return eio_pkt  # 엔진 레벨 패킷 등 (코덱과 무관)
+
+
+def _installed_version(dist: str) -> str:
+    return metadata.version(dist)
+
+
+def check_versions(server) -> None:
+    """감싸는 내부 API가 install()을 작성할 때의 버전과 같은지 확인 (다르면 RuntimeError)"""
+    for dist, tested in TESTED_VERSIONS.items():
+        version = _installed_version(dist)
+        if tuple(int(x) for x in version.split(".")[:2]) != tested:
+            raise RuntimeError(
+                f"codec.install() supports {dist} {tested[0]}.{tested[1]}.x, found {version} "
+                f"(re-check the patched internals and tests/test_codec.py, or set MSGPACK_ENABLED=0)"
+            )
+    missing = [name for name in _PATCHED_ATTRS if not hasattr(server, name)]
+    if missing:
+        raise RuntimeError(f"codec.install(): socketio server has no {', '.join(missing)}")
+
+
+def install(server) -> None:
+    """
+    socketio.Server 또는 AsyncServer(ASGI 브리지면 그 안의 sio)에 연결.
+    _send_packet/_send_eio_packet은 호출 시점에 인스턴스 속성으로 찾으므로 덮어쓰고,
+    engine.io 이벤트 핸들러는 서버 생성 때 등록되므로 eio.on으로 다시 등록합니다.
+    """
+    if not MSGPACK_ENABLED:
+        return
+    server = getattr(server, "sio", server)
+    check_versions(server)
+    send_packet, send_eio_packet = server._send_packet, server._send_eio_packet
+    on_message, on_disconnect = server._handle_eio_message, server._handle_eio_disconnect
+
+    def mark(eio_sid, data):
+        # 바이너리 첨부(JSON 모드) 대기 중이 아닌데 바이너리 프레임이 오면 msgpack 클라이언트
+        if isinstance(data, bytes) and eio_sid not in server._binary_packet:
+            _msgpack_sids.add(eio_sid)
+
+    if asyncio.iscoroutinefunction(send_packet):
+        async def _send_packet(eio_sid, pkt):
+            if eio_sid not in _msgpack_sids:
+                return await send_packet(eio_sid, pkt)
+            await server.eio.send_packet(eio_sid, eio_packet.Packet(eio_packet.MESSAGE, encode_msgpack(pkt)))
+
+        async def _send_eio_packet(eio_sid, eio_pkt):
+            if eio_sid in _msgpack_sids:
+                eio_pkt = _frame_for_msgpack(eio_pkt)
+                if eio_pkt is None:
+                    return
+            await send_eio_packet(eio_sid, eio_pkt)
+
+        async def _handle_eio_message(eio_sid, data):
+            mark(eio_sid, data)
+            await on_message(eio_sid, data)
+
+        async def _handle_eio_disconnect(eio_sid, *args):
+            try:
+                await on_disconnect(eio_sid, *args)
+            finally:
+                _msgpack_sids.discard(eio_sid)
+    else:
+        def _send_packet(eio_sid, pkt):
+            if eio_sid not in _msgpack_sids:
+                return send_packet(eio_sid, pkt)
+            server.eio.send_packet(eio_sid, eio_packet.Packet(eio_packet.MESSAGE, encode_msgpack(pkt)))
+
+        def _send_eio_packet(eio_sid, eio_pkt):
+            if eio_sid in _msgpack_sids:
+                eio_pkt = _frame_for_msgpack(eio_pkt)
+                if eio_pkt is None:
+                    return
+            send_eio_packet(eio_sid, eio_pkt)
+
+        def _handle_eio_message(eio_sid, data):
+            mark(eio_sid, data)
+            on_message(eio_sid, data)
+
+        def _handle_eio_disconnect(eio_sid, *args):
+            try:
+                on_disconnect(eio_sid, *args)
+            finally:
+                _msgpack_sids.discard(eio_sid)
+
+    server._send_packet = _send_packet
+    server._send_eio_packet = _send_eio_packet
+    server.eio.on("message", _handle_eio_message)
+    server.eio.on("disconnect", _handle_eio_disconnect)
@@ -1,9 +1,14 @@
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore, firestore_async
 import os
 
+from logs import get_logger
+
+log = get_logger("payout")
+
 # 🔥 [FIX] TRUE LAZY LOADING - Don't initialize on import!
 _db_client = None
+_async_db_client = None
 
 def get_db():
     """Get Firestore database client with lazy initialization"""
@@ -12,6 +17,10 @@ def get_db():
     # Return cached client if already initialized
     if _db_client is not None:
         return _db_client
+
+    # 🔥 [NEW] 부하 테스트/벤치마크: 키가 있어도 Firestore를 쓰지 않음 (돈 기록은 건너뜀)
+    if os.environ.get("FIREBASE_DISABLED") == "1":
+        return None
     
     # Initialize Firebase Admin ONLY when first needed
     if not firebase_admin._apps:
@@ -22,19 +31,31 @@ def get_db():
             )
             
             if os.path.exists(service_key_path):
-                print("🔥 Firebase initializing (lazy)...")
+                log.info("🔥 Firebase initializing (lazy)...")
                 cred = credentials.Certificate(service_key_path)
                 firebase_admin.initialize_app(cred)
                 _db_client = firestore.client()
-                print("✅ Firebase initialized successfully")
+                log.info("✅ Firebase initialized successfully")
             else:
-                print(f"⚠️ Service account key not found: {service_key_path}")
+                log.warning("⚠️ Service account key not found: %s", service_key_path)
                 return None
         except Exception as e:
-            print(f"❌ Firebase initialization failed: {e}")
+            log.warning("❌ Firebase initialization failed: %s", e)
             return None
     else:
         # Already initialized, just get client
         _db_client = firestore.client()
     
     return _db_client
+
+
+def get_async_db():
+    """🔥 [NEW] asyncio 서버 모드용 Firestore AsyncClient (get_db()와 같은 앱 초기화를 공유)"""
+    global _async_db_client
+
+    if _async_db_client is not None:
+        return _async_db_client
+    if get_db() is None:
+        return None
+    _async_db_client = firestore_async.client()
+    return _async_db_client
@@ -1,34 +1,44 @@
 # game_events.py
+import logging
 import random
 import time # 👈 time 임포트
-from threading import Timer
 from flask import request
 from flask_socketio import emit
 from extensions import socketio
-from state import rooms
+from state import rooms, sessions
 from models import GameState, Player, Color, TurnPhase, Optional # 👈 TurnPhase 임포트
-from utils import find_player_by_sid, find_player_by_uid, get_room, broadcast_in_game_state, serialize_state_for_lobby, update_user_money_async # 🔥 [NEW]
+from utils import find_player_by_sid, find_player_by_uid, get_room, broadcast_in_game_state, serialize_state_for_lobby, update_user_money_async, remove_room # 🔥 [NEW]
+from cluster import owner_routed # 🔥 [NEW] 멀티 워커: 방 소유 워커로 이벤트 전달
+from scheduler import timer_wheel # 🔥 [NEW] 공유 타이머 휠
+from actors import room_actors # 🔥 [NEW] 방 단위 액터: 타이머 콜백도 방 메일박스에서 실행
+from state_sync import ClientSync # 🔥 [NEW] 델타 프로토콜
+from logs import get_logger # 🔥 [NEW] 구조화 로깅
+from turn_phases import TIMED, accepts, transition # 🔥 [NEW] 턴 페이즈 전이표
 
 from game_logic import (
     prepare_tiles, deal_initial_hands, start_turn_from, 
-    auto_place_drawn_tile, guess_tile, is_player_eliminated, get_alive_players
+    auto_place_drawn_tile, guess_tile, is_player_eliminated,
+    payout_for_rank, rank_newly_eliminated, assign_final_ranks,
+    reveal_tile, reveal_hand, add_tile, set_rank, get_unranked_players
 )
 
-# 🔥 Firebase Admin SDK 임포트
-try:
-    from firebase_admin_config import get_db
-    from firebase_admin import firestore as admin_firestore
-    FIREBASE_AVAILABLE = True
-    print("✅ Firebase Admin imported successfully")
-except Exception as e:
-    FIREBASE_AVAILABLE = False
-    print(f"⚠️ Firebase Admin not available: {e}")
+log = get_logger("game")
+turn_log = get_logger("turn")      # 턴/페이즈 진행 (LOG_SAMPLE=turn=0.1 등으로 샘플링)
+payout_log = get_logger("payout")  # 순위/정산
+
+# 🔥 [NEW] 사용자 저장소 (Firestore 또는 오프라인 대역, USERDB_URL)
+from userdb import userdb
 
 
 
 
 TURN_TIMER_SECONDS = 60
 
+# 🔥 [NEW] 연출용 지연 (핸들러에서 자지 않고 schedule()로 후속 작업 예약)
+GAME_START_DELAY = 1.0  # game_started -> 첫 턴 (프론트엔드 씬 전환/리스너 등록 시간)
+RESOLVE_DELAY = 0.3     # 탈락 반영 상태 -> 게임 종료 판정
+GAME_OVER_DELAY = 0.5   # 최종 상태 -> game_over
+
 # --- 헬퍼: 턴 관리 ---
 
 def get_current_player(gs: GameState) -> Optional[Player]:
@@ -36,15 +46,34 @@ def get_current_player(gs: GameState) -> Optional[Player]:
         return None
     return gs.players[gs.current_turn % len(gs.players)]
 
+# --- 헬퍼: 예약된 후속 작업 (socketio.sleep 대신) ---
+# 지연 뒤의 처리는 timer_wheel로 방 액터에 다시 넣어 별도 작업으로 실행합니다 (그동안 액터는 다른 이벤트 처리).
+# 후속 작업은 예약한 페이즈에서만 실행: 그 사이 페이즈가 바뀌면(턴 플레이어 퇴장, 정산 등) 버려짐.
+# gs.continuation은 직렬화되므로 워커 인계 후 resume_room이 남은 시간으로 다시 예약합니다.
+
+def schedule(room_id: str, gs: GameState, step: str, delay: float, **args):
+    """delay초 뒤 CONTINUATIONS[step](room_id, gs, **args) 실행 예약 (현재 페이즈에 묶임)"""
+    gs.continuation = {"step": step, "seq": gs.phase_seq, "due": time.time() + delay, "args": args}
+    timer_wheel.call_later(delay, room_actors.post, room_id, run_continuation, room_id, gs.phase_seq, step)
+
+def run_continuation(room_id: str, seq: int, step: str):
+    gs = rooms.get(room_id)
+    pending = gs.continuation if gs else None
+    if not pending or pending["seq"] != seq or pending["step"] != step:
+        turn_log.debug("[%s] 후속 작업 무시: %s (페이즈 변경됨)", room_id, step)
+        return
+    gs.continuation = None
+    CONTINUATIONS[step](room_id, gs, **pending["args"])
+
 def start_game_flow(room_id: str):
     """(백그라운드) 게임 시작 로직: 타일 준비 -> 패 분배 -> 시작 신호 -> 첫 턴"""
     # 1. 방 정보 가져오기
     gs = get_room(room_id)
     if not gs:
-        print(f"❌ 게임 시작 실패: 방 {room_id}를 찾을 수 없음.")
+        log.error("❌ 게임 시작 실패: 방 %s를 찾을 수 없음.", room_id)
         return
 
-    print(f"🚀 게임 시작 루틴 실행: {room_id}")
+    log.info("🚀 게임 시작 루틴 실행: %s", room_id)
 
     # 2. 게임 데이터 초기화 (로직)
     prepare_tiles(gs)        # 검정/흰색 타일 섞기
@@ -53,15 +82,18 @@ def start_game_flow(room_id: str):
     # 3. 상태 플래그 설정
     gs.game_started = True
     gs.current_turn = -1     # start_next_turn에서 +1을 하여 0번(첫 번째) 플레이어가 되도록 설정
+    transition(gs, "INIT")
 
     # 4. 프론트엔드에 '게임 시작' 알림 (Lobby -> Game 화면 전환용)
     socketio.emit("game_started", {"roomId": room_id}, room=room_id)
-    print(f"📡 game_started 이벤트 전송 완료 -> 프론트엔드 씬 전환 대기")
+    log.info("📡 game_started 이벤트 전송 완료 -> 프론트엔드 씬 전환 대기")
 
     # 5. 프론트엔드 로딩 대기 (Vue 컴포넌트가 마운트되고 소켓 리스너를 켤 시간 확보)
-    socketio.sleep(1)
+    # 6. 그 뒤 첫 번째 턴 시작 (DRAWING 단계로 진입)
+    schedule(room_id, gs, "first_turn", GAME_START_DELAY)
+
 
-    # 6. 첫 번째 턴 시작 (DRAWING 단계로 진입)
+def _first_turn(room_id: str, gs: GameState):
     start_next_turn(room_id)
 
 
@@ -71,11 +103,11 @@ def start_next_turn(room_id: str, reason: str = None):
     if not gs: return
 
     # 🔥 [수정] 생존자 먼저 확인
-    active_players_count = len(get_alive_players(gs))
+    active_players_count = len(gs.alive)
     
     # 생존자가 1명 이하면 게임 종료되어야 하므로 턴 시작 안 함
     if active_players_count <= 1:
-        print(f"[{room_id}] 생존자 {active_players_count}명, 게임 종료 조건")
+        turn_log.info("[%s] 생존자 %s명, 게임 종료 조건", room_id, active_players_count)
         return
 
     # 🔥 [수정] 다음 생존 플레이어 찾기 (안전한 루프)
@@ -92,26 +124,26 @@ def start_next_turn(room_id: str, reason: str = None):
         attempts += 1
     else:
         # 루프를 다 돌았는데도 생존자가 없다면 (비정상)
-        print(f"[{room_id}] ❌ ERROR: 턴을 넘길 생존자가 없습니다.")
+        turn_log.error("[%s] ❌ ERROR: 턴을 넘길 생존자가 없습니다.", room_id)
         return
 
     player = get_current_player(gs)
     if not player: 
-        print(f"[{room_id}] ❌ ERROR: 현재 플레이어를 찾을 수 없습니다.")
+        turn_log.error("[%s] ❌ ERROR: 현재 플레이어를 찾을 수 없습니다.", room_id)
         return
 
-    print(f"--- {player.nickname} 님의 턴 시작 ---")
+    turn_log.info("--- %s 님의 턴 시작 ---", player.nickname)
     
     # [수정] 턴 페이즈 결정
     piles_empty = not gs.piles["black"] and not gs.piles["white"]
     
     if piles_empty:
         # 더미가 없으면 바로 '추리'
-        print(f"[{room_id}] 더미 없음 -> GUESSING 페이즈로 설정")
+        turn_log.info("[%s] 더미 없음 -> GUESSING 페이즈로 설정", room_id)
         set_turn_phase(room_id, "GUESSING", reason=reason)
     else:
         # 👈 [복구] 더미가 있으면 '드로우' 단계
-        print(f"[{room_id}] 더미 있음 -> DRAWING 페이즈로 설정")
+        turn_log.info("[%s] 더미 있음 -> DRAWING 페이즈로 설정", room_id)
         set_turn_phase(room_id, "DRAWING", reason=reason)
 
 def set_turn_phase(room_id: str, phase: TurnPhase, broadcast: bool = True, reason: str = None):
@@ -119,11 +151,17 @@ def set_turn_phase(room_id: str, phase: TurnPhase, broadcast: bool = True, reaso
     (수정) 지정된 페이즈로 상태 변경 (DRAWING 로직 포함)
     broadcast: False이면 상태 전송을 건너뜀 (애니메이션 등 특수 상황용)
     """
-    print(f"[{room_id}] set_turn_phase 호출됨: {phase}, reason={reason}")
+    turn_log.info("[%s] set_turn_phase 호출됨: %s, reason=%s", room_id, phase, reason)
     gs = get_room(room_id)
     player = get_current_player(gs)
     if not gs or not player:
-        print(f"[{room_id}] set_turn_phase 실패: gs or player not found")
+        turn_log.info("[%s] set_turn_phase 실패: gs or player not found", room_id)
+        return
+
+    # 🔥 [NEW] 전이표에 없는 전환은 거부 (상태/타이머 그대로)
+    previous = gs.turn_phase
+    if not transition(gs, phase):
+        turn_log.warning("[%s] 잘못된 페이즈 전환 거부: %s -> %s", room_id, previous, phase)
         return
 
     # 1. 기존 타이머 취소
@@ -132,13 +170,12 @@ def set_turn_phase(room_id: str, phase: TurnPhase, broadcast: bool = True, reaso
         gs.turn_timer = None
 
     # 2. 상태 변경
-    gs.turn_phase = phase
     if phase != "PLACE_JOKER":
         gs.drawn_tile = None
         gs.pending_placement = False
         gs.can_place_anywhere = False
     
-    print(f"[{room_id}] {player.nickname} 페이즈 변경: {phase}")
+    turn_log.info("[%s] %s 페이즈 변경: %s", room_id, player.nickname, phase)
 
     # 3. 클라이언트에 현재 턴 정보 전송 (페이즈 변경 알림은 항상 전송)
     emit_data = {
@@ -155,19 +192,17 @@ def set_turn_phase(room_id: str, phase: TurnPhase, broadcast: bool = True, reaso
         if gs.piles["white"]: available_piles.append("white")
         emit_data["available_piles"] = available_piles
 
-    print(f"[{room_id}] game:turn_phase_start 이벤트 전송 시도: {emit_data}")
+    turn_log.debug("[%s] game:turn_phase_start 이벤트 전송 시도: %s", room_id, emit_data)
     socketio.emit("game:turn_phase_start", emit_data, room=room_id)
-    print(f"[{room_id}] game:turn_phase_start 이벤트 전송 완료")
+    turn_log.debug("[%s] game:turn_phase_start 이벤트 전송 완료", room_id)
 
     # 5. 새 타이머 시작 (ANIMATING_GUESS 제외)
     # 🔥 [FIX] 상태 브로드캐스트 전에 시간 초기화해야 함
-    if phase != "ANIMATING_GUESS":
+    if phase in TIMED:
         gs.turn_start_time = time.time() # 🔥 [NEW] 턴 시작 시간 기록
-        gs.turn_timer = Timer(
-            TURN_TIMER_SECONDS,
-            lambda: handle_timeout(room_id, player.uid, phase)
+        gs.turn_timer = timer_wheel.call_later(
+            TURN_TIMER_SECONDS, room_actors.post, room_id, handle_timeout, room_id, player.uid, phase
         )
-        gs.turn_timer.start()
 
     # 4. 전체 상태 브로드캐스트 (옵션)
     if broadcast:
@@ -179,16 +214,16 @@ def handle_timeout(room_id: str, player_uid: str, expected_phase: TurnPhase):
     gs = rooms.get(room_id)
 
     if not gs:
-        print(f"타임아웃 무시: room {room_id}가 이미 삭제됨.")
+        turn_log.debug("타임아웃 무시: room %s가 이미 삭제됨.", room_id)
         return
 
     player = get_current_player(gs)
 
     if not player or player.uid != player_uid or gs.turn_phase != expected_phase:
-        print(f"타임아웃 무시: (uid: {player_uid}, phase: {expected_phase})")
+        turn_log.debug("타임아웃 무시: (uid: %s, phase: %s)", player_uid, expected_phase)
         return
 
-    print(f"⏰ 타임아웃 발생! {player.nickname} 님의 턴을 넘깁니다.")
+    turn_log.info("⏰ 타임아웃 발생! %s 님의 턴을 넘깁니다.", player.nickname)
     
     # 타이머 취소
     if gs.turn_timer:
@@ -200,44 +235,63 @@ def handle_timeout(room_id: str, player_uid: str, expected_phase: TurnPhase):
     if unrevealed_cards:
         import random
         card_to_reveal = random.choice(unrevealed_cards)
-        card_to_reveal.revealed = True
-        print(f"🃏 타임아웃 페널티: {player.nickname}의 카드 {card_to_reveal.color} {card_to_reveal.number} 공개됨")
+        reveal_tile(gs, player, card_to_reveal)
+        turn_log.info("🃏 타임아웃 페널티: %s의 카드 %s %s 공개됨", player.nickname, card_to_reveal.color, card_to_reveal.value)
 
     # 다음 턴으로 (패배 처리 없음)
     start_next_turn(room_id, reason="timeout")
 
 
+def resume_room(room_id: str):
+    """🔥 [NEW] 다른 워커에서 인계받은 방: 남은 턴 시간으로 타이머를 다시 걸고 전체 상태 전송"""
+    gs = rooms.get(room_id)
+    if not gs:
+        return
+    player = get_current_player(gs)
+    if gs.game_started and player and gs.turn_phase in TIMED:
+        remaining = max(0.0, TURN_TIMER_SECONDS - (time.time() - gs.turn_start_time))
+        gs.turn_timer = timer_wheel.call_later(
+            remaining, room_actors.post, room_id, handle_timeout, room_id, player.uid, gs.turn_phase
+        )
+    if gs.continuation:
+        pending = gs.continuation
+        schedule(room_id, gs, pending["step"], max(0.0, pending["due"] - time.time()), **pending["args"])
+    if gs.game_started:
+        broadcast_in_game_state(room_id)
+    else:
+        socketio.emit("room_state", serialize_state_for_lobby(gs), room=room_id)
+
+
 # ... (이벤트 핸들러들 생략) ...
 
 def handle_winnings(room_id: str):
     """(수정) 게임 종료 후 랭킹과 개인 베팅 금액에 따라 화폐를 계산하고 정산"""
-    print(f"💰 [handle_winnings] Called for {room_id}")
+    payout_log.info("💰 [handle_winnings] Called for %s", room_id)
     gs = get_room(room_id)
     if not gs: return
 
+    # 🔥 [NEW] 한 게임에 한 번만 (이미 GAME_OVER면 전이표가 거부)
+    if not transition(gs, "GAME_OVER"):
+        payout_log.warning("⚠️ [handle_winnings] %s 이미 정산됨 - 무시", room_id)
+        return
+    if gs.turn_timer:
+        gs.turn_timer.cancel()
+        gs.turn_timer = None
+
     # 1. Assign ranks: winner gets 1, others get sequential ranks based on existing final_rank or order
     # 🔥 [DEBUG] Print current ranks before assignment
-    print(f"🔍 [DEBUG] Ranks before handle_winnings assignment:")
-    for p in gs.players:
-        print(f"  - {p.nickname}: final_rank={p.final_rank}, settled={p.settled}")
-    
-    # Find any player without a rank (final_rank == 0) as the winner
-    winner = next((p for p in gs.players if p.final_rank == 0), None)
-    if winner:
-        winner.final_rank = 1
-        print(f"🏆 [DEBUG] Assigned rank 1 to winner: {winner.nickname}")
-    # Assign ranks to remaining players who still have rank 0
-    next_rank = 2
-    for p in gs.players:
-        if p.final_rank == 0:
-            p.final_rank = next_rank
-            print(f"🔢 [DEBUG] Assigned rank {next_rank} to {p.nickname}")
-            next_rank += 1
+    if payout_log.isEnabledFor(logging.DEBUG):
+        payout_log.debug("🔍 [DEBUG] Ranks before handle_winnings assignment: %s",
+                         [(p.nickname, p.final_rank, p.settled) for p in gs.players])
+    
+    # Find any player without a rank (final_rank == 0) as the winner,
+    # then assign sequential ranks to remaining players who still have rank 0
+    assign_final_ranks(gs)
     
     # 🔥 [DEBUG] Print final ranks
-    print(f"🔍 [DEBUG] Ranks after handle_winnings assignment:")
-    for p in gs.players:
-        print(f"  - {p.nickname}: final_rank={p.final_rank}")
+    if payout_log.isEnabledFor(logging.DEBUG):
+        payout_log.debug("🔍 [DEBUG] Ranks after handle_winnings assignment: %s",
+                         [(p.nickname, p.final_rank) for p in gs.players])
 
     payout_results = []
     
@@ -254,23 +308,18 @@ def handle_winnings(room_id: str):
             # net_change는 역산하거나 0으로 표시 (여기서는 0으로 표시하되, 최종 금액은 반영됨)
             # 정확한 net_change를 알기 위해선 별도 저장이 필요하지만, 
             # 일단 현재 로직상 1등 아니면 -bet 이었을 것임.
-            if rank == 1:
-                net_change = +(bet * 3)
-            else:
-                net_change = -bet
+            net_change = payout_for_rank(rank, bet)
         else:
             # 정산 안 된 플레이어 (끝까지 남은 사람들)
-            if rank == 1:
-                net_change = +(bet * 3) # 🔥 1등은 베팅 금액의 3배 획득
-            else:
-                net_change = -bet # 🔥 나머지는 베팅 금액 차감 (패배)
+            # 🔥 1등은 베팅 금액의 3배 획득, 나머지는 베팅 금액 차감 (패배)
+            net_change = payout_for_rank(rank, bet)
             
             # 3. Player.money 업데이트
             player.money += net_change
             player.settled = True # 정산 완료 표시
 
             # 🔥 [NEW] Firestore 업데이트 (비동기)
-            if FIREBASE_AVAILABLE:
+            if userdb.available:
                 update_user_money_async(player.uid, net_change, player.nickname)
 
         # 4. 프론트엔드/DB 업데이트를 위한 결과 저장 (모든 플레이어 포함)
@@ -286,12 +335,12 @@ def handle_winnings(room_id: str):
     # 5. 모든 클라이언트에게 정산 결과 브로드캐스트
     if payout_results:
         gs.payout_results = payout_results # 🔥 [NEW] 결과 저장 (재접속 시 전송용)
-        print(f"💸 정산 결과 ({room_id}): {payout_results}")
+        payout_log.info("💸 정산 결과 (%s): %s", room_id, payout_results)
         socketio.emit("game:payout_result", payout_results, room=room_id)
     else:
-        print(f"⚠️ 정산 결과 없음 ({room_id}) - 이미 처리됨?")
+        payout_log.warning("⚠️ 정산 결과 없음 (%s) - 이미 처리됨?", room_id)
     
-    print(f"[{room_id}] 게임 정산 완료. 순위별 정산 처리됨.")
+    payout_log.info("[%s] 게임 정산 완료. 순위별 정산 처리됨.", room_id)
 
     # 🔥 [추가] 방 삭제 (리소스 정리)
     # 클라이언트가 결과를 볼 시간을 주기 위해 타이머로 삭제하거나,
@@ -299,12 +348,13 @@ def handle_winnings(room_id: str):
     # 안전하게 10초 후 삭제하도록 설정
     def delete_room():
         if room_id in rooms:
-            del rooms[room_id]
-            print(f"🗑️ 방 삭제 완료: {room_id}")
+            remove_room(room_id)
+            payout_log.info("🗑️ 방 삭제 완료: %s", room_id)
     
-    Timer(10.0, delete_room).start()
+    timer_wheel.call_later(10.0, room_actors.post, room_id, delete_room)
 
 @socketio.on("draw_tile")
+@owner_routed
 def on_draw_tile(data):
     """플레이어가 덱에서 카드를 뽑을 때"""
     room_id = data.get("roomId")
@@ -316,7 +366,7 @@ def on_draw_tile(data):
     if not gs or not player:
         return
     
-    if gs.turn_phase != "DRAWING":
+    if not accepts(gs, "draw_tile"):
         return
     
     if gs.players[gs.current_turn].sid != player.sid:
@@ -336,6 +386,7 @@ def on_draw_tile(data):
         set_turn_phase(room_id, "GUESSING")
 
 @socketio.on("place_joker")
+@owner_routed
 def on_place_joker(data):
     """플레이어가 조커를 배치할 위치를 선택했을 때"""
     room_id = data.get("roomId")
@@ -347,7 +398,7 @@ def on_place_joker(data):
     if not gs or not player:
         return
     
-    if gs.turn_phase != "PLACE_JOKER":
+    if not accepts(gs, "place_joker"):
         return
     
     if gs.players[gs.current_turn].sid != player.sid:
@@ -355,7 +406,7 @@ def on_place_joker(data):
     
     # 조커 배치
     if gs.drawn_tile and gs.drawn_tile.is_joker:
-        player.hand.insert(index, gs.drawn_tile)
+        add_tile(gs, player, index, gs.drawn_tile)
         player.last_drawn_index = index
         gs.drawn_tile = None
         gs.pending_placement = False
@@ -365,6 +416,7 @@ def on_place_joker(data):
         set_turn_phase(room_id, "GUESSING")
 
 @socketio.on("guess_value")
+@owner_routed
 def on_guess_value(data):
     """플레이어가 추리를 시도할 때"""
     room_id = data.get("roomId")
@@ -378,7 +430,7 @@ def on_guess_value(data):
     if not gs or not guesser:
         return
     
-    if gs.turn_phase not in ["GUESSING", "POST_SUCCESS_GUESS"]:
+    if not accepts(gs, "guess_value"):
         return
     
     if gs.players[gs.current_turn].sid != guesser.sid:
@@ -404,6 +456,7 @@ def on_guess_value(data):
     }, room=room_id)
 
 @socketio.on("stop_guessing")
+@owner_routed
 def on_stop_guessing(data):
     """플레이어가 연속 추리를 멈추고 턴을 넘길 때 호출됨"""
     room_id = data.get("roomId")
@@ -418,12 +471,17 @@ def on_stop_guessing(data):
     # 현재 턴인지 확인
     if gs.players[gs.current_turn].sid != player.sid:
         return
+
+    # 🔥 [NEW] 추리 결과 처리 중(애니메이션/판정 대기)에는 턴을 넘길 수 없음
+    if not accepts(gs, "stop_guessing"):
+        return
     
-    print(f"[{room_id}] {player.nickname} 턴 패스")
+    log.info("[%s] %s 턴 패스", room_id, player.nickname)
     
     # 다음 턴으로 넘김
     start_next_turn(room_id)
 @socketio.on("game:animation_done")
+@owner_routed
 def on_animation_done(data):
     """클라이언트가 추리 결과 애니메이션을 완료했을 때 호출됨"""
     room_id = data.get("roomId")
@@ -439,70 +497,63 @@ def on_animation_done(data):
     if not player or gs.players[gs.current_turn].uid != player.uid:
         return 
 
-    if gs.turn_phase != "ANIMATING_GUESS":
+    if not accepts(gs, "animation_done"):
         # 이미 처리되었거나 페이즈가 안 맞으면 무시
         return
     
-    # 🔥 [FIX] Race Condition 방지: 즉시 페이즈를 변경하여 중복 실행 막음
-    gs.turn_phase = "PROCESSING"
+    # 결과를 소비했다는 표시: 같은 animation_done이 여러 번 와도 한 번만 처리
+    # (동시 실행은 방 액터가 막아 주므로, 이 값은 멱등성용)
+    transition(gs, "PROCESSING")
 
-    print(f"[{room_id}] {player.nickname} 애니메이션 완료. 결과: {correct}")
+    log.info("[%s] %s 애니메이션 완료. 결과: %s", room_id, player.nickname, correct)
 
     # 1. 탈락자 처리 및 순위 산정
     # 🔥 [FIX] Count UNRANKED players (final_rank == 0), not just alive players!
     # This ensures correct ranking: 4 players → 1st eliminated gets 4th place
-    unranked_players = [p for p in gs.players if p.final_rank == 0]
-    unranked_count = len(unranked_players)
-    print(f"🔍 [DEBUG] Initial unranked_count: {unranked_count}, unranked: {[p.nickname for p in unranked_players]}")
+    unranked_count = len(gs.unranked)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("🔍 [DEBUG] Initial unranked_count: %s, unranked: %s", unranked_count,
+                  [p.nickname for p in get_unranked_players(gs)])
     
     # 방금 탈락한 플레이어 찾기 (final_rank가 0인데 eliminated 상태인 경우)
-    for p in gs.players:
-        if p.final_rank == 0 and is_player_eliminated(p):
-            # 🔥 [FIX] Assign rank based on UNRANKED count (includes this player!)
-            p.final_rank = unranked_count
-            print(f"🔥 [DEBUG] Assigning rank {unranked_count} to {p.nickname} (was eliminated)")
-            unranked_count -= 1
-            print(f"🔥 [DEBUG] Decremented unranked_count to {unranked_count}")
-
-            # Reveal all cards of eliminated player
-            for tile in p.hand:
-                tile.revealed = True
-            print(f"🃏 [Elimination] All cards revealed for {p.nickname}")
-
-            print(f"💀 플레이어 탈락: {p.nickname} (Rank: {p.final_rank})")
-            socketio.emit("game:player_eliminated", {
-                "uid": p.uid,
-                "nickname": p.nickname,
-                "rank": p.final_rank
-            }, room=room_id)
-
-            # Broadcast updated state so client knows player is eliminated before settlement
-            broadcast_in_game_state(room_id)
-
-            # 🔥 [NEW] 즉시 패배 정산 (돈 차감)
-            if not p.settled:
-                net_change = -p.bet_amount
-                p.money += net_change
-                p.settled = True
-
-                print(f"💰 [Settlement] Player {p.nickname} eliminated. Bet: {p.bet_amount}, Net: {net_change}") # 🔥 [LOG]
-
-                # Firestore 업데이트 (패배 패널티 - 비동기)
-                if FIREBASE_AVAILABLE:
-                    update_user_money_async(p.uid, net_change, p.nickname)
-
-            # 🔥 [NEW] 정산 결과 전송 -⟶ GameOverModal 띄우기 위함
-            socketio.emit("game:payout_result", [{
-                "uid": p.uid,
-                "nickname": p.nickname,
-                "rank": p.final_rank,
-                "bet": p.bet_amount,
-                "net_change": net_change,
-                "new_total": p.money
-            }], room=room_id)
-
-            # Broadcast again after payout result to ensure UI sync
-            broadcast_in_game_state(room_id)
+    # 🔥 [FIX] Assign rank based on UNRANKED count (includes this player!), all cards revealed
+    for p in rank_newly_eliminated(gs):
+        unranked_count -= 1
+
+        log.info("💀 플레이어 탈락: %s (Rank: %s)", p.nickname, p.final_rank)
+        socketio.emit("game:player_eliminated", {
+            "uid": p.uid,
+            "nickname": p.nickname,
+            "rank": p.final_rank
+        }, room=room_id)
+
+        # Broadcast updated state so client knows player is eliminated before settlement
+        broadcast_in_game_state(room_id)
+
+        # 🔥 [NEW] 즉시 패배 정산 (돈 차감)
+        if not p.settled:
+            net_change = -p.bet_amount
+            p.money += net_change
+            p.settled = True
+
+            log.info("💰 [Settlement] Player %s eliminated. Bet: %s, Net: %s", p.nickname, p.bet_amount, net_change) # 🔥 [LOG]
+
+            # Firestore 업데이트 (패배 패널티 - 비동기)
+            if userdb.available:
+                update_user_money_async(p.uid, net_change, p.nickname)
+
+        # 🔥 [NEW] 정산 결과 전송 -⟶ GameOverModal 띄우기 위함
+        socketio.emit("game:payout_result", [{
+            "uid": p.uid,
+            "nickname": p.nickname,
+            "rank": p.final_rank,
+            "bet": p.bet_amount,
+            "net_change": net_change,
+            "new_total": p.money
+        }], room=room_id)
+
+        # Broadcast again after payout result to ensure UI sync
+        broadcast_in_game_state(room_id)
  # 🔥 [NEW] 상태 브로드캐스트 (카드 공개 및 탈락 반영)
 
     # 🔥 [FIX] 게임 종료 체크 전에 반드시 상태 업데이트를 먼저 보냄
@@ -510,47 +561,43 @@ def on_animation_done(data):
     broadcast_in_game_state(room_id)
 
     # Slight delay before checking game end to allow UI to process state update
-    socketio.sleep(0.3)
+    # 🔥 [NEW] 핸들러에서 자지 않고 후속 작업으로 예약 (그 사이 턴이 넘어가거나 게임이 끝나면 버려짐)
+    schedule(room_id, gs, "resolve_guess", RESOLVE_DELAY, guesser_uid=player.uid, correct=correct)
+
+
+def _resolve_guess(room_id: str, gs: GameState, guesser_uid: str, correct: bool):
+    """(animation_done 후속) 게임 종료 판정 -> 정산 또는 턴 진행"""
+    player = find_player_by_uid(gs, guesser_uid)
+    unranked_count = len(gs.unranked)
 
     # 2. 게임 종료 조건 확인 (순위 없는 플레이어가 1명 이하일 때)
     # 🔥 [FIX] Check unranked_count, not alive_count!
-    print(f"🔍 [DEBUG] Checking game end: unranked_count={unranked_count}")
+    log.debug("🔍 [DEBUG] Checking game end: unranked_count=%s", unranked_count)
     if unranked_count <= 1:
-        print(f"🏆 게임 종료! 순위 없는 플레이어 {unranked_count}명")
+        log.info("🏆 게임 종료! 순위 없는 플레이어 %s명", unranked_count)
         
         # 🔥 [FIX] 마지막 순위 없는 플레이어에게 1등 부여
         if unranked_count == 1:
             # Find the remaining unranked player
-            remaining_unranked = [p for p in gs.players if p.final_rank == 0]
+            remaining_unranked = get_unranked_players(gs)
             if remaining_unranked:
                 winner = remaining_unranked[0]
-                winner.final_rank = 1
-                print(f"🏆 [DEBUG] Winner {winner.nickname} assigned rank 1")
+                set_rank(gs, winner, 1)
+                log.debug("🏆 [DEBUG] Winner %s assigned rank 1", winner.nickname)
         
         # 정산 및 종료 처리
         handle_winnings(room_id)
 
         # Ensure UI receives final state before game_over
         broadcast_in_game_state(room_id)
-        socketio.sleep(0.5)
-
-        # 게임 종료 이벤트 전송 (handle_winnings에서 payout_result를 보내지만, 명시적 game_over도 보냄)
-        winner = next((p for p in gs.players if p.final_rank == 1), None)
-        print(f"🏆 Sending game_over for {room_id}. Winner: {winner.nickname if winner else 'Unknown'}")
-        socketio.emit("game_over", {
-            "winner": {"name": winner.nickname if winner else "Unknown"}
-        }, room=room_id)
-        
-        # 방 정리 (약간의 딜레이 후)
-        # socketio.sleep(10) 
-        # del rooms[room_id] # 바로 삭제하면 클라이언트가 결과를 못 봄. 나중에 처리하거나 클라이언트가 나가도록 유도.
+        schedule(room_id, gs, "announce_game_over", GAME_OVER_DELAY)
         return
 
     # 3. 상태 업데이트 전송
     broadcast_in_game_state(room_id)
 
     # 4. 결과에 따른 턴 진행 분기
-    if correct:
+    if correct and player:
         # 정답 -> 연속 추리 기회 (단, 내가 탈락했으면 턴 넘김 - 희박하지만 자폭룰이 있다면)
         if is_player_eliminated(player):
              start_next_turn(room_id)
@@ -566,24 +613,71 @@ def on_animation_done(data):
         # 오답 -> 턴 종료 및 다음 사람
         start_next_turn(room_id)
 
+
+def _announce_game_over(room_id: str, gs: GameState):
+    # 게임 종료 이벤트 전송 (handle_winnings에서 payout_result를 보내지만, 명시적 game_over도 보냄)
+    winner = next((p for p in gs.players if p.final_rank == 1), None)
+    log.info("🏆 Sending game_over for %s. Winner: %s", room_id, winner.nickname if winner else 'Unknown')
+    socketio.emit("game_over", {
+        "winner": {"name": winner.nickname if winner else "Unknown"}
+    }, room=room_id)
+    
+    # 방 정리 (약간의 딜레이 후)
+    # socketio.sleep(10) 
+    # del rooms[room_id] # 바로 삭제하면 클라이언트가 결과를 못 봄. 나중에 처리하거나 클라이언트가 나가도록 유도.
+
+
+# 🔥 [NEW] schedule()로 예약 가능한 후속 작업 (gs.continuation["step"] -> 함수)
+CONTINUATIONS = {
+    "first_turn": _first_turn,
+    "resolve_guess": _resolve_guess,
+    "announce_game_over": _announce_game_over,
+}
+
 @socketio.on("request_game_state")
+@owner_routed
 def on_request_game_state(data):
-    """(신규) 프론트엔드가 게임 페이지 로드 직후 호출하는 함수"""
+    """(신규) 프론트엔드가 게임 페이지 로드 직후 호출하는 함수
+    🔥 [NEW] {"delta": true}를 보내면 이후 state_delta(변경분)를 받음. 버전 불일치 시에도 이 이벤트로 재동기화.
+    """
     room_id = data.get("roomId")
     if not room_id: return
 
+    # 🔥 [NEW] 요청자에게는 항상 전체 스냅샷을 보냄
+    gs = rooms.get(room_id)
+    if gs and find_player_by_sid(gs, request.sid):
+        sync = gs.client_sync.setdefault(request.sid, ClientSync())
+        sync.delta = bool(data.get("delta", sync.delta))
+        sync.reset()
+
     # 현재 게임 상태 전체를 브로드캐스트 (혹은 요청자에게만 전송)
     # broadcast_in_game_state 함수가 이미 구현되어 있으므로 활용
     broadcast_in_game_state(room_id)
     
-    print(f"[{room_id}] 클라이언트의 요청으로 게임 상태 동기화 전송")
+    log.info("[%s] 클라이언트의 요청으로 게임 상태 동기화 전송", room_id)
+
+@socketio.on("state_ack")
+@owner_routed
+def on_state_ack(data):
+    """🔥 [NEW] 델타 모드 클라이언트가 적용 완료한 state_version을 알림"""
+    room_id = data.get("roomId")
+    version = data.get("version")
+    gs = rooms.get(room_id)
+    if not gs or not isinstance(version, int):
+        return
+    sync = gs.client_sync.get(request.sid)
+    if not sync or version > sync.sent_version:
+        return
+    if sync.acked_version is None or version > sync.acked_version:
+        sync.acked_version = version
 
 
 @socketio.on("leave_game")
+@owner_routed
 def on_leave_game(data):
     room_id = data.get("roomId")
     sid = request.sid
-    print(f"<- 방 이탈: {sid} left room {room_id}")
+    log.info("<- 방 이탈: %s left room %s", sid, room_id)
 
     if room_id not in rooms:
         return
@@ -601,35 +695,33 @@ def on_leave_game(data):
         game_started = gs.game_started or (gs.turn_phase != "INIT") or has_cards
 
         if game_started:
-            print(f"⚠️ {player.nickname} 님이 나가기 버튼을 눌러 패배 처리됩니다.")
+            log.warning("⚠️ %s 님이 나가기 버튼을 눌러 패배 처리됩니다.", player.nickname)
             
             # (1) 모든 카드 공개
-            for tile in player.hand:
-                tile.revealed = True
-            print(f"🃏 [Leave] Cards revealed.")
+            reveal_hand(gs, player)
+            log.debug("🃏 [Leave] Cards revealed.")
             
             # (2) 탈락 처리 및 순위 산정
             if player.final_rank == 0:
                 # 🔥 [FIX] Use unranked_count (same fix as on_animation_done)
                 # Count players who haven't been ranked yet
-                unranked_players = [p for p in gs.players if p.final_rank == 0]
-                unranked_count = len(unranked_players)
-                player.final_rank = unranked_count
-                print(f"🥇 [Leave] Rank assigned: {player.final_rank} (unranked_count was {unranked_count})")
+                unranked_count = len(gs.unranked)
+                set_rank(gs, player, unranked_count)
+                log.info("🥇 [Leave] Rank assigned: %s (unranked_count was %s)", player.final_rank, unranked_count)
                 
                 socketio.emit("game:player_eliminated", {
                     "uid": player.uid,
                     "nickname": player.nickname,
                     "rank": player.final_rank
                 }, room=room_id)
-                print(f"📡 [Leave] game:player_eliminated emitted.")
+                log.debug("📡 [Leave] game:player_eliminated emitted.")
 
                 # (3) 즉시 패배 정산 (돈 차감)
                 if not player.settled:
                     net_change = -player.bet_amount
                     player.money += net_change
                     player.settled = True
-                    print(f"💰 [Leave] Settlement processed.")
+                    log.debug("💰 [Leave] Settlement processed.")
                     
                     # 정산 결과 저장 및 전송 (UI 먼저 갱신!)
                     payout_data = {
@@ -643,18 +735,18 @@ def on_leave_game(data):
                     gs.payout_results.append(payout_data)
                     
                     socketio.emit("game:payout_result", [payout_data], room=room_id)
-                    print(f"📡 [Leave] game:payout_result emitted.")
+                    log.debug("📡 [Leave] game:payout_result emitted.")
 
                     # 🔥 [NEW] 상태 브로드캐스트 (카드 공개 및 탈락 반영) - 이것도 DB 저장 전에!
                     broadcast_in_game_state(room_id)
                     
                     # Firestore 업데이트 (DB 저장은 나중에 - 비동기)
-                    if FIREBASE_AVAILABLE:
+                    if userdb.available:
                         update_user_money_async(player.uid, net_change, player.nickname)
 
             # 3. 턴 넘기기 (만약 내 턴이었다면)
             if gs.players[gs.current_turn].sid == player.sid:
-                print("내 턴에 나갔으므로 턴을 넘깁니다.")
+                log.info("내 턴에 나갔으므로 턴을 넘깁니다.")
                 if gs.turn_timer: gs.turn_timer.cancel()
                 start_next_turn(room_id)
             # else:
@@ -663,12 +755,11 @@ def on_leave_game(data):
 
             # 4. 게임 종료 조건 확인 (남은 순위 없는 플레이어가 1명 이하)
             # 🔥 [FIX] Use unranked_count for consistency with on_animation_done
-            unranked_remaining = [p for p in gs.players if p.final_rank == 0]
-            if len(unranked_remaining) <= 1:
-                print(f"🏆 게임 종료! (나가기로 인한 종료)")
-                if len(unranked_remaining) == 1:
-                    winner = unranked_remaining[0]
-                    winner.final_rank = 1
+            if len(gs.unranked) <= 1:
+                log.info("🏆 게임 종료! (나가기로 인한 종료)")
+                if gs.unranked:
+                    winner = get_unranked_players(gs)[0]
+                    set_rank(gs, winner, 1)
                 
                 handle_winnings(room_id)
                 
@@ -681,7 +772,8 @@ def on_leave_game(data):
         if not game_started:
             if player in gs.players:
                 gs.players.remove(player)
-                print(f"🗑️ {player.name} removed from room {room_id}")
+                sessions.unbind(room_id, player)
+                log.info("🗑️ %s removed from room %s", player.name, room_id)
 
             # 3. 방이 비었거나 로비 상태라면 정리
             if gs.players:
@@ -689,13 +781,10 @@ def on_leave_game(data):
                     p.id = i
                 socketio.emit("room_state", serialize_state_for_lobby(gs), room=room_id)
             else:
-                print(f"🗑️ Room {room_id} is empty, deleting.")
-                if room_id in rooms:
-                    del rooms[room_id]
+                log.info("🗑️ Room %s is empty, deleting.", room_id)
+                remove_room(room_id)
         else:
-            print(f"🚫 게임 중이므로 {player.nickname}를 목록에서 제거하지 않음 (재접속/정산 보존)")
+            log.info("🚫 게임 중이므로 %s를 목록에서 제거하지 않음 (재접속/정산 보존)", player.nickname)
 
     except Exception as e:
-        print(f"❌ Error in on_leave_game: {e}")
-        import traceback
-        traceback.print_exc()
\ No newline at end of file
+        log.exception("❌ Error in on_leave_game: %s", e)
\ No newline at end of file
@@ -1,7 +1,11 @@
 # game_logic.py
 import random
+from operator import attrgetter
 from typing import List, Literal, Optional
 from models import Tile, Player, GameState, Color
+from logs import get_logger
+
+log = get_logger("turn")
 
 def shuffle(arr):
     tmp = arr[:]
@@ -27,22 +31,17 @@ def make_tiles_by_color(gs: GameState, color: Color) -> List[Tile]:
     return shuffle(arr)
 
 def compare_tiles(a: Tile, b: Tile, same_number_order: str = "black-first") -> int:
+    """부호만 의미 있음 (음수: a가 앞). 조커는 숫자보다 뒤, 조커끼리는 같음"""
     if a.is_joker and b.is_joker:
         return 0
-    if a.is_joker:
-        return 1
-    if b.is_joker:
-        return -1
-    if a.value != b.value:
-        return (a.value or 0) - (b.value or 0)
-    if same_number_order == "black-first":
-        return -1 if a.color == "black" else 1
-    else:
-        return -1 if a.color == "white" else 1
+    # 🔥 [NEW] 미리 계산한 정렬 키(값 * 2 + 흰색 비트). white-first면 같은 숫자 안에서 색 순서만 뒤집음
+    flip = same_number_order != "black-first"
+    return (a.key ^ flip) - (b.key ^ flip)
+
+_sort_key = attrgetter("key")
 
 def sort_hand(gs: GameState, hand: List[Tile]) -> None:
-    hand.sort(key=lambda t: (t.value if not t.is_joker else 999,
-                             0 if t.color == "black" else 1))
+    hand.sort(key=_sort_key)
 
 def prepare_tiles(gs: GameState):
     gs.next_tile_id = 0
@@ -72,22 +71,64 @@ def deal_initial_hands(gs: GameState):
         sort_hand(gs, p.hand)
     gs.piles["black"] = shuffle(gs.piles["black"] + joker_buf["black"])
     gs.piles["white"] = shuffle(gs.piles["white"] + joker_buf["white"])
+    gs.recount()
+
+# 🔥 [NEW] 증분 카운터 갱신 (타일 공개/추가/순위 부여/퇴장은 모두 이 헬퍼들을 거쳐야 함)
+
+def reveal_tile(gs: GameState, player: Player, tile: Tile) -> bool:
+    """player 손패의 tile을 공개. 이미 공개돼 있으면 False"""
+    if tile.revealed:
+        return False
+    tile.revealed = True
+    player.unrevealed -= 1
+    if player.unrevealed == 0:
+        gs.alive.discard(player.uid)
+    return True
+
+def reveal_hand(gs: GameState, player: Player) -> None:
+    """player의 손패를 전부 공개 (탈락/퇴장)"""
+    for t in player.hand:
+        t.revealed = True
+    player.unrevealed = 0
+    gs.alive.discard(player.uid)
+
+def add_tile(gs: GameState, player: Player, index: int, tile: Tile) -> None:
+    player.hand.insert(index, tile)
+    if not tile.revealed:
+        player.unrevealed += 1
+        gs.alive.add(player.uid)
+
+def set_rank(gs: GameState, player: Player, rank: int) -> None:
+    player.final_rank = rank
+    if rank:
+        gs.unranked.discard(player.uid)
+    else:
+        gs.unranked.add(player.uid)
+
+def remove_player(gs: GameState, player: Player) -> None:
+    """게임 중 방에서 플레이어를 빼면서 카운터에서도 제거"""
+    gs.players.remove(player)
+    gs.alive.discard(player.uid)
+    gs.unranked.discard(player.uid)
 
 def auto_insert_index(gs: GameState, hand: List[Tile], tile: Tile) -> int:
+    """
+    tile보다 뒤에 올 첫 숫자 타일 자리, 없으면 마지막 숫자 타일 바로 뒤 (숫자 타일이 없으면 0).
+    숫자 타일끼리는 항상 정렬돼 있으므로(조커만 아무 데나 놓임) 미리 계산한 정렬 키로 한 번만 훑음.
+    (손패가 13장 이하라 키 목록을 만들어 이분 탐색하는 것보다 조기 종료하는 선형 탐색이 빠름)
+    """
     if tile.is_joker:
         return len(hand)
-    numeric_idx = [i for i, t in enumerate(hand) if not t.is_joker]
-    k = 0
-    while k < len(numeric_idx):
-        other = hand[numeric_idx[k]]
-        if compare_tiles(tile, other, gs.same_number_order) < 0:
-            break
-        k += 1
-    if not numeric_idx:
-        return 0
-    if k == len(numeric_idx):
-        return numeric_idx[-1] + 1
-    return numeric_idx[k]
+    flip = gs.same_number_order != "black-first"
+    target = tile.key ^ flip
+    last = -1
+    for i, t in enumerate(hand):
+        if t.is_joker:
+            continue
+        if (t.key ^ flip) > target:
+            return i
+        last = i
+    return last + 1
 
 def start_turn_from(gs: GameState, player: Player, color: Color) -> Optional[Tile]:
     if gs.pending_placement:
@@ -109,7 +150,7 @@ def auto_place_drawn_tile(gs: GameState, player: Player):
     if not t or t.is_joker:
         return
     idx = auto_insert_index(gs, player.hand, t)
-    player.hand.insert(idx, t)
+    add_tile(gs, player, idx, t)
     player.last_drawn_index = idx
     gs.drawn_tile = None
     gs.pending_placement = False
@@ -134,17 +175,17 @@ def guess_tile(gs: GameState, guesser: Player, target_id: int, index: int, value
     is_correct = False
     
     # 🔥 [DEBUG] 조커 추리 로깅
-    print(f"🎯 Guess: tile.is_joker={tile.is_joker}, tile.value={tile.value}, guess_value={value}")
+    log.debug("🎯 Guess: tile.is_joker=%s, tile.value=%s, guess_value=%s", tile.is_joker, tile.value, value)
     
     if tile.is_joker and (value == 12 or value == "JOKER" or value == "joker" or str(value).upper() == "JOKER"):
         is_correct = True
-        print(f"✅ 조커 추리 정답!")
+        log.debug("✅ 조커 추리 정답!")
     elif not tile.is_joker and tile.value == value:
         is_correct = True
-        print(f"✅ 숫자 추리 정답!")
+        log.debug("✅ 숫자 추리 정답!")
     
     if is_correct:
-        tile.revealed = True
+        reveal_tile(gs, target, tile)
         # ▼▼▼ [수정] 정답 시 실제 타일 정보(actual_tile) 반환 ▼▼▼
         return {
             "ok": True, 
@@ -159,7 +200,7 @@ def guess_tile(gs: GameState, guesser: Player, target_id: int, index: int, value
     if unrevealed_cards:
         # 내 카드 중 하나를 랜덤으로 공개
         card_to_reveal = random.choice(unrevealed_cards)
-        card_to_reveal.revealed = True
+        reveal_tile(gs, guesser, card_to_reveal)
         penalty_tile = card_to_reveal # 페널티 타일 정보 저장
 
     # ▼▼▼ [수정] 오답 시 페널티 타일 정보 반환 ▼▼▼
@@ -171,11 +212,46 @@ def guess_tile(gs: GameState, guesser: Player, target_id: int, index: int, value
     }
 
 def is_player_eliminated(player: Player) -> bool:
-    """플레이어의 모든 카드가 공개되었는지 확인"""
-    if not player.hand:
-        return True # 카드가 없으면 탈락 취급 (혹은 초기 상태)
-    return all(t.revealed for t in player.hand)
+    """플레이어의 모든 카드가 공개되었는지 확인 (카드가 없어도 탈락 취급)"""
+    return player.unrevealed == 0
 
 def get_alive_players(gs: GameState) -> List[Player]:
-    """탈락하지 않은 플레이어 목록 반환"""
-    return [p for p in gs.players if not is_player_eliminated(p)]
\ No newline at end of file
+    """탈락하지 않은 플레이어 목록 반환 (자리 순서). 수만 필요하면 len(gs.alive)"""
+    alive = gs.alive
+    return [p for p in gs.players if p.uid in alive]
+
+def get_unranked_players(gs: GameState) -> List[Player]:
+    """순위가 아직 없는 플레이어 목록 (자리 순서). 수만 필요하면 len(gs.unranked)"""
+    unranked = gs.unranked
+    return [p for p in gs.players if p.uid in unranked]
+
+# 🔥 [NEW] 순위/정산 규칙 (소켓 핸들러와 헤드리스 시뮬레이터(simulator.py)가 같이 씀)
+
+WINNER_MULTIPLIER = 3  # 1등은 베팅 금액의 3배 획득, 나머지는 베팅 금액 차감
+
+def payout_for_rank(rank: int, bet: int) -> int:
+    """최종 순위에 따른 금액 변동"""
+    return bet * WINNER_MULTIPLIER if rank == 1 else -bet
+
+def rank_newly_eliminated(gs: GameState) -> List[Player]:
+    """
+    순위가 없는데(final_rank == 0) 카드가 모두 공개된 플레이어에게 순위를 매기고 카드를 전부 공개.
+    순위 = 그 시점의 순위 없는 플레이어 수 (4인 게임 첫 탈락자 -> 4등)
+    """
+    if gs.unranked <= gs.alive:
+        return []  # 순위 없는 플레이어가 모두 살아 있음 (대부분의 수)
+    unranked_count = len(gs.unranked)
+    eliminated = []
+    for p in get_unranked_players(gs):
+        if is_player_eliminated(p):
+            set_rank(gs, p, unranked_count)
+            unranked_count -= 1
+            reveal_hand(gs, p)
+            eliminated.append(p)
+    return eliminated
+
+def assign_final_ranks(gs: GameState) -> None:
+    """게임 종료 시: 순위 없는 첫 플레이어가 1등, 나머지 순위 없는 플레이어는 2등부터 차례로"""
+    remaining = get_unranked_players(gs)
+    for rank, p in enumerate(remaining, start=1):
+        set_rank(gs, p, rank)
@@ -1,162 +1,166 @@
 # general_events.py
 from flask import request
 from extensions import socketio
-from state import rooms, queue
-from utils import find_player_by_sid, broadcast_in_game_state, serialize_state_for_lobby, update_user_money_async
+from state import sessions
+from store import store # 🔥 [NEW] 대기열은 공유 저장소에 보관 (멀티 워커)
+from cluster import remote, call_on_others
+from actors import room_actors
+from utils import find_room_and_player_by_sid, broadcast_in_game_state, serialize_state_for_lobby, update_user_money_async, remove_room
+from logs import get_logger
 
-# 🔥 Firebase Admin SDK 임포트 (game_events.py와 동일하게 추가)
-try:
-    from firebase_admin_config import get_db
-    from firebase_admin import firestore as admin_firestore
-    FIREBASE_AVAILABLE = True
-except Exception as e:
-    FIREBASE_AVAILABLE = False
-    print(f"⚠️ Firebase Admin not available in general_events: {e}")
+log = get_logger("conn")
+
+# 🔥 [NEW] 사용자 저장소 (Firestore 또는 오프라인 대역, USERDB_URL)
+from userdb import userdb
 
 
 @socketio.on("connect")
 def on_connect():
-    print("🟢 connect:", request.sid)
+    log.info("🟢 connect: %s", request.sid)
 
 @socketio.on("disconnect")
 def on_disconnect(reason=None):  # 🔥 [FIXED] Flask-SocketIO passes reason parameter
-    print("🔴 disconnect:", request.sid, f"({reason})" if reason else "")
+    log.info("🔴 disconnect: %s (%s)", request.sid, reason)
+    sid = request.sid
     
-    global queue
-    original_len = len(queue)
-    queue = [p for p in queue if p["sid"] != request.sid]
-
-
-    if len(queue) < original_len:
-        print(f"👋 연결 끊김: 대기열에서 {request.sid} 제거됨.")
+    if store.queue_remove_sid(sid):
+        log.info("👋 연결 끊김: 대기열에서 %s 제거됨.", sid)
         # 🔥 [FIX] lobby_events에서 가져오거나 직접 구현
         try:
             from lobby_events import broadcast_queue_status
             broadcast_queue_status()
         except ImportError:
-            print("⚠️ broadcast_queue_status import failed")
+            log.warning("⚠️ broadcast_queue_status import failed")
+
+    # 🔥 [NEW] 이 워커에 방이 없으면 다른 워커가 가진 방에 있었을 수 있으므로 알림
+    if not disconnect_from_rooms(sid):
+        call_on_others(disconnect_from_rooms, sid, sid)
 
-    for room_id, gs in list(rooms.items()):
-        player = find_player_by_sid(gs, request.sid)
 
+@remote
+def disconnect_from_rooms(sid: str) -> bool:
+    """연결이 끊긴 sid를 이 워커의 방들에서 찾아 패배/정리 처리. 찾았으면 True"""
+    # 🔥 [NEW] 세션 디렉터리로 sid -> (방, 플레이어) 바로 조회 (모든 방 순회 제거)
+    found = find_room_and_player_by_sid(sid)
+    if found is None:
+        return False
+    # 🔥 [NEW] 실제 처리는 그 방의 액터에서 (턴 타이머/다른 이벤트와 섞이지 않게)
+    room_actors.post(found[0], _disconnect_player, sid)
+    return True
+
+
+def _disconnect_player(sid: str):
+    """(방 액터 안에서) 패배/정리 처리. 메일박스에서 기다리는 동안 재접속/퇴장했을 수 있으므로 다시 조회"""
+    found = find_room_and_player_by_sid(sid)
+    if found is None:
+        return False
+    room_id, gs, player = found
+    try:
+        # ▼▼▼▼▼ (핵심 수정) ▼▼▼▼▼
+        # [요청사항] 연결 끊김(새로고침/창닫기) 시 즉시 탈락 및 정산 처리
+        
+        # 1. 게임 중이라면 패배 처리 및 정산
+        # 🔥 [FIX] 더미가 비어있어도 게임 중일 수 있음. gs.game_started 플래그 또는 패를 가지고 있는지 확인
+        has_cards = len(player.hand) > 0
+        game_started = gs.game_started or (gs.turn_phase != "INIT") or has_cards
+        
+        if game_started:
+            log.warning("⚠️ %s 님이 이탈하여 패배 처리되고 배팅 금액을 모두 잃습니다.", player.nickname)
             
-        if player:
-            try:
-                # ▼▼▼▼▼ (핵심 수정) ▼▼▼▼▼
-                # [요청사항] 연결 끊김(새로고침/창닫기) 시 즉시 탈락 및 정산 처리
-                
-                # 1. 게임 중이라면 패배 처리 및 정산
-                # 🔥 [FIX] 더미가 비어있어도 게임 중일 수 있음. gs.game_started 플래그 또는 패를 가지고 있는지 확인
-                has_cards = len(player.hand) > 0
-                game_started = gs.game_started or (gs.turn_phase != "INIT") or has_cards
+            # (1) 모든 카드 공개
+            from game_logic import reveal_hand, set_rank, get_alive_players
+            reveal_hand(gs, player)
+            log.debug("🃏 [Disconnect] Revealed hand for %s", player.nickname)
+            
+            # (2) 탈락 처리 및 순위 산정
+            if player.final_rank == 0:
+                # 남은 생존자 수 + 1 = 내 순위 (예: 2명 남았을 때 죽으면 3등)
+                # (카드를 위에서 전부 공개했으므로 gs.alive에는 내가 없음)
+                set_rank(gs, player, len(gs.alive) + 1) # 🔥 [FIX] +1 
                 
-                if game_started:
-                    print(f"⚠️ {player.nickname} 님이 이탈하여 패배 처리되고 배팅 금액을 모두 잃습니다.")
+                socketio.emit("game:player_eliminated", {
+                    "uid": player.uid,
+                    "nickname": player.nickname,
+                    "rank": player.final_rank
+                }, room=room_id)
+    
+                # (3) 즉시 패배 정산 (돈 차감)
+                if not player.settled:
+                    net_change = -player.bet_amount
+                    player.money += net_change
+                    player.settled = True
                     
-                    # (1) 모든 카드 공개
-                    for tile in player.hand:
-                        tile.revealed = True
-                    print(f"🃏 [Disconnect] Revealed hand for {player.nickname}") # Debug
+                    # 정산 결과 저장 및 전송 (UI 먼저!)
+                    payout_data = {
+                        "uid": player.uid,
+                        "nickname": player.nickname,
+                        "rank": player.final_rank,
+                        "bet": player.bet_amount,
+                        "net_change": net_change,
+                        "new_total": player.money
+                    }
+                    gs.payout_results.append(payout_data) # 🔥 [FIX] 정산 결과 저장 (재접속 시 전송용)
                     
-                    # (2) 탈락 처리 및 순위 산정
-                    if player.final_rank == 0:
-                        from game_logic import get_alive_players
-                        alive_players = get_alive_players(gs)
-                        # 남은 생존자 수 + 1 = 내 순위 (예: 2명 남았을 때 죽으면 3등)
-                        # 하지만 이미 alive_players에는 내가 포함되어 있을 수 있음 (아직 remove 안했으므로)
-                        # get_alive_players는 final_rank==0인 사람만 반환함.
-                        # 내가 아직 final_rank가 0이면 alive_players에 포함됨.
-                        
-                        player.final_rank = len(alive_players) + 1 # 🔥 [FIX] +1 
-                        
-                        socketio.emit("game:player_eliminated", {
-                            "uid": player.uid,
-                            "nickname": player.nickname,
-                            "rank": player.final_rank
-                        }, room=room_id)
-    
-                        # (3) 즉시 패배 정산 (돈 차감)
-                        if not player.settled:
-                            net_change = -player.bet_amount
-                            player.money += net_change
-                            player.settled = True
-                            
-                            # 정산 결과 저장 및 전송 (UI 먼저!)
-                            payout_data = {
-                                "uid": player.uid,
-                                "nickname": player.nickname,
-                                "rank": player.final_rank,
-                                "bet": player.bet_amount,
-                                "net_change": net_change,
-                                "new_total": player.money
-                            }
-                            gs.payout_results.append(payout_data) # 🔥 [FIX] 정산 결과 저장 (재접속 시 전송용)
-                            
-                            socketio.emit("game:payout_result", [payout_data], room=room_id)
+                    socketio.emit("game:payout_result", [payout_data], room=room_id)
 
-                            # (3.5) 상태 브로드캐스트 (카드 공개 및 탈락 반영)
-                            broadcast_in_game_state(room_id)
+                    # (3.5) 상태 브로드캐스트 (카드 공개 및 탈락 반영)
+                    broadcast_in_game_state(room_id)
 
-                            # Firestore 업데이트 (이탈 패널티 - 비동기)
-                            if FIREBASE_AVAILABLE:
-                                update_user_money_async(player.uid, net_change, player.nickname)
+                    # Firestore 업데이트 (이탈 패널티 - 비동기)
+                    if userdb.available:
+                        update_user_money_async(player.uid, net_change, player.nickname)
     
-                    # (4) 턴 넘기기 (내 턴이었다면)
-                    if gs.players and gs.current_turn < len(gs.players):
-                        if gs.players[gs.current_turn].sid == player.sid:
-                            print(f"[{room_id}] 턴 플레이어 이탈 -> 턴 넘김 (Direct Call)")
-                            if gs.turn_timer: gs.turn_timer.cancel()
-                            from game_events import start_next_turn
-                            try:
-                                start_next_turn(room_id)
-                            except Exception as e:
-                                print(f"❌ start_next_turn failed: {e}")
-                        # else: broadcast_in_game_state(room_id) # 이미 위에서 함
+            # (4) 턴 넘기기 (내 턴이었다면)
+            if gs.players and gs.current_turn < len(gs.players):
+                if gs.players[gs.current_turn].sid == player.sid:
+                    log.info("[%s] 턴 플레이어 이탈 -> 턴 넘김 (Direct Call)", room_id)
+                    if gs.turn_timer: gs.turn_timer.cancel()
+                    from game_events import start_next_turn
+                    try:
+                        start_next_turn(room_id)
+                    except Exception as e:
+                        log.error("❌ start_next_turn failed: %s", e)
+                # else: broadcast_in_game_state(room_id) # 이미 위에서 함
     
-                    # (5) 게임 종료 조건 확인
-                    from game_logic import get_alive_players
-                    alive_players = get_alive_players(gs)
-                    
-                    # 나를 제외한 생존자가 1명 이하면 게임 종료
-                    # (내가 이미 final_rank가 설정되었으므로 get_alive_players에는 포함되지 않음)
-                    
-                    if len(alive_players) <= 1:
-                        print(f"🏆 게임 종료! (이탈로 인한 종료)")
-                        if len(alive_players) == 1:
-                            survivor = alive_players[0]
-                            survivor.final_rank = 1
-                        
-                        from game_events import handle_winnings
-                        handle_winnings(room_id)
-                        
-                        winner = next((p for p in gs.players if p.final_rank == 1), None)
-                        socketio.emit("game_over", {
-                            "winner": {"name": winner.nickname if winner else "Unknown"}
-                        }, room=room_id)
+            # (5) 게임 종료 조건 확인
+            # 나를 제외한 생존자가 1명 이하면 게임 종료
+            # (내 카드는 전부 공개됐으므로 gs.alive에 포함되지 않음)
+            if len(gs.alive) <= 1:
+                log.info("🏆 게임 종료! (이탈로 인한 종료)")
+                if gs.alive:
+                    survivor = get_alive_players(gs)[0]
+                    set_rank(gs, survivor, 1)
+                
+                from game_events import handle_winnings
+                handle_winnings(room_id)
+                
+                winner = next((p for p in gs.players if p.final_rank == 1), None)
+                socketio.emit("game_over", {
+                    "winner": {"name": winner.nickname if winner else "Unknown"}
+                }, room=room_id)
     
-                # 2. 플레이어 제거 (게임 중이 아닐 때만!)
-                print(f"🔍 [Disconnect] game_started={game_started}, phase={gs.turn_phase}") # Debug
-                if not game_started:
-                    if player in gs.players:
-                        gs.players.remove(player)
-                        print(f"🗑️ {player.name} removed from room {room_id}")
+        # 2. 플레이어 제거 (게임 중이 아닐 때만!)
+        log.debug("🔍 [Disconnect] game_started=%s, phase=%s", game_started, gs.turn_phase)
+        if not game_started:
+            if player in gs.players:
+                gs.players.remove(player)
+                sessions.unbind(room_id, player)
+                log.info("🗑️ %s removed from room %s", player.name, room_id)
     
-                    # 3. 방이 비었거나 로비 상태라면 정리
-                    if gs.players:
-                        # [로비] ID 재정렬
-                        for i, p in enumerate(gs.players):
-                            p.id = i
-                        socketio.emit("room_state", serialize_state_for_lobby(gs), room=room_id)
-                    else:
-                        print(f"🗑️ Room {room_id} is empty, deleting.")
-                        if room_id in rooms:
-                            del rooms[room_id]
-                else:
-                    print(f"🚫 게임 중이므로 {player.nickname}를 목록에서 제거하지 않음 (재접속/정산 보존)")
-                
-                break
-                # ▲▲▲▲▲ (핵심 수정) ▲▲▲▲▲
-            except Exception as e:
-                print(f"❌ Error in on_disconnect for {player.nickname}: {e}")
-                import traceback
-                traceback.print_exc()
\ No newline at end of file
+            # 3. 방이 비었거나 로비 상태라면 정리
+            if gs.players:
+                # [로비] ID 재정렬
+                for i, p in enumerate(gs.players):
+                    p.id = i
+                socketio.emit("room_state", serialize_state_for_lobby(gs), room=room_id)
+            else:
+                log.info("🗑️ Room %s is empty, deleting.", room_id)
+                remove_room(room_id)
+        else:
+            log.info("🚫 게임 중이므로 %s를 목록에서 제거하지 않음 (재접속/정산 보존)", player.nickname)
+        
+        return True
+        # ▲▲▲▲▲ (핵심 수정) ▲▲▲▲▲
+    except Exception as e:
+        log.exception("❌ Error in on_disconnect for %s: %s", player.nickname, e)
+        return True
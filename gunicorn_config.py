@@ -3,11 +3,15 @@
 # Worker class - CRITICAL for SocketIO
 worker_class = 'eventlet'
 
+import os
+
 # Number of worker processes
-workers = 1
+# 🔥 [NEW] 2 이상이면 SOCKETIO_MESSAGE_QUEUE(redis://...)가 필요하고,
+# 스티키 세션이 없으므로 클라이언트는 websocket transport만 사용해야 함 (polling 불가)
+workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
 
 # Binding
-bind = '0.0.0.0:5000'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
 
 # Timeout settings - INCREASED to prevent premature kills
 timeout = 120  # 2 minutes
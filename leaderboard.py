@@ -0,0 +1,133 @@
+# leaderboard.py
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from logs import get_logger
+
+log = get_logger("leaderboard")
+
+# 🔥 [NEW] 리더보드 캐시 설정 (환경 변수로 조정 가능)
+LEADERBOARD_LIMIT = 20
+LEADERBOARD_TTL_SECONDS = float(os.environ.get("LEADERBOARD_TTL_SECONDS", "15"))
+# TTL이 지난 뒤에도 Firestore 장애/지연 시 이 시간까지는 이전 결과를 그대로 제공
+LEADERBOARD_MAX_STALE_SECONDS = float(os.environ.get("LEADERBOARD_MAX_STALE_SECONDS", "600"))
+# 콜드 미스(캐시 없음)일 때 Firestore 쿼리 타임아웃
+LEADERBOARD_FETCH_TIMEOUT = float(os.environ.get("LEADERBOARD_FETCH_TIMEOUT", "5"))
+
+
+class LeaderboardUnavailable(Exception):
+    """캐시된 결과도 없고 Firestore 조회도 실패했을 때"""
+
+
+def fetch_top_users(limit: int = LEADERBOARD_LIMIT) -> List[Dict[str, Any]]:
+    """사용자 저장소(userdb)에서 money 내림차순 상위 N명을 조회"""
+    from userdb import userdb
+
+    users = userdb.top_users(limit, timeout=LEADERBOARD_FETCH_TIMEOUT)
+    if users is None:
+        raise LeaderboardUnavailable("Database connection failed")
+
+    leaderboard = []
+    for data in users:
+        leaderboard.append({
+            "uid": data["uid"],
+            "nickname": data.get("nickname", "Unknown"),
+            "major": data.get("major", ""),
+            "year": data.get("year", ""),
+            "money": data.get("money", 0)
+        })
+    return leaderboard
+
+
+class _Entry:
+    __slots__ = ("body", "etag", "fetched_at")
+
+    def __init__(self, body: bytes, etag: str, fetched_at: float):
+        self.body = body
+        self.etag = etag
+        self.fetched_at = fetched_at
+
+
+class LeaderboardCache:
+    """
+    리더보드 응답 캐시.
+    - TTL 동안은 Firestore를 호출하지 않고 직렬화된 응답을 그대로 재사용
+    - 동시에 들어온 미스는 한 번의 쿼리를 공유 (single-flight)
+    - TTL이 지나면 이전 결과를 즉시 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+    - 갱신이 실패해도 max_stale 이내라면 이전 결과를 계속 제공
+    """
+
+    def __init__(self, fetch: Callable[[], List[Dict[str, Any]]],
+                 ttl: float = LEADERBOARD_TTL_SECONDS,
+                 max_stale: float = LEADERBOARD_MAX_STALE_SECONDS):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        self._entry: Optional[_Entry] = None
+        self._inflight: Optional[threading.Event] = None
+        self._last_error: Optional[Exception] = None
+
+    def get(self) -> Tuple[bytes, str, float, str]:
+        """(body, etag, age, cache_status) 반환. cache_status는 HIT / MISS / STALE"""
+        now = time.time()
+        with self._lock:
+            entry = self._entry
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < self.ttl:
+                    return entry.body, entry.etag, age, "HIT"
+                if age < self.ttl + self.max_stale:
+                    # 만료됐지만 아직 쓸 만함 -> 즉시 반환 + 백그라운드 갱신
+                    if self._inflight is None:
+                        self._inflight = threading.Event()
+                        threading.Thread(target=self._refresh, daemon=True).start()
+                    return entry.body, entry.etag, age, "STALE"
+
+            # 콜드 미스 (또는 너무 오래된 캐시): 진행 중인 조회가 있으면 그것을 기다림
+            leader = self._inflight is None
+            if leader:
+                self._inflight = threading.Event()
+            inflight = self._inflight
+
+        if leader:
+            self._refresh()
+        else:
+            inflight.wait()
+
+        with self._lock:
+            entry = self._entry
+            if entry is None or time.time() - entry.fetched_at >= self.ttl + self.max_stale:
+                raise LeaderboardUnavailable(str(self._last_error or "Leaderboard unavailable"))
+            return entry.body, entry.etag, time.time() - entry.fetched_at, "MISS"
+
+    def invalidate(self):
+        """다음 요청 시 새로 조회하도록 캐시를 만료시킴 (이전 결과는 stale로 남음)"""
+        with self._lock:
+            if self._entry is not None:
+                self._entry.fetched_at = min(self._entry.fetched_at, time.time() - self.ttl)
+
+    def _refresh(self):
+        try:
+            data = self._fetch()
+            body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            etag = hashlib.sha1(body).hexdigest()
+            with self._lock:
+                self._entry = _Entry(body, etag, time.time())
+                self._last_error = None
+        except Exception as e:
+            log.warning("❌ Leaderboard refresh error: %s", e)
+            with self._lock:
+                self._last_error = e
+        finally:
+            with self._lock:
+                inflight, self._inflight = self._inflight, None
+            if inflight is not None:
+                inflight.set()
+
+
+leaderboard_cache = LeaderboardCache(fetch_top_users)
@@ -1,31 +1,66 @@
 # lobby_events.py
-import uuid
+import os
+import time
 from flask import request
 from flask_socketio import emit, join_room, leave_room
 from extensions import socketio
-from state import rooms, queue
+from state import rooms, sessions
+from store import store # 🔥 [NEW] 대기열은 공유 저장소에 보관 (멀티 워커)
+from cluster import owner_routed, remote, allocate_room_id, run_on
 # ▼▼▼ (수정) find_player_by_uid 임포트 ▼▼▼
 from utils import (
     get_room, find_player_by_sid, find_player_by_uid, 
-    broadcast_in_game_state, serialize_state_for_lobby
+    broadcast_in_game_state, serialize_state_for_lobby, remove_room,
+    increment_user_money_now
 )
 from models import Player, GameState, Optional
-from game_events import start_game_flow
+from game_events import start_game_flow, start_next_turn
+from game_logic import remove_player
+from turn_phases import transition # 🔥 [NEW] 턴 페이즈 전이표
+from profiles import profile_cache, apply_profile # 🔥 [NEW] 서버 측 프로필 캐시
+from scheduler import timer_wheel
+from actors import room_actors # 🔥 [NEW] 게임 진행 작업도 방 메일박스에서 실행
+from logs import get_logger
+
+log = get_logger("lobby")
+
+# 🔥 [NEW] 대기 중인 플레이어는 모두 이 Socket.IO 방에 들어가 있음 -> queue_status는 emit 1번
+QUEUE_ROOM = "matchmaking"
+# 🔥 [NEW] queue_status 최대 전송 빈도 (Hz). 입장 폭주 시 여러 변경을 한 번의 전송으로 합침
+QUEUE_STATUS_HZ = float(os.environ.get("QUEUE_STATUS_HZ", "5"))
+
+_queue_status_pending = False
+_queue_status_last = 0.0
+
 
 def broadcast_queue_status():
+    """대기열 상태 전송 예약 (1/QUEUE_STATUS_HZ초 안의 요청은 한 번으로 합쳐짐)"""
+    global _queue_status_pending
+    if _queue_status_pending:
+        return
+    _queue_status_pending = True
+    delay = max(0.0, _queue_status_last + 1.0 / QUEUE_STATUS_HZ - time.monotonic())
+    timer_wheel.call_later(delay, _flush_queue_status)
+
+
+def _flush_queue_status():
     """현재 대기열에 있는 모든 플레이어에게 최신 큐 상태를 전송"""
-    global queue
-    count = len(queue)
-    print(f"Broadcasting queue status: {count} players")
-    
-    for p in queue:
-        emit("queue_status", 
-             {"status": "waiting", "count": count, "max": 4}, 
-             to=p["sid"])
+    global _queue_status_pending, _queue_status_last
+    _queue_status_pending = False
+    _queue_status_last = time.monotonic()
+    count = store.queue_len()
+    log.debug("Broadcasting queue status: %s players", count)
+    socketio.emit("queue_status", {"status": "waiting", "count": count, "max": 4}, room=QUEUE_ROOM)
+
+
+def _leave_queue_room(sid: str):
+    try:
+        leave_room(QUEUE_ROOM, sid=sid)
+    except Exception:
+        pass  # 이미 연결이 끊긴 sid
 
 @socketio.on("join_queue")
 def on_join_queue(data):
-    global queue
     sid = request.sid
     bet_amount = int(data.get("betAmount", 10000)) # 🔥 [FIX] Ensure int
     
@@ -49,21 +84,7 @@ def on_join_queue(data):
         return
 
 
-    # ▼▼▼ [수정] 이미 대기열에 있는 경우 SID 업데이트 ▼▼▼
-    existing_player_index = next((i for i, p in enumerate(queue) if p["uid"] == uid), -1)
-    if existing_player_index != -1:
-        print(f"🔄 대기열 재접속: {nickname} (기존 SID: {queue[existing_player_index]['sid']} -> 신규 SID: {sid})")
-        queue[existing_player_index]["sid"] = sid
-        # 필요한 경우 다른 정보도 업데이트 (예: 돈, 닉네임 등 변경되었을 수 있음)
-        queue[existing_player_index]["money"] = money
-        queue[existing_player_index]["bet_amount"] = bet_amount
-        
-        broadcast_queue_status()
-        return
-    # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
-    
-    print(f"-> 큐 참가: {nickname} ({sid}) Bet: {bet_amount}")  # 🔥 name -> nickname
-    queue.append({
+    entry = {
         # ▼▼▼ [수정됨] sid와 uid를 명시적으로 저장 ▼▼▼
         "sid": sid,             # 👈 [필수] 이 키를 추가합니다.
         "uid": uid,             # 👈 [필수] 이 키도 추가합니다.
@@ -75,7 +96,21 @@ def on_join_queue(data):
         "money": money,
         "year": year,
         "bet_amount": bet_amount
-    })
+    }
+
+    # ▼▼▼ [수정] 이미 대기열에 있는 경우 SID 업데이트 ▼▼▼
+    # (필요한 경우 다른 정보도 업데이트: 돈, 베팅 금액 등 변경되었을 수 있음)
+    old_sid = store.queue_upsert(entry, update_keys=("sid", "money", "bet_amount"))
+    join_room(QUEUE_ROOM, sid=sid)
+    if old_sid is not None:
+        log.info("🔄 대기열 재접속: %s (기존 SID: %s -> 신규 SID: %s)", nickname, old_sid, sid)
+        if old_sid != sid:
+            _leave_queue_room(old_sid)
+        broadcast_queue_status()
+        return
+    # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
+    
+    log.info("-> 큐 참가: %s (%s) Bet: %s", nickname, sid, bet_amount)  # 🔥 name -> nickname
     
     broadcast_queue_status()
     check_queue_match()
@@ -83,10 +118,10 @@ def on_join_queue(data):
 @socketio.on("leave_queue")
 def on_leave_queue():
     """플레이어가 '대기 취소'를 눌렀을 때"""
-    global queue
     sid = request.sid
-    queue = [p for p in queue if p["sid"] != sid]
-    print(f"<- 큐 이탈: {sid}")
+    store.queue_remove_sid(sid)
+    _leave_queue_room(sid)
+    log.info("<- 큐 이탈: %s", sid)
     emit("queue_status", {"status": "idle"}, to=sid)
     broadcast_queue_status()
 
@@ -94,109 +129,137 @@ def on_leave_queue():
 
 def check_queue_match():
     """대기열을 확인하여 4명이 모이면 게임을 시작시킴 (안전 버전)"""
-    global queue
+    # 1. 만들 수 있는 4명 그룹을 한 번에 모두 꺼냄 (공유 저장소에서 원자적으로)
+    groups = store.queue_pop_groups(4)
+    if not groups:
+        return
+
+    # 🔥 [NEW] 클라이언트가 보낸 money/nickname/major/year 대신 서버 프로필 사용
+    # (매칭된 전원을 캐시 + get_all 한 번으로 조회. 프로필이 없으면 대기열 값 그대로)
+    profiles = profile_cache.get_many(entry["uid"] for group in groups for entry in group)
+    for players_to_match_data in groups:
+        for entry in players_to_match_data:
+            apply_profile(entry, profiles.get(entry["uid"]))
+        # 🔥 [NEW] 방은 room_id의 링 소유 워커에 생성 (다른 워커면 그쪽으로 전달)
+        room_id, owner = allocate_room_id(8)
+        run_on(owner, create_matched_room, {"roomId": room_id, "group": players_to_match_data})
+
+
+@remote
+def create_matched_room(data):
+    """🔥 [NEW] 매칭된 4명으로 방을 만들고 게임 시작 (방 소유 워커에서 실행)"""
+    room_id = data["roomId"]
+    players_to_match_data = data["group"]
+    gs = get_room(room_id)
     
-    if len(queue) >= 4:
-        # 1. 일단 4명을 꺼냄
-        players_to_match_data = [queue.pop(0) for _ in range(4)]
-        
-        room_id = str(uuid.uuid4())[:8]
-        gs = get_room(room_id)
+    players_to_match = []
+    player_names = []
+    valid_players_count = 0
+
+    for i, player_data in enumerate(players_to_match_data):
+        # Player 객체 생성
+        player = Player(
+            sid=player_data["sid"],
+            uid=player_data["uid"], 
+            id=i,
+            name=player_data["name"],
+            nickname=player_data["nickname"],
+            email=player_data["email"],
+            major=player_data["major"],
+            money=player_data["money"],
+            year=player_data["year"],
+            bet_amount=player_data["bet_amount"],
+            hand=[],
+            last_drawn_index=None
+        )
         
-        players_to_match = []
-        player_names = []
-        valid_players_count = 0
-
-        for i, player_data in enumerate(players_to_match_data):
-            # Player 객체 생성
-            player = Player(
-                sid=player_data["sid"],
-                uid=player_data["uid"], 
-                id=i,
-                name=player_data["name"],
-                nickname=player_data["nickname"],
-                email=player_data["email"],
-                major=player_data["major"],
-                money=player_data["money"],
-                year=player_data["year"],
-                bet_amount=player_data["bet_amount"],
-                hand=[],
-                last_drawn_index=None
-            )
+        # ▼▼▼ [중요] 강제 입장 시도 (예외 처리) ▼▼▼
+        try:
+            join_room(room_id, sid=player.sid)
+            # 성공적으로 방에 들어간 경우에만 리스트에 추가
+            players_to_match.append(player)
+            player_names.append(player.nickname)
+            valid_players_count += 1
             
-            # ▼▼▼ [중요] 강제 입장 시도 (예외 처리) ▼▼▼
-            try:
-                join_room(room_id, sid=player.sid)
-                # 성공적으로 방에 들어간 경우에만 리스트에 추가
-                players_to_match.append(player)
-                player_names.append(player.nickname)
-                valid_players_count += 1
-                
-                # 매칭 성공 메시지 전송
-                match_data = {
-                    "roomId": room_id,
-                    "players": [] # 아직 다 안 찼으므로 나중에 보낼 수도 있음 (일단 비워둠 or 현재까지 이름)
-                }
-                # 여기서 보내지 말고 4명 다 성공하면 보내는 게 나음
-                
-            except KeyError:
-                # 이미 연결이 끊긴 유령 플레이어
-                print(f"⚠️ 매칭 실패: {player.name} ({player.sid}) 유저가 연결되지 않음.")
-                # 이 유저는 버립니다.
-            except Exception as e:
-                print(f"⚠️ 입장 오류: {e}")
-
-        # 2. 4명 모두 정상적으로 방에 들어갔는지 확인
-        if valid_players_count == 4:
-            print(f"🎉 매칭 확정! 방 ID: {room_id}")
-            
-            # GameState에 플레이어 등록
-            gs.players = players_to_match
-            
-            # 각 플레이어에게 매칭 성공 신호 전송
-            final_match_data = {
+            # 매칭 성공 메시지 전송
+            match_data = {
                 "roomId": room_id,
-                "players": player_names
+                "players": [] # 아직 다 안 찼으므로 나중에 보낼 수도 있음 (일단 비워둠 or 현재까지 이름)
             }
-            socketio.emit("match:success", final_match_data, room=room_id)
-
-            print(f"🚪 방 생성 {room_id}. 플레이어: {', '.join(player_names)}")
-            broadcast_queue_status()
-
-            # 게임 시작
-            socketio.start_background_task(start_game_flow, room_id)
-            
-        else:
-            # 🚨 4명이 안 모임 (누군가 튕김) -> 매칭 취소 및 롤백
-            print("❌ 매칭 실패: 플레이어 중 일부가 연결이 끊겨 매칭이 취소되었습니다.")
+            # 여기서 보내지 말고 4명 다 성공하면 보내는 게 나음
             
-            # 방금 만든 방 삭제
-            if room_id in rooms:
-                del rooms[room_id]
-            
-            # 정상적인 플레이어들은 다시 대기열의 '맨 앞'으로 돌려보냄 (우선순위 보장)
-            # 거꾸로 넣어야 순서가 유지됨
-            for p in reversed(players_to_match):
-                # 원래 데이터 형태로 복구
-                original_data = {
-                    "sid": p.sid, "uid": p.uid, "name": p.name,
-                    "nickname": p.nickname, "email": p.email, "major": p.major,
-                    "money": p.money, "year": p.year, "bet_amount": p.bet_amount
-                }
-                queue.insert(0, original_data)
-                
-                # 방금 들어갔던 방에서 나오게 함
-                leave_room(room_id, sid=p.sid)
+        except KeyError:
+            # 이미 연결이 끊긴 유령 플레이어
+            log.warning("⚠️ 매칭 실패: %s (%s) 유저가 연결되지 않음.", player.name, player.sid)
+            # 이 유저는 버립니다.
+        except Exception as e:
+            log.warning("⚠️ 입장 오류: %s", e)
+
+    # 2. 4명 모두 정상적으로 방에 들어갔는지 확인
+    if valid_players_count == 4:
+        log.info("🎉 매칭 확정! 방 ID: %s", room_id)
+        
+        # GameState에 플레이어 등록
+        gs.players = players_to_match
+        sessions.bind_room(room_id, gs)
+        
+        # 각 플레이어에게 매칭 성공 신호 전송
+        final_match_data = {
+            "roomId": room_id,
+            "players": player_names
+        }
+        socketio.emit("match:success", final_match_data, room=room_id)
+
+        log.info("🚪 방 생성 %s. 플레이어: %s", room_id, ', '.join(player_names))
+        for p in players_to_match:
+            _leave_queue_room(p.sid)
+        broadcast_queue_status()
 
-            broadcast_queue_status()
+        # 게임 시작
+        room_actors.post(room_id, start_game_flow, room_id)
+        
+    else:
+        # 🚨 4명이 안 모임 (누군가 튕김) -> 매칭 취소 및 롤백
+        log.error("❌ 매칭 실패: 플레이어 중 일부가 연결이 끊겨 매칭이 취소되었습니다.")
+        
+        # 방금 만든 방 삭제
+        remove_room(room_id)
+        
+        # 정상적인 플레이어들은 다시 대기열의 '맨 앞'으로 돌려보냄 (우선순위 보장)
+        restored = []
+        for p in players_to_match:
+            # 원래 데이터 형태로 복구
+            restored.append({
+                "sid": p.sid, "uid": p.uid, "name": p.name,
+                "nickname": p.nickname, "email": p.email, "major": p.major,
+                "money": p.money, "year": p.year, "bet_amount": p.bet_amount
+            })
             
-            # (선택) 다시 매칭 시도할지 여부
-            # check_queue_match() # 재귀 호출은 위험할 수 있으니 일단 대기
+            # 방금 들어갔던 방에서 나오게 함
+            leave_room(room_id, sid=p.sid)
+        store.queue_push_front(restored)
+
+        broadcast_queue_status()
+        
+        # (선택) 다시 매칭 시도할지 여부
+        # check_queue_match() # 재귀 호출은 위험할 수 있으니 일단 대기
 
 
 @socketio.on("create_room")
 def on_create_room(data):
     """(수정) 플레이어가 '방 만들기'를 요청할 때"""
+    if not data.get("uid"):
+        return
+    # 🔥 [NEW] 서버 프로필 기준 (캐시 미스면 Firestore 1회)
+    data = apply_profile(dict(data), profile_cache.get(data["uid"]))
+    # 🔥 [NEW] 방은 room_id의 링 소유 워커에 생성 (다른 워커면 요청 sid 그대로 전달)
+    room_id, owner = allocate_room_id(6)
+    run_on(owner, create_custom_room, {**data, "roomId": room_id})
+
+
+@remote
+def create_custom_room(data):
+    """🔥 [NEW] 커스텀 방 생성 (방 소유 워커에서 실행)"""
     sid = request.sid
     uid = data.get("uid")
     
@@ -211,11 +274,8 @@ def on_create_room(data):
     if not uid:
         return
 
-    room_id = str(uuid.uuid4())[:6]
-    while room_id in rooms:
-        room_id = str(uuid.uuid4())[:6]
-        
-    print(f"✨ 방 생성 요청: {name} -> new room {room_id}")
+    room_id = data["roomId"]
+    log.info("✨ 방 생성 요청: %s -> new room %s", name, room_id)
 
     gs = get_room(room_id)
     host_player = Player(
@@ -233,6 +293,7 @@ def on_create_room(data):
         bet_amount=0,  # 👈 커스텀 방이므로 베팅 금액은 0
     )
     gs.players.append(host_player)
+    sessions.bind(room_id, host_player)
     
     join_room(room_id, sid=sid)
     emit("room_created", {"roomId": room_id}, to=sid)
@@ -245,9 +306,10 @@ def on_create_room(data):
 
 
 @socketio.on("enter_room")
+@owner_routed
 def on_enter_room(data):
     """(수정) 플레이어가 방에 입장할 때"""
-    print(f"📥 [DEBUG] enter_room received: {data}")
+    log.debug("📥 [DEBUG] enter_room received: %s", data)
     
     room_id = data.get("roomId")
     uid = data.get("uid")
@@ -280,7 +342,7 @@ def on_enter_room(data):
     if existing_player:
         # 🔥 [FIX] 같은 SID로 다시 들어오는 경우 (SPA 페이지 이동 등)는 패배 처리 하지 않음
         if existing_player.sid == request.sid:
-             print(f"🔄 [SPA Navigation] {nickname} re-entered room {room_id} with same SID. Ignoring.")
+             log.info("🔄 [SPA Navigation] %s re-entered room %s with same SID. Ignoring.", nickname, room_id)
              # 상태만 다시 전송
              if game_started:
                  broadcast_in_game_state(room_id)
@@ -288,21 +350,19 @@ def on_enter_room(data):
                  socketio.emit("room_state", serialize_state_for_lobby(gs), room=room_id)
              return
 
-        print(f"🔄 Reconnected: {nickname} to room {room_id} (GameStarted: {game_started})")
+        log.info("🔄 Reconnected: %s to room %s (GameStarted: %s)", nickname, room_id, game_started)
         
         # 🔥 [FIX] 사용자가 "새로고침 = 패배"를 원함.
         # 게임 중인데 final_rank가 0(생존)이라면, 이는 비정상 종료 후 재접속이므로 '패배' 처리.
         if game_started and existing_player.final_rank == 0:
-            print(f"💀 {existing_player.nickname} 재접속 -> 즉시 패배 처리 (Refresh Rule)")
+            log.info("💀 %s 재접속 -> 즉시 패배 처리 (Refresh Rule)", existing_player.nickname)
             
             # (1) 카드 공개
-            for tile in existing_player.hand:
-                tile.revealed = True
+            from game_logic import reveal_hand, set_rank, get_alive_players
+            reveal_hand(gs, existing_player)
             
             # (2) 탈락 처리
-            from game_logic import get_alive_players
-            alive_players = get_alive_players(gs)
-            existing_player.final_rank = len(alive_players)
+            set_rank(gs, existing_player, len(gs.alive))
             
             socketio.emit("game:player_eliminated", {
                 "uid": existing_player.uid,
@@ -318,15 +378,10 @@ def on_enter_room(data):
                 
                 # Firestore 업데이트
                 try:
-                    from firebase_admin_config import get_db
-                    from firebase_admin import firestore as admin_firestore
-                    db = get_db()
-                    if db:
-                        user_ref = db.collection('users').document(existing_player.uid)
-                        user_ref.update({'money': admin_firestore.Increment(net_change)})
-                        print(f"💰 Firestore updated (refresh-defeat): {existing_player.nickname} {net_change:+d}")
+                    if increment_user_money_now(existing_player.uid, net_change):
+                        log.info("💰 Firestore updated (refresh-defeat): %s %+d", existing_player.nickname, net_change)
                 except Exception as e:
-                    print(f"❌ Firestore error: {e}")
+                    log.error("❌ Firestore error: %s", e)
                 
                 socketio.emit("game:payout_result", [{
                     "uid": existing_player.uid,
@@ -341,19 +396,17 @@ def on_enter_room(data):
             # 주의: SID 업데이트 전이므로 existing_player.sid는 구 SID임.
             if gs.players and gs.current_turn < len(gs.players):
                 if gs.players[gs.current_turn].sid == existing_player.sid:
-                    print(f"[{room_id}] 턴 플레이어 재접속(패배) -> 턴 넘김")
+                    log.info("[%s] 턴 플레이어 재접속(패배) -> 턴 넘김", room_id)
                     if gs.turn_timer: gs.turn_timer.cancel()
-                    from game_events import start_next_turn
-                    socketio.start_background_task(start_next_turn, room_id)
+                    room_actors.post(room_id, start_next_turn, room_id)
                 else:
                     broadcast_in_game_state(room_id)
             
             # (5) 게임 종료 체크
-            alive_players = get_alive_players(gs)
-            if len(alive_players) <= 1:
-                print(f"🏆 게임 종료! (재접속 패배로 인한 종료)")
-                if len(alive_players) == 1:
-                    alive_players[0].final_rank = 1
+            if len(gs.alive) <= 1:
+                log.info("🏆 게임 종료! (재접속 패배로 인한 종료)")
+                if gs.alive:
+                    set_rank(gs, get_alive_players(gs)[0], 1)
                 
                 from game_events import handle_winnings
                 handle_winnings(room_id)
@@ -363,7 +416,9 @@ def on_enter_room(data):
                     "winner": {"name": winner.nickname if winner else "Unknown"}
                 }, room=room_id)
 
+        old_sid = existing_player.sid
         existing_player.sid = request.sid
+        sessions.bind(room_id, existing_player, old_sid=old_sid)
         join_room(room_id, sid=request.sid)
         
         # (수정) 로직 정리: 상태 확인 후 1번만 전송
@@ -381,30 +436,36 @@ def on_enter_room(data):
     if game_started:
         return
 
+    # 🔥 [NEW] 서버 프로필 기준 (캐시 미스면 Firestore 1회)
+    profile = apply_profile({"nickname": nickname, "major": major, "money": money, "year": year},
+                            profile_cache.get(uid))
+
     new_player = Player(
         sid=request.sid,
         uid=uid,
         id=len(gs.players),
         name=name,
-        nickname=nickname,
+        nickname=profile["nickname"],
         email=email,
-        major=major,
-        money=money,  # 👈 money 반영
-        year=year,
+        major=profile["major"],
+        money=profile["money"],  # 👈 money 반영
+        year=profile["year"],
         hand=[],
         last_drawn_index=None,
         bet_amount=data.get("betAmount", 0),  # 🔥 [FIX] 커스텀 게임은 기본값 0 (큐 매칭은 check_queue_match에서 설정됨)
     )
     gs.players.append(new_player)
+    sessions.bind(room_id, new_player)
     join_room(room_id, sid=request.sid)
 
-    print(f"👤 {name} joined room {room_id} (현재 {len(gs.players)}명) Bet: {new_player.bet_amount}")
+    log.info("👤 %s joined room %s (현재 %s명) Bet: %s", name, room_id, len(gs.players), new_player.bet_amount)
     
     # (핵심) 방에 있는 모든 사람에게 로비 상태 갱신
     socketio.emit("room_state", serialize_state_for_lobby(gs), room=room_id)
 
 
 @socketio.on("leave_room")
+@owner_routed
 def on_leave_room(data):
     """(수정) 플레이어가 '방 나가기'를 눌렀을 때 (타이머 연동)"""
     room_id = data.get("roomId")
@@ -433,12 +494,13 @@ def on_leave_room(data):
             if gs.turn_timer:
                 gs.turn_timer.cancel()
                 gs.turn_timer = None
-                print(f"[{room_id}] 턴 타이머 중지 (플레이어 퇴장).")
+                log.info("[%s] 턴 타이머 중지 (플레이어 퇴장).", room_id)
             
     # --- 플레이어 제거 ---
     leave_room(room_id, sid=player_to_remove.sid)
-    gs.players.remove(player_to_remove)
-    print(f"<- 방 이탈: {player_to_remove.name} left room {room_id}")
+    remove_player(gs, player_to_remove)
+    sessions.unbind(room_id, player_to_remove)
+    log.info("<- 방 이탈: %s left room %s", player_to_remove.name, room_id)
     # ---------------------
 
     # --- 후속 처리 ---
@@ -446,12 +508,12 @@ def on_leave_room(data):
         if len(gs.players) == 1:
             # [승리 처리] 1명 남음
             winner = gs.players[0]
-            print(f"🏆 게임 종료! 승자: {winner.name}")
+            log.info("🏆 게임 종료! 승자: %s", winner.name)
             socketio.emit("game_over", {"winner": {"id": winner.id, "name": winner.name}}, room=room_id)
             
             # [요청 사항] 방을 삭제하지 않고 게임 종료 상태로 둡니다.
             gs.game_started = False
-            gs.turn_phase = "INIT"
+            transition(gs, "INIT")
 
         elif len(gs.players) > 1:
             # [게임 속행] 2명 이상 남음
@@ -460,18 +522,17 @@ def on_leave_room(data):
             
             if player_was_on_turn:
                 # 턴 진행 중인 플레이어가 나갔으므로, 즉시 다음 턴 시작
-                print(f"[{room_id}] 턴 플레이어가 나갔으므로 다음 턴 시작.")
+                log.info("[%s] 턴 플레이어가 나갔으므로 다음 턴 시작.", room_id)
                 # (중요) 바로 다음 턴 함수 호출 (백그라운드)
-                socketio.start_background_task(start_next_turn, room_id)
+                room_actors.post(room_id, start_next_turn, room_id)
             else:
                 # 턴 진행 중이 아닌 플레이어가 나갔으므로, 상태만 갱신
                 broadcast_in_game_state(room_id)
         
         else:
             # [방 삭제] 0명 남음 (게임 중)
-            print(f"[{room_id}] (게임 중) 모든 플레이어가 나가서 방 삭제")
-            if room_id in rooms: 
-                del rooms[room_id]
+            log.info("[%s] (게임 중) 모든 플레이어가 나가서 방 삭제", room_id)
+            remove_room(room_id)
 
     else: 
         # (게임 시작 전 로비)
@@ -483,12 +544,12 @@ def on_leave_room(data):
         
         else:
             # [방 삭제] 0명 남음 (로비)
-            print(f"[{room_id}] (로비) 모든 플레이어가 나가서 방 삭제")
-            if room_id in rooms: 
-                del rooms[room_id]
+            log.info("[%s] (로비) 모든 플레이어가 나가서 방 삭제", room_id)
+            remove_room(room_id)
 
 
 @socketio.on("start_game")
+@owner_routed
 def on_start_game(data):
     """(수정) 커스텀 방 게임 시작"""
     room_id = data.get("roomId")
@@ -505,5 +566,5 @@ def on_start_game(data):
     if len(gs.players) < 2:
         return
 
-    print(f"🎮 게임 시작 요청: {player.name} (Room {room_id})")
-    socketio.start_background_task(start_game_flow, room_id)
\ No newline at end of file
+    log.info("🎮 게임 시작 요청: %s (Room %s)", player.name, room_id)
+    room_actors.post(room_id, start_game_flow, room_id)
\ No newline at end of file
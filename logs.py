@@ -0,0 +1,146 @@
+# logs.py
+# 🔥 [NEW] 구조화 로깅 (print 대체)
+#
+#   log = get_logger("lobby")
+#   log.info("방 생성 %s (%d명)", room_id, n)     # % 포맷은 레벨/샘플링을 통과한 레코드만 (lazy)
+#
+# - 레벨: LOG_LEVEL (기본 INFO). DEBUG 덤프는 레벨이 꺼져 있으면 레코드 자체를 만들지 않음
+# - 출력: 이벤트 루프(핸들러)에서는 메시지만 완성해(인자 스냅샷) QueueHandler로 큐에 넣고,
+#   JSON 포맷/stdout 쓰기는 QueueListener 스레드가 합니다
+# - 형식: LOG_FORMAT=json(기본, 한 줄에 JSON 하나) | text
+# - 샘플링: LOG_SAMPLE="turn=0.1,broadcast=0.01" -> 카테고리별로 해당 비율만 남김 (WARNING 이상은 항상)
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Dict, Optional
+
+ROOT_LOGGER = "game"
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower()
+LOG_SAMPLE = os.environ.get("LOG_SAMPLE", "")
+LOG_QUEUE_MAX = int(os.environ.get("LOG_QUEUE_MAX", "100000"))
+
+_setup_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """"turn=0.1,broadcast=0.01" -> {"turn": 0.1, "broadcast": 0.01}"""
+    rates = {}
+    for part in spec.split(","):
+        name, sep, rate = part.strip().partition("=")
+        if sep and name:
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """카테고리(로거 이름 끝부분)별 비율로 INFO 이하 레코드를 버림"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.name.rpartition(".")[2])
+        if rate is None or rate >= 1.0:
+            return True
+        if random.random() < rate:
+            return True
+        self.dropped += 1
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON: ts, level, cat, msg (+ extra로 넘긴 room/uid/sid, 예외)"""
+
+    EXTRA_FIELDS = ("room", "uid", "sid", "event")
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "cat": record.name.rpartition(".")[2],
+            "msg": record.getMessage(),
+        }
+        for key in self.EXTRA_FIELDS:
+            value = record.__dict__.get(key)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    레벨/샘플링 필터를 통과한 레코드만 여기서 메시지를 완성해 큐에 넣음.
+    args는 방 액터가 계속 바꾸는 list/dict일 수 있으므로 리스너 스레드까지 참조를 넘기지 않음
+    (JSON/텍스트 포맷과 stdout 쓰기만 리스너 스레드에서). 예외 정보도 여기서 문자열로 만들어 둠
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # 로그 때문에 게임 루프를 막지 않음 (가득 차면 버림)
+
+
+def setup(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, sample: str = LOG_SAMPLE, stream=None) -> logging.Logger:
+    """"game" 로거에 큐 핸들러 + 리스너 스레드 연결 (여러 번 불러도 한 번만)"""
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER)
+    with _setup_lock:
+        if _listener is not None:
+            return root
+        if fmt == "json":
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(formatter)
+
+        handler = _DeferredQueueHandler(queue.Queue(LOG_QUEUE_MAX))
+        handler.addFilter(SamplingFilter(parse_sample_rates(sample)))
+        root.addHandler(handler)
+        root.setLevel(level)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=False)
+        _listener.start()
+        atexit.register(shutdown)
+    return root
+
+
+def shutdown() -> None:
+    """남은 로그를 모두 쓰고 리스너 스레드 종료"""
+    global _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def get_logger(category: str) -> logging.Logger:
+    """카테고리 로거 ("game.<category>"). LOG_SAMPLE의 키가 이 카테고리 이름"""
+    setup()
+    return logging.getLogger(f"{ROOT_LOGGER}.{category}")
@@ -1,10 +1,28 @@
 # main.py
 # import eventlet  # Disabled due to environment constraints
 # eventlet.monkey_patch()  # Disabled
+import os
+
+# 🔥 [NEW] 멀티 워커(message_queue) 모드는 Redis 소켓이 그린스레드와 협력해야 하므로 몽키패치 필요
+# (gunicorn eventlet 워커는 이미 패치되어 있음, python main.py로 직접 띄울 때를 위한 것)
+SOCKETIO_MESSAGE_QUEUE = os.environ.get("SOCKETIO_MESSAGE_QUEUE") or None
+# 🔥 [NEW] "asgi"면 eventlet 대신 asyncio AsyncServer로 실행 (asgi.py 참고)
+SOCKETIO_SERVER = os.environ.get("SOCKETIO_SERVER", "wsgi")
+if SOCKETIO_MESSAGE_QUEUE and SOCKETIO_SERVER != "asgi":
+    import eventlet
+    eventlet.monkey_patch()
 
 from flask import Flask
 from extensions import socketio
 
+# 🔥 [NEW] /metrics: 이후 등록되는 모든 @socketio.on 핸들러를 계측 (METRICS_ENABLED=0이면 끔)
+import metrics
+metrics.instrument_socketio(socketio)
+
+# 🔥 [NEW] 방 작업 하나에서 나가는 emit을 모아 작업이 끝날 때 한 번에 (같은 수신자의 state_update는 최신 것만)
+import outbox
+outbox.install(socketio)
+
 # --- 이벤트 핸들러 임포트 ---
 # (중요) 이 파일들이 임포트되면서 정의된 핸들러(@socketio.on...)가 등록됩니다.
 import general_events
@@ -17,49 +35,80 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'dev_secret_key' 
 
 # socketio 객체에 app을 연결
-socketio.init_app(app, cors_allowed_origins="*")
+# 🔥 [NEW] SOCKETIO_MESSAGE_QUEUE(redis://...)가 있으면 워커 간 emit을 브로커로 공유
+# 🔥 [NEW] codec: msgpack 파서로 접속한 클라이언트에게는 바이너리 패킷 (나머지는 JSON)
+import codec
+if SOCKETIO_SERVER == "asgi":
+    import aio
+    asgi_app = aio.init_app(app, socketio, cors_allowed_origins="*", message_queue=SOCKETIO_MESSAGE_QUEUE,
+                            **codec.server_options())
+else:
+    socketio.init_app(app, cors_allowed_origins="*", message_queue=SOCKETIO_MESSAGE_QUEUE,
+                      **codec.server_options())
+codec.install(socketio.server)
+
+# 🔥 [NEW] 방 소유 워커로 이벤트 전달 (공유 저장소 사용 시)
+import cluster
+cluster.init_app(app)
 
 # 🔥 [NEW] Leaderboard API
-from flask import jsonify
-try:
-    from firebase_admin_config import get_db
-    from firebase_admin import firestore as admin_firestore
-    FIREBASE_AVAILABLE = True
-except Exception as e:
-    FIREBASE_AVAILABLE = False
-    print(f"⚠️ Firebase Admin not available for leaderboard: {e}")
+from flask import jsonify, request
+from userdb import userdb # 🔥 [NEW] Firestore 또는 오프라인 대역 (USERDB_URL)
+from leaderboard import leaderboard_cache, LeaderboardUnavailable
+from logs import get_logger
+
+log = get_logger("game")
 
 @app.route("/api/leaderboard", methods=["GET"])
 def get_leaderboard():
-    if not FIREBASE_AVAILABLE:
+    if not userdb.available:
         return jsonify({"error": "Firebase not configured"}), 503
     
     try:
-        db = get_db()
-        if not db:
-            return jsonify({"error": "Database connection failed"}), 500
-            
-        # money 내림차순 정렬, 상위 20명
-        users_ref = db.collection("users")
-        query = users_ref.order_by("money", direction=admin_firestore.Query.DESCENDING).limit(20)
-        docs = query.stream()
-        
-        leaderboard = []
-        for doc in docs:
-            data = doc.to_dict()
-            leaderboard.append({
-                "uid": doc.id,
-                "nickname": data.get("nickname", "Unknown"),
-                "major": data.get("major", ""),
-                "year": data.get("year", ""),
-                "money": data.get("money", 0)
-            })
-            
-        return jsonify(leaderboard)
-    except Exception as e:
-        print(f"❌ Leaderboard error: {e}")
+        # 🔥 [NEW] TTL 캐시 (money 내림차순 상위 20명) - 매 요청마다 Firestore를 조회하지 않음
+        body, etag, age, cache_status = leaderboard_cache.get()
+    except LeaderboardUnavailable as e:
+        log.warning("❌ Leaderboard error: %s", e)
         return jsonify({"error": str(e)}), 500
 
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"public, max-age={max(0, int(leaderboard_cache.ttl - age))}"
+    response.headers["Age"] = str(int(age))
+    response.headers["X-Cache"] = cache_status
+    # If-None-Match가 일치하면 본문 없이 304 반환
+    return response.make_conditional(request)
+
+# 🔥 [NEW] Prometheus 스크레이프 엔드포인트
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    return app.response_class(metrics.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+# 🔥 [NEW] 실행 중인 워커 프로파일링 (ADMIN_TOKEN 필요)
+#   curl -H "Authorization: Bearer $ADMIN_TOKEN" "localhost:5000/admin/profile?seconds=10" > out.folded
+#   mode=sample(기본, collapsed stack) | deterministic(format=text 기본 / pstats)
+import profiler
+
+@app.route("/admin/profile", methods=["GET"])
+def admin_profile():
+    token = request.headers.get("Authorization") or request.headers.get("X-Admin-Token", "")
+    if not profiler.check_token(token):
+        return jsonify({"error": "forbidden"}), 403
+    try:
+        seconds = float(request.args.get("seconds", 10))
+        interval = float(request.args.get("interval", profiler.DEFAULT_INTERVAL))
+    except ValueError:
+        return jsonify({"error": "seconds/interval must be numbers"}), 400
+    mode = request.args.get("mode", "sample")
+    fmt = request.args.get("format", "collapsed" if mode == "sample" else "text")
+    try:
+        body, mimetype = profiler.run_profile(seconds, mode=mode, fmt=fmt, interval=interval)
+    except profiler.ProfilerBusy as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return app.response_class(body, mimetype=mimetype)
+
 if __name__ == "__main__":
-    print("🚀 서버 실행 (http://localhost:5000)")
-    socketio.run(app, host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    log.info("🚀 서버 실행 (http://localhost:5000)")
+    socketio.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), debug=True)
\ No newline at end of file
@@ -0,0 +1,106 @@
+# matchmaking.py
+# 🔥 [NEW] 매칭 대기열: deque(입장 순서) + uid/sid 인덱스
+#
+# 입장/이탈/재접속은 O(1)입니다. 이탈한 항목은 deque에서 바로 지우지 않고(O(n))
+# 티켓 번호로 무효화했다가 꺼낼 때 건너뛰며, 무효 항목이 쌓이면 한 번에 정리합니다.
+# (단일 프로세스 LocalStore의 대기열. 멀티 워커 RedisStore는 이탈 시 LREM이라 O(n))
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+Entry = Dict[str, Any]
+
+
+class MatchQueue:
+    COMPACT_MIN = 64  # 무효 항목이 이보다 적으면 정리하지 않음
+
+    def __init__(self):
+        self._order: Deque[Tuple[int, str]] = deque()   # (ticket, uid)
+        self._entries: Dict[str, Tuple[int, Entry]] = {}  # uid -> (ticket, entry)
+        self._by_sid: Dict[str, str] = {}                 # sid -> uid
+        self._next_ticket = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Entry]:
+        """대기 순서대로 항목 (O(n), 디버그/관리용)"""
+        for ticket, uid in self._order:
+            cur = self._entries.get(uid)
+            if cur is not None and cur[0] == ticket:
+                yield cur[1]
+
+    def _ticket(self) -> int:
+        self._next_ticket += 1
+        return self._next_ticket
+
+    def _index(self, entry: Entry, ticket: int) -> None:
+        self._entries[entry["uid"]] = (ticket, entry)
+        self._by_sid[entry["sid"]] = entry["uid"]
+
+    def get(self, uid: str) -> Optional[Entry]:
+        cur = self._entries.get(uid)
+        return cur[1] if cur is not None else None
+
+    def sids(self) -> List[str]:
+        return list(self._by_sid)
+
+    def upsert(self, entry: Entry, update_keys: Iterable[str]) -> Optional[str]:
+        """uid가 이미 있으면 순서는 유지한 채 update_keys만 갱신하고 기존 sid 반환, 없으면 맨 뒤에 추가하고 None"""
+        cur = self._entries.get(entry["uid"])
+        if cur is not None:
+            current = cur[1]
+            old_sid = current["sid"]
+            if self._by_sid.get(old_sid) == current["uid"]:
+                del self._by_sid[old_sid]
+            for k in update_keys:
+                current[k] = entry[k]
+            self._by_sid[current["sid"]] = current["uid"]
+            return old_sid
+        ticket = self._ticket()
+        self._order.append((ticket, entry["uid"]))
+        self._index(entry, ticket)
+        return None
+
+    def remove_sid(self, sid: str) -> bool:
+        uid = self._by_sid.get(sid)
+        return uid is not None and self.remove_uid(uid)
+
+    def remove_uid(self, uid: str) -> bool:
+        cur = self._entries.pop(uid, None)
+        if cur is None:
+            return False
+        sid = cur[1]["sid"]
+        if self._by_sid.get(sid) == uid:
+            del self._by_sid[sid]
+        self._maybe_compact()
+        return True
+
+    def pop_groups(self, n: int) -> List[List[Entry]]:
+        """대기 순서대로 n명씩 만들 수 있는 그룹을 한 번에 모두 꺼냄"""
+        want = (len(self._entries) // n) * n
+        picked: List[Entry] = []
+        while len(picked) < want:
+            ticket, uid = self._order.popleft()
+            cur = self._entries.get(uid)
+            if cur is None or cur[0] != ticket:
+                continue  # 이탈/재입장으로 무효가 된 자리
+            del self._entries[uid]
+            if self._by_sid.get(cur[1]["sid"]) == uid:
+                del self._by_sid[cur[1]["sid"]]
+            picked.append(cur[1])
+        return [picked[i:i + n] for i in range(0, want, n)]
+
+    def push_front(self, entries: List[Entry]) -> None:
+        """매칭 롤백: 항목들을 원래 순서 그대로 맨 앞으로 되돌림"""
+        for entry in reversed(entries):
+            ticket = self._ticket()
+            self._order.appendleft((ticket, entry["uid"]))
+            self._index(entry, ticket)
+
+    def _maybe_compact(self) -> None:
+        stale = len(self._order) - len(self._entries)
+        if stale > self.COMPACT_MIN and stale > len(self._entries):
+            self._order = deque(
+                (ticket, uid) for ticket, uid in self._order
+                if uid in self._entries and self._entries[uid][0] == ticket
+            )
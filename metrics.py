@@ -0,0 +1,273 @@
+# metrics.py
+# 🔥 [NEW] Prometheus 텍스트 형식 지표 (/metrics)
+#
+# - 소켓 이벤트: socketio.on 등록을 감싸서(instrument_socketio) 핸들러마다 호출 수/에러 수/지연 히스토그램
+# - 방 액터 작업: 작업별 실행 시간, 메일박스 대기 시간
+# - broadcast_in_game_state: 실행 시간, 전송 대상 수(fan-out)
+# - Firestore 쓰기: 지연 히스토그램, 에러 수
+# - 게이지(방/플레이어/대기열/타이머 수 등)는 스크레이프 시점에 계산
+#
+# 외부 의존성 없이 필요한 만큼만 구현. 핸들러는 한 스레드(그린스레드/이벤트 루프)에서 돌기 때문에
+# 값 갱신에 락을 쓰지 않습니다 (money_writer 스레드의 Firestore 지표는 드물게 어긋날 수 있음).
+import bisect
+import functools
+import inspect
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import profiler
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+FANOUT_BUCKETS = (1, 2, 3, 4, 8, 16, 64, 256)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, label: Optional[str] = None):
+        self.name = name
+        self.help = help
+        self.label = label
+        _registry.append(self)
+
+    def _labels(self, value, extra: str = "") -> str:
+        parts = []
+        if self.label is not None:
+            parts.append(f'{self.label}="{_escape(value)}"')
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, label: Optional[str] = None):
+        super().__init__(name, help, label)
+        self._values: Dict[object, float] = {}
+
+    def inc(self, value=None, amount: float = 1) -> None:
+        self._values[value] = self._values.get(value, 0) + amount
+
+    def get(self, value=None) -> float:
+        return self._values.get(value, 0)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(v)} {_fmt(n)}" for v, n in sorted(self._values.items(), key=_key)]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS, label: Optional[str] = None):
+        super().__init__(name, help, label)
+        self.buckets = tuple(buckets)
+        self._series: Dict[object, list] = {}  # value -> [버킷별 개수..., +Inf 개수, 합계]
+
+    def observe(self, amount: float, value=None) -> None:
+        series = self._series.get(value)
+        if series is None:
+            series = self._series[value] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, amount)] += 1
+        series[-1] += amount
+
+    def count(self, value=None) -> int:
+        series = self._series.get(value)
+        return sum(series[:-1]) if series else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        for value, series in sorted(self._series.items(), key=_key):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += n
+                le = 'le="%s"' % _fmt(bound)
+                lines.append(f"{self.name}_bucket{self._labels(value, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(value)} {_fmt(series[-1])}")
+            lines.append(f"{self.name}_count{self._labels(value)} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """스크레이프 시점에 fn()으로 값을 계산하는 게이지"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float]):
+        super().__init__(name, help)
+        self.fn = fn
+
+    def samples(self) -> List[str]:
+        try:
+            return [f"{self.name} {_fmt(self.fn())}"]
+        except Exception:
+            return []
+
+
+def _key(item: Tuple[object, object]) -> str:
+    return str(item[0])
+
+
+def render() -> str:
+    """모든 지표를 Prometheus 텍스트 형식(0.0.4)으로"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- 지표 정의 ---
+
+socket_events = Counter("game_socket_events_total", "Socket.IO events handled", label="event")
+socket_event_errors = Counter("game_socket_event_errors_total", "Socket.IO handlers that raised", label="event")
+socket_event_duration = Histogram("game_socket_event_duration_seconds",
+                                  "Socket.IO handler time (owner-routed events: until queued to the room actor)",
+                                  label="event")
+room_task_duration = Histogram("game_room_task_duration_seconds", "Room actor task run time", label="task")
+room_task_wait = Histogram("game_room_task_wait_seconds", "Room actor mailbox wait before a task starts")
+broadcast_duration = Histogram("game_broadcast_duration_seconds", "broadcast_in_game_state run time")
+broadcast_fanout = Histogram("game_broadcast_fanout", "Recipients per broadcast_in_game_state", buckets=FANOUT_BUCKETS)
+firestore_write_duration = Histogram("game_firestore_write_duration_seconds", "Firestore money write latency",
+                                     label="kind")
+firestore_write_errors = Counter("game_firestore_write_errors_total", "Firestore money write failures", label="kind")
+outbox_messages = Counter("game_outbox_messages_total", "Emits buffered per room task (sent / coalesced away)",
+                          label="outcome")
+profile_cache_requests = Counter("game_profile_cache_requests_total", "Player profile lookups by cache result",
+                                 label="result")
+profile_fetch_duration = Histogram("game_profile_fetch_duration_seconds", "Firestore profile batch read (get_all) latency")
+
+
+def _rooms() -> int:
+    from state import rooms
+    return len(rooms)
+
+
+def _players() -> int:
+    from state import sessions
+    return len(sessions)
+
+
+def _queue_len() -> int:
+    from store import store
+    return store.queue_len()
+
+
+def _timers() -> int:
+    from scheduler import timer_wheel
+    return len(timer_wheel)
+
+
+def _mailbox_queued() -> int:
+    from actors import room_actors
+    return room_actors.stats()["queued"]
+
+
+def _money_queue() -> int:
+    from money_writer import money_writer
+    return money_writer.stats()["queue_depth"]
+
+
+def _profile_cache_size() -> int:
+    from profiles import profile_cache
+    return len(profile_cache)
+
+
+def _msgpack_clients() -> int:
+    import codec
+    return codec.msgpack_clients()
+
+
+Gauge("game_rooms", "Rooms held by this worker", _rooms)
+Gauge("game_players", "Players (sids) in rooms on this worker", _players)
+Gauge("game_matchmaking_queue_length", "Players waiting in the matchmaking queue", _queue_len)
+Gauge("game_active_timers", "Pending turn/cleanup timers", _timers)
+Gauge("game_room_mailbox_queued", "Tasks waiting in room actor mailboxes", _mailbox_queued)
+Gauge("game_money_writer_queue_depth", "Money deltas waiting to be written to Firestore", _money_queue)
+Gauge("game_profile_cache_entries", "Player profiles held in the server-side cache", _profile_cache_size)
+Gauge("socketio_msgpack_clients", "Connections that negotiated the MessagePack codec", _msgpack_clients)
+
+
+# --- 소켓 이벤트 계측 ---
+
+def _max_args(handler: Callable) -> Optional[int]:
+    """핸들러가 받는 위치 인자 수 (*args면 None)"""
+    try:
+        params = inspect.signature(handler).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind == p.VAR_POSITIONAL for p in params):
+        return None
+    return sum(1 for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+
+
+def _room_of(args) -> Optional[str]:
+    data = args[0] if args else None
+    return data.get("roomId") if isinstance(data, dict) else None
+
+
+def timed_handler(event: str, handler: Callable) -> Callable:
+    """handler 호출 수/에러/지연을 event 이름으로 기록하는 래퍼 (프로파일링 중이면 샘플에 event/room 태그)"""
+    max_args = _max_args(handler)
+
+    @functools.wraps(handler)
+    def wrapper(*args):
+        if max_args is not None:
+            # connect(auth)처럼 서버가 넘기는 인자보다 적게 받는 핸들러
+            args = args[:max_args]
+        tagged = profiler.active and profiler.tag_frame(sys._getframe(), event, _room_of(args))
+        started = time.perf_counter()
+        try:
+            return handler(*args)
+        except Exception:
+            socket_event_errors.inc(event)
+            raise
+        finally:
+            if tagged:
+                profiler.untag_frame(sys._getframe())
+            socket_events.inc(event)
+            socket_event_duration.observe(time.perf_counter() - started, event)
+
+    return wrapper
+
+
+def instrument_socketio(socketio) -> None:
+    """
+    이후의 @socketio.on(...) 등록을 모두 timed_handler로 감쌈.
+    이벤트 모듈을 임포트하기 전에 한 번 호출합니다 (METRICS_ENABLED=0이면 아무것도 하지 않음)
+    """
+    if not METRICS_ENABLED or getattr(socketio, "_metrics_instrumented", False):
+        return
+    original_on = socketio.on
+
+    def on(message, namespace=None):
+        register = original_on(message, namespace)
+
+        def decorator(handler):
+            register(timed_handler(message, handler))
+            return handler
+
+        return decorator
+
+    socketio.on = on
+    socketio._metrics_instrumented = True
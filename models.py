@@ -1,8 +1,9 @@
 # models.py
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import List, Literal, Optional, Dict, Any
-from threading import Timer
+from dataclasses import dataclass, field, fields
+from typing import List, Literal, Optional, Dict, Any, Set
+from scheduler import TimerHandle
+from state_sync import ClientSync
 
 Color = Literal["black", "white"]
 
@@ -13,16 +14,58 @@ TurnPhase = Literal[
     "PLACE_JOKER",    
     "GUESSING",       
     "POST_SUCCESS_GUESS",
-    "ANIMATING_GUESS" # 👈 [추가] 추리 결과 애니메이션 재생 중
+    "ANIMATING_GUESS", # 👈 [추가] 추리 결과 애니메이션 재생 중
+    "PROCESSING",     # 🔥 [NEW] 애니메이션 완료 처리 중 (탈락/종료 판정 대기)
+    "GAME_OVER",      # 🔥 [NEW] 정산 완료 (전이표: turn_phases.py)
 ]
 
-@dataclass
+# 🔥 [NEW] 타일은 (색, 값, 조커)가 생성 후 바뀌지 않으므로 작은 정수 코드로 한 번만 계산해 둡니다.
+#   code 비트: [값 4비트 (조커는 12)][흰색 1비트][조커 1비트]
+#   key      : 손패 정렬 키 (값 * 2 + 흰색 비트, black-first 기준. 조커는 모든 숫자보다 뒤)
+#   packed() : code에 공개 비트까지 붙인 값 (공개 여부는 게임 중에 바뀌므로 따로 보관)
+JOKER_BIT = 1
+WHITE_BIT = 2
+VALUE_SHIFT = 2
+REVEALED_BIT = 1 << 6
+JOKER_VALUE = 12
+
+
+def tile_code(color: Color, value: Optional[int], is_joker: bool) -> int:
+    v = JOKER_VALUE if is_joker else value
+    return (v << VALUE_SHIFT) | (WHITE_BIT if color == "white" else 0) | (JOKER_BIT if is_joker else 0)
+
+
 class Tile:
-    id: int
-    color: Color
-    value: Optional[int]  # 조커는 None
-    is_joker: bool
-    revealed: bool = False
+    __slots__ = ("id", "color", "value", "is_joker", "revealed", "code", "key")
+
+    def __init__(self, id: int, color: Color, value: Optional[int], is_joker: bool, revealed: bool = False):
+        self.id = id
+        self.color = color
+        self.value = value  # 조커는 None
+        self.is_joker = is_joker
+        self.revealed = revealed
+        self.code = tile_code(color, value, is_joker)
+        self.key = self.code >> 1  # 값 * 2 + 흰색 비트
+
+    def __eq__(self, other):
+        if other.__class__ is not Tile:
+            return NotImplemented
+        return self.id == other.id and self.code == other.code and self.revealed == other.revealed
+
+    __hash__ = None  # 공개 여부가 바뀌는 가변 객체 (dataclass와 같음)
+
+    def __repr__(self):
+        return (f"Tile(id={self.id!r}, color={self.color!r}, value={self.value!r}, "
+                f"is_joker={self.is_joker!r}, revealed={self.revealed!r})")
+
+    def packed(self) -> int:
+        return self.code | (REVEALED_BIT if self.revealed else 0)
+
+    @classmethod
+    def from_packed(cls, id: int, packed: int) -> "Tile":
+        is_joker = bool(packed & JOKER_BIT)
+        value = None if is_joker else (packed & (REVEALED_BIT - 1)) >> VALUE_SHIFT
+        return cls(id, "white" if packed & WHITE_BIT else "black", value, is_joker, bool(packed & REVEALED_BIT))
 
     def to_dict(self):
         return {
@@ -33,8 +76,12 @@ class Tile:
             "revealed": self.revealed
         }
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Tile":
+        return cls(**d)
+
 
-@dataclass
+@dataclass(slots=True) # 🔥 [NEW] 인스턴스 __dict__ 없음
 class Player:
     sid: str
     uid: str
@@ -52,9 +99,23 @@ class Player:
     bet_amount: int = 10000 # 🔥 [FIX] 기본값 10000
     final_rank: int = 0
     settled: bool = False  # 👈 정산 완료 여부
+    # 🔥 [NEW] 손패 중 아직 공개되지 않은 타일 수 (game_logic.reveal_tile/add_tile이 갱신, 직렬화 제외)
+    unrevealed: int = field(default=0, compare=False, repr=False)
+
+    # 🔥 [NEW] 워커 간 방 인계용 직렬화
+    def to_dict(self) -> Dict[str, Any]:
+        d = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "unrevealed"}
+        d["hand"] = [t.to_dict() for t in self.hand]
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Player":
+        p = cls(**{**d, "hand": [Tile.from_dict(t) for t in d["hand"]]})
+        p.unrevealed = sum(1 for t in p.hand if not t.revealed)
+        return p
     
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     players: List[Player]
     piles: Dict[Color, List[Tile]]
@@ -66,8 +127,47 @@ class GameState:
     next_tile_id: int
     game_started: bool = False # 로비/게임 구분
     turn_phase: TurnPhase = "INIT"
-    turn_timer: Optional[Timer] = None
+    turn_timer: Optional[TimerHandle] = None # 🔥 [NEW] 공유 타이머 휠 핸들
+    phase_seq: int = 0 # 🔥 [NEW] 페이즈 전이 횟수 (turn_phases.transition이 증가)
+    continuation: Optional[Dict[str, Any]] = None # 🔥 [NEW] 예약된 후속 작업 {"step", "seq", "due", "args"} (인계 시 다시 예약)
     elimination_count: int = 0
     turn_start_time: float = 0.0 # 👈 턴 시작 시간 (서버 타임스탬프)
     payout_results: List[Dict[str, Any]] = field(default_factory=list) # 🔥 [NEW] 정산 결과 저장 (재접속 시 복구용)
-    
\ No newline at end of file
+    state_version: int = 0 # 🔥 [NEW] 브로드캐스트마다 증가하는 상태 버전 (델타 프로토콜)
+    client_sync: Dict[str, ClientSync] = field(default_factory=dict) # 🔥 [NEW] sid별 마지막 전송 뷰/ack 버전
+    view_cache: Dict[str, Any] = field(default_factory=dict) # 🔥 [NEW] 브로드캐스트용 타일/플레이어 공개 뷰 캐시
+    # 🔥 [NEW] 증분 카운터: 공개 안 된 타일이 남은 플레이어 / 아직 순위 없는 플레이어의 uid
+    # (게임 종료·턴 넘김 판정이 매번 손패를 훑지 않도록. 배분 시 recount(), 이후 game_logic 헬퍼가 갱신)
+    alive: Set[str] = field(default_factory=set, compare=False, repr=False)
+    unranked: Set[str] = field(default_factory=set, compare=False, repr=False)
+
+    # 🔥 [NEW] 워커 간 방 인계용 직렬화 (타이머/동기화/뷰 캐시는 워커 로컬, 카운터는 다시 계산하므로 제외)
+    _LOCAL_FIELDS = ("turn_timer", "client_sync", "view_cache", "alive", "unranked")
+
+    def recount(self) -> None:
+        """손패/순위로부터 카운터를 처음부터 다시 계산"""
+        self.alive = set()
+        self.unranked = set()
+        for p in self.players:
+            p.unrevealed = sum(1 for t in p.hand if not t.revealed)
+            if p.unrevealed:
+                self.alive.add(p.uid)
+            if p.final_rank == 0:
+                self.unranked.add(p.uid)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {f.name: getattr(self, f.name) for f in fields(self) if f.name not in self._LOCAL_FIELDS}
+        d["players"] = [p.to_dict() for p in self.players]
+        d["piles"] = {color: [t.to_dict() for t in pile] for color, pile in self.piles.items()}
+        d["drawn_tile"] = self.drawn_tile.to_dict() if self.drawn_tile else None
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "GameState":
+        d = dict(d)
+        d["players"] = [Player.from_dict(p) for p in d["players"]]
+        d["piles"] = {color: [Tile.from_dict(t) for t in pile] for color, pile in d["piles"].items()}
+        d["drawn_tile"] = Tile.from_dict(d["drawn_tile"]) if d["drawn_tile"] else None
+        gs = cls(**d)
+        gs.recount()
+        return gs
@@ -0,0 +1,295 @@
+# money_writer.py
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import metrics
+from logs import get_logger
+from userdb import PartialCommit
+
+log = get_logger("payout")
+
+# 🔥 [NEW] 정산 금액을 모아서 한 번에 쓰는 백그라운드 writer 설정
+MONEY_FLUSH_WINDOW = float(os.environ.get("MONEY_FLUSH_WINDOW", "0.25"))  # 같은 uid 델타를 합치는 시간 (초)
+MONEY_QUEUE_MAX = int(os.environ.get("MONEY_QUEUE_MAX", "10000"))
+MONEY_MAX_RETRIES = int(os.environ.get("MONEY_MAX_RETRIES", "5"))
+
+_STOP = object()
+
+
+def commit_money_deltas(deltas: Dict[str, int]) -> None:
+    """
+    uid별 증감액을 사용자 저장소(userdb)에 배치로 커밋 (Firestore면 WriteBatch 최대 500개씩).
+    일부만 반영되고 실패하면 userdb.PartialCommit이 그대로 올라감 (MoneyWriter가 나머지만 재시도)
+    """
+    from userdb import userdb
+
+    try:
+        dropped = userdb.apply_increments(deltas)
+    except PartialCommit as e:
+        _report_dropped(e.dropped, deltas)
+        raise
+    _report_dropped(dropped, deltas)
+
+
+def _report_dropped(uids, deltas: Dict[str, int]) -> None:
+    for uid in uids:
+        log.warning("⚠️ User not found, money delta dropped: %s %+d", uid, deltas[uid])
+
+
+class MoneyWriter:
+    """
+    단일 백그라운드 스레드가 money 증감 요청을 받아 uid별로 합친 뒤
+    짧은 윈도우마다 배치로 커밋합니다. 실패 시 지수 백오프로 재시도하고,
+    재시도를 다 써도 델타는 버리지 않고 다음 주기에 다시 합칩니다.
+    uid의 접수된 요청이 모두 커밋되면 on_settled([uid, ...])를 호출합니다 (프로필 캐시 갱신용).
+    아직 커밋되지 않은 uid별 합계는 pending()으로 조회합니다.
+    """
+
+    def __init__(self, commit: Callable[[Dict[str, int]], None] = commit_money_deltas,
+                 window: float = MONEY_FLUSH_WINDOW,
+                 max_queue: int = MONEY_QUEUE_MAX,
+                 max_retries: int = MONEY_MAX_RETRIES,
+                 base_backoff: float = 0.5,
+                 on_settled: Optional[Callable[[List[str]], None]] = None):
+        self._commit = commit
+        self._on_settled = on_settled
+        self.window = window
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._carry: Dict[str, int] = {}     # 커밋 실패로 다음 주기로 넘어간 델타
+        self._names: Dict[str, str] = {}     # 로그용 닉네임
+        self._submitted: Dict[str, int] = {}  # uid -> 접수한 마지막 요청 번호
+        self._merged: Dict[str, int] = {}     # uid -> 커밋 대상에 합쳐진 마지막 요청 번호
+        self._uncommitted: Dict[str, int] = {}  # uid -> 접수했지만 아직 커밋되지 않은 합계
+        self._seq_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closed = False
+
+        # 통계 (stats()로 조회)
+        self._commits = 0
+        self._ops = 0
+        self._errors = 0
+        self._retries = 0
+        self._last_latency = 0.0
+        self._max_latency = 0.0
+        self._total_latency = 0.0
+
+    # --- 외부 API ---
+
+    def submit(self, uid: str, amount: int, nickname: str = "Unknown") -> None:
+        """증감 요청을 큐에 넣음 (큐가 가득 차면 공간이 생길 때까지 대기 - 정산 금액은 버리지 않음)"""
+        if not uid or not amount:
+            return
+        with self._seq_lock:
+            seq = self._submitted[uid] = self._submitted.get(uid, 0) + 1
+            self._uncommitted[uid] = self._uncommitted.get(uid, 0) + int(amount)
+        if self._closed:
+            log.warning("⚠️ MoneyWriter closed, writing directly: %s %+d", nickname, amount)
+            with self._seq_lock:
+                self._merged[uid] = seq
+            deltas = {uid: int(amount)}
+            if not self._commit_with_retry(deltas):
+                # 재시도를 다 써도 버리지 않음: unflushed()/close() 반환값으로 회수
+                with self._seq_lock:
+                    self._carry[uid] = self._carry.get(uid, 0) + deltas[uid]
+                log.error("❌ MoneyWriter closed, money delta not written: %s %s %+d", nickname, uid, deltas[uid])
+            return
+        self._ensure_started()
+        self._idle.clear()
+        item = (uid, int(amount), nickname, seq)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            log.warning("⚠️ MoneyWriter queue full (%d), blocking: %s", self._queue.maxsize, nickname)
+            self._queue.put(item)
+
+    def pending(self, uids: Iterable[str]) -> Dict[str, int]:
+        """uids 중 아직 저장소에 커밋되지 않은 요청이 있는 uid -> 그 합계 (0일 수도 있음)"""
+        with self._seq_lock:
+            return {uid: self._uncommitted[uid] for uid in uids if uid in self._submitted}
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """큐와 이월된 델타가 모두 커밋될 때까지 대기"""
+        if self._thread is None:
+            return not self._carry
+        return self._idle.wait(timeout)
+
+    def unflushed(self) -> Dict[str, int]:
+        """재시도를 다 쓰고도 커밋하지 못한 uid별 델타 (종료 후에는 다른 경로로 반영해야 함)"""
+        with self._seq_lock:
+            return dict(self._carry)
+
+    def close(self, timeout: float = 10.0) -> Dict[str, int]:
+        """남은 델타를 모두 커밋하고 writer 스레드 종료 (프로세스 종료 시 호출). 끝내 못 쓴 델타를 반환"""
+        if not self._closed:
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put(_STOP)
+                self._thread.join(timeout)
+        unflushed = self.unflushed()
+        if unflushed:
+            log.error("❌ MoneyWriter closed with unflushed money deltas: %s", unflushed)
+        return unflushed
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "queue_depth": self._queue.qsize() + len(self._carry),
+            "commits": self._commits,
+            "ops": self._ops,
+            "errors": self._errors,
+            "retries": self._retries,
+            "last_commit_latency": self._last_latency,
+            "max_commit_latency": self._max_latency,
+            "avg_commit_latency": (self._total_latency / self._commits) if self._commits else 0.0,
+        }
+
+    # --- 내부 ---
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="money-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            if self._carry:
+                # 이월된 델타가 있으면 오래 기다리지 않음
+                try:
+                    first = self._queue.get(timeout=self.window)
+                except queue.Empty:
+                    first = None
+            else:
+                first = self._queue.get()
+
+            pending = self._carry
+            self._carry = {}
+            if first is _STOP:
+                stopping = True
+            elif first is not None:
+                self._merge(pending, first)
+                # 윈도우 동안 들어오는 요청을 같은 uid끼리 합침
+                deadline = time.time() + self.window
+                while True:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    self._merge(pending, item)
+
+            if stopping:
+                # 종료 직전 큐에 남은 것까지 모두 모음
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        self._merge(pending, item)
+
+            # 합계가 0이 된 uid는 쓸 것이 없으므로 바로 커밋된 것으로 처리
+            self._settle({uid: 0 for uid, amount in pending.items() if not amount})
+            pending = {uid: amount for uid, amount in pending.items() if amount}
+            if pending and not self._commit_with_retry(pending):
+                for uid, amount in pending.items():
+                    self._carry[uid] = self._carry.get(uid, 0) + amount
+
+            if self._queue.empty() and not self._carry:
+                self._idle.set()
+
+    def _merge(self, pending: Dict[str, int], item):
+        uid, amount, nickname, seq = item
+        pending[uid] = pending.get(uid, 0) + amount
+        self._names[uid] = nickname
+        with self._seq_lock:
+            self._merged[uid] = seq
+
+    def _commit_with_retry(self, deltas: Dict[str, int]) -> bool:
+        """
+        deltas를 커밋. 일부만 반영되고 실패하면(PartialCommit) 반영된 uid는 deltas에서 빼고 나머지만 재시도
+        -> 같은 증감이 두 번 더해지지 않음. False로 끝나면 deltas에는 아직 반영 안 된 것만 남음 (호출자가 이월)
+        """
+        for attempt in range(self.max_retries + 1):
+            started = time.time()
+            try:
+                self._commit(deltas)
+            except Exception as e:
+                if isinstance(e, PartialCommit):
+                    self._record_commit({uid: deltas.pop(uid) for uid in e.done if uid in deltas}, started)
+                    if not deltas:
+                        return True
+                    e = e.cause
+                self._errors += 1
+                metrics.firestore_write_errors.inc("batch")
+                if attempt >= self.max_retries:
+                    log.warning("❌ Firestore money batch failed after %d attempts (%d users): %s",
+                                attempt + 1, len(deltas), e)
+                    return False
+                self._retries += 1
+                backoff = self.base_backoff * (2 ** attempt)
+                backoff += random.uniform(0, backoff / 2)
+                log.warning("⚠️ Firestore money batch error, retry in %.2fs: %s", backoff, e)
+                time.sleep(backoff)
+                continue
+
+            self._record_commit(deltas, started)
+            return True
+        return False
+
+    def _record_commit(self, committed: Dict[str, int], started: float) -> None:
+        latency = time.time() - started
+        metrics.firestore_write_duration.observe(latency, "batch")
+        self._commits += 1
+        self._ops += len(committed)
+        self._last_latency = latency
+        self._max_latency = max(self._max_latency, latency)
+        self._total_latency += latency
+        for uid, amount in committed.items():
+            log.debug("💰 Firestore updated (batched): %s %+d", self._names.pop(uid, uid), amount)
+        log.info("💰 Firestore money batch committed: %d users in %.1fms", len(committed), latency * 1000)
+        self._settle(committed)
+
+    def _settle(self, committed: Dict[str, int]) -> None:
+        """커밋된 uid 중 그 뒤로 새 요청이 접수되지 않은 uid만 on_settled로 알림 (새 요청은 그 커밋 때 알림)"""
+        settled = []
+        with self._seq_lock:
+            for uid, amount in committed.items():
+                if uid in self._uncommitted:
+                    self._uncommitted[uid] -= amount
+                if self._merged.get(uid) == self._submitted.get(uid):
+                    self._merged.pop(uid, None)
+                    self._submitted.pop(uid, None)
+                    self._uncommitted.pop(uid, None)
+                    settled.append(uid)
+        if settled and self._on_settled is not None:
+            try:
+                self._on_settled(settled)
+            except Exception as e:
+                log.warning("⚠️ MoneyWriter on_settled failed (%d users): %s", len(settled), e)
+
+
+def _profiles_settled(uids: List[str]) -> None:
+    from profiles import profile_cache
+    profile_cache.settled(uids)
+
+
+money_writer = MoneyWriter(on_settled=_profiles_settled)
+atexit.register(money_writer.close)
@@ -0,0 +1,109 @@
+# outbox.py
+# 🔥 [NEW] 방 작업(액터 틱) 단위 emit 버퍼
+#
+# 한 작업 안에서 나가는 emit을 모았다가 작업이 끝날 때 들어온 순서대로 한 번에 보냅니다.
+#   - socketio.emit / flask_socketio.emit : 그대로 버퍼에 쌓임 (순서 유지)
+#   - broadcast_in_game_state             : 수신자별 상태를 key=("state", sid)로 넣음.
+#     같은 수신자에게 또 보내면 앞의 것은 버리고 새 것이 '마지막 위치'로 감 (가장 최신 상태 하나만 전송)
+#     델타는 보낼 때(flush) 실제로 마지막에 보낸 뷰와 비교해 만들므로 델타 프로토콜과 어긋나지 않습니다.
+#   - socketio.sleep                      : 자기 전에 먼저 flush (연출용 지연의 의미를 유지)
+#
+# 범위는 방 액터가 실행하는 작업 하나(actors.RoomActors._run). 그 밖의 emit은 지금처럼 바로 나갑니다.
+# 버퍼는 ContextVar라 그린스레드/greenlet마다 따로 (다른 방 작업이 끼어들어도 섞이지 않음).
+#
+# OUTBOX_ENABLED=0이면 설치하지 않음 (모든 emit이 즉시 전송)
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import metrics
+from logs import get_logger
+
+OUTBOX_ENABLED = os.environ.get("OUTBOX_ENABLED", "1") != "0"
+
+log = get_logger("broadcast")
+
+_current: ContextVar[Optional["Outbox"]] = ContextVar("outbox", default=None)
+_installed = False
+
+
+class Outbox:
+    __slots__ = ("items", "keyed")
+
+    def __init__(self):
+        self.items: List[Optional[Tuple[Callable, tuple, Dict[str, Any]]]] = []
+        self.keyed: Dict[Hashable, int] = {}  # key -> items 인덱스
+
+    def add(self, fn: Callable, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None,
+            key: Optional[Hashable] = None) -> None:
+        """flush 때 fn(*args, **kwargs) 실행. key가 같은 대기 항목이 있으면 그것을 버림"""
+        if key is not None:
+            index = self.keyed.get(key)
+            if index is not None:
+                self.items[index] = None
+                metrics.outbox_messages.inc("coalesced")
+            self.keyed[key] = len(self.items)
+        self.items.append((fn, args, kwargs or {}))
+
+    def flush(self) -> None:
+        items, self.items, self.keyed = self.items, [], {}
+        # 항목(_send_state 등)이 안에서 부르는 socketio.emit은 다시 버퍼에 들어가지 않고 바로 나가야 함
+        token = _current.set(None)
+        try:
+            for item in items:
+                if item is None:
+                    continue
+                fn, args, kwargs = item
+                try:
+                    fn(*args, **kwargs)
+                    metrics.outbox_messages.inc("sent")
+                except Exception as e:
+                    # 앞의 emit이 실패해도 뒤의 것은 보냄
+                    log.warning("⚠️ Outbox emit failed (%s): %s", getattr(fn, "__name__", fn), e)
+        finally:
+            _current.reset(token)
+
+
+def current() -> Optional[Outbox]:
+    """지금 작업의 버퍼 (버퍼링 중이 아니면 None)"""
+    return _current.get()
+
+
+@contextmanager
+def collect():
+    """이 블록 안의 emit을 모았다가 블록이 끝날 때(예외로 끝나도) 보냄. 중첩되면 바깥 버퍼를 그대로 씀"""
+    if not _installed or _current.get() is not None:
+        yield
+        return
+    box = Outbox()
+    token = _current.set(box)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+        box.flush()
+
+
+def install(socketio) -> None:
+    """extensions.socketio의 emit/sleep을 버퍼 인식 버전으로 감쌈 (핸들러/유틸 코드는 그대로)"""
+    global _installed
+    if not OUTBOX_ENABLED or _installed:
+        return
+    original_emit, original_sleep = socketio.emit, socketio.sleep
+
+    def emit(event, *args, **kwargs):
+        box = _current.get()
+        if box is None:
+            return original_emit(event, *args, **kwargs)
+        box.add(original_emit, (event,) + args, kwargs)
+
+    def sleep(seconds=0):
+        box = _current.get()
+        if box is not None:
+            box.flush()
+        return original_sleep(seconds)
+
+    socketio.emit = emit
+    socketio.sleep = sleep
+    _installed = True
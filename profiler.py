@@ -0,0 +1,189 @@
+# profiler.py
+# 🔥 [NEW] 실행 중인 워커를 N초 동안 프로파일링 (관리자 엔드포인트 /admin/profile)
+#
+# - sample: 별도 OS 스레드가 interval마다 이벤트 루프 스레드의 스택을 찍어 collapsed stack으로 집계.
+#   그린스레드(eventlet)/greenlet(ASGI 모드)는 모두 그 스레드 위에서 돌기 때문에, 찍히는 스택은
+#   그 순간 실행 중이던 핸들러의 스택입니다.
+#   소켓 핸들러(metrics.timed_handler)와 방 액터 작업(actors)이 자기 프레임에 event/room 태그를 달아 두면
+#   샘플 앞에 "event:guess_value;room:ab12cd;task:_dispatch_event;room:ab12cd;..." 처럼 붙습니다.
+# - deterministic: 같은 스레드에서 cProfile을 켰다가 끔 (pstats 바이너리 또는 텍스트)
+#
+# 프로파일링 중이 아닐 때 핸들러가 내는 비용은 `if profiler.active:` 한 번뿐입니다.
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import sys
+from collections import Counter
+from typing import Dict, Optional
+
+try:
+    from eventlet.patcher import original as _original
+    _real_threading = _original("threading")
+    _real_time = _original("time")
+except ImportError:  # eventlet 없이 (ASGI 모드 등)
+    import threading as _real_threading
+    import time as _real_time
+
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+PROFILE_MAX_SECONDS = float(os.environ.get("PROFILE_MAX_SECONDS", "60"))
+DEFAULT_INTERVAL = 0.005
+
+active = False                  # 핸들러가 태그를 달지 말지 (켜져 있을 때만)
+_frame_tags: Dict[int, str] = {}
+_lock = _real_threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """이미 다른 프로파일링이 진행 중"""
+
+
+def tag_frame(frame, event: Optional[str] = None, room: Optional[str] = None,
+              task: Optional[str] = None) -> bool:
+    """frame이 실행되는 동안 찍힌 샘플에 event/task/room을 붙임. untag_frame()과 짝으로"""
+    parts = []
+    if event:
+        parts.append(f"event:{event}")
+    if task:
+        parts.append(f"task:{task}")
+    if room:
+        parts.append(f"room:{room}")
+    if not parts:
+        return False
+    _frame_tags[id(frame)] = ";".join(parts)
+    return True
+
+
+def untag_frame(frame) -> None:
+    _frame_tags.pop(id(frame), None)
+
+
+def check_token(header_value: str) -> bool:
+    """ADMIN_TOKEN이 설정돼 있고 "Bearer <token>" 또는 토큰 그대로와 일치하는지 (미설정이면 항상 거부)"""
+    if not ADMIN_TOKEN or not header_value:
+        return False
+    token = header_value[7:] if header_value.startswith("Bearer ") else header_value
+    return hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class _Sampler:
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = _real_threading.Event()
+        self._thread = _real_threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame)
+            _real_time.sleep(self.interval)
+
+    def _record(self, frame):
+        stack, tags = [], []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            tag = _frame_tags.get(id(frame))
+            if tag:
+                tags.append(tag)
+            frame = frame.f_back
+        stack.reverse()
+        tags.reverse()
+        self.counts[";".join(tags + stack)] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed stack 형식 (flamegraph.pl / speedscope에 바로 넣을 수 있음)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+def _loop_thread_id() -> int:
+    """핸들러가 도는 스레드: eventlet 허브/uvicorn 루프 모두 메인 스레드"""
+    return _real_threading.main_thread().ident
+
+
+def _sleep(seconds: float):
+    from extensions import socketio
+    socketio.sleep(seconds)
+
+
+def _call_on_loop(fn):
+    """cProfile은 켠 스레드만 보므로, ASGI 모드(라우트가 스레드 풀에서 돎)에서는 루프 스레드에서 켜고 끔"""
+    import aio
+    if aio._loop is not None and _real_threading.get_ident() != _loop_thread_id():
+        done = _real_threading.Event()
+
+        def run():
+            try:
+                fn()
+            finally:
+                done.set()
+
+        aio._loop.call_soon_threadsafe(run)
+        done.wait(5.0)
+    else:
+        fn()
+
+
+def run_profile(seconds: float, mode: str = "sample", fmt: str = "collapsed",
+                interval: float = DEFAULT_INTERVAL):
+    """
+    seconds 동안 프로파일링 후 (body, mimetype) 반환.
+    mode=sample: fmt=collapsed | deterministic: fmt=pstats(바이너리) 또는 text
+    """
+    global active
+    seconds = max(0.1, min(seconds, PROFILE_MAX_SECONDS))
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusy("profiling already in progress")
+    try:
+        if mode == "sample":
+            sampler = _Sampler(_loop_thread_id(), max(0.001, interval))
+            active = True
+            sampler.start()
+            try:
+                _sleep(seconds)
+            finally:
+                sampler.stop()
+                active = False
+                _frame_tags.clear()
+            header = f"# samples={sampler.samples} interval={interval}s seconds={seconds}\n"
+            return header + sampler.collapsed(), "text/plain; charset=utf-8"
+
+        if mode == "deterministic":
+            profile = cProfile.Profile()
+            _call_on_loop(profile.enable)
+            try:
+                _sleep(seconds)
+            finally:
+                _call_on_loop(profile.disable)
+            if fmt == "pstats":
+                return _dump_pstats(profile), "application/octet-stream"
+            out = io.StringIO()
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(80)
+            return out.getvalue(), "text/plain; charset=utf-8"
+
+        raise ValueError(f"unknown profile mode: {mode}")
+    finally:
+        _lock.release()
+
+
+def _dump_pstats(profile: cProfile.Profile) -> bytes:
+    import marshal
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
@@ -0,0 +1,182 @@
+# profiles.py
+# 🔥 [NEW] 플레이어 프로필(nickname/major/year/money) 서버 측 캐시
+#
+# 입장 이벤트(join_queue/create_room/enter_room)가 보낸 값 대신 Firestore users 문서를 기준으로 씁니다.
+# - uid 키 read-through 캐시: TTL 동안은 Firestore를 다시 읽지 않고, 크기를 넘으면 가장 오래 안 쓴 항목부터 제거 (LRU)
+# - get_many(): 캐시에 없는 uid만 모아 db.get_all() 한 번으로 조회 -> 매칭 1건(4명)당 RPC 최대 1회
+# - 정산(utils.update_user_money_async / increment_user_money_now) 때 apply_delta()로 캐시된 money를 같이 갱신.
+#   money_writer가 아직 커밋하지 않은 uid는 조회한 저장소 값에 대기 중인 합계(money_writer.pending)를 더해 돌려주고,
+#   캐시하지는 않음 (저장소 값이 아직 옛 잔액) -> 커밋 뒤 다음 조회부터 캐시
+#   writer가 커밋을 끝내면 settled() -> 다른 워커 캐시의 그 uid는 invalidate (cluster 브로드캐스트)
+#
+# 저장소에 프로필이 없거나(Firebase 미설정 포함) 조회에 실패하면 빈 결과 -> 호출자는 클라이언트가 보낸 값을 그대로 씀
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import metrics
+from cluster import call_on_others, remote
+from logs import get_logger
+from userdb import PROFILE_FIELDS
+
+log = get_logger("lobby")
+
+PROFILE_CACHE_TTL = float(os.environ.get("PROFILE_CACHE_TTL", "300"))
+PROFILE_CACHE_SIZE = int(os.environ.get("PROFILE_CACHE_SIZE", "10000"))
+PROFILE_FETCH_TIMEOUT = float(os.environ.get("PROFILE_FETCH_TIMEOUT", "3"))
+
+Profile = Dict[str, Any]
+
+
+def _clean(data: Dict[str, Any]) -> Profile:
+    """문서에서 프로필 필드만, 형식이 맞는 값만 (money/year는 int, 문자열 필드는 빈 값 제외)"""
+    profile = {}
+    for key in PROFILE_FIELDS:
+        value = data.get(key)
+        if key in ("money", "year"):
+            try:
+                profile[key] = int(value)
+            except (TypeError, ValueError):
+                pass
+        elif value:
+            profile[key] = value
+    return profile
+
+
+def fetch_profiles(uids: List[str]) -> Dict[str, Profile]:
+    """사용자 저장소(userdb)에서 일괄 조회 (Firestore면 get_all 한 번, 없는 문서는 결과에서 빠짐)"""
+    from userdb import userdb
+
+    started = time.perf_counter()
+    profiles = userdb.get_profiles(uids, timeout=PROFILE_FETCH_TIMEOUT)
+    metrics.profile_fetch_duration.observe(time.perf_counter() - started)
+    return profiles
+
+
+class ProfileCache:
+    """uid -> 프로필. TTL + LRU, 미스는 모아서 한 번에 조회"""
+
+    def __init__(self, fetch: Callable[[List[str]], Dict[str, Profile]],
+                 ttl: float = PROFILE_CACHE_TTL, max_size: int = PROFILE_CACHE_SIZE,
+                 on_settled: Optional[Callable[[List[str]], None]] = None,
+                 pending: Optional[Callable[[List[str]], Dict[str, int]]] = None):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.max_size = max_size
+        self._on_settled = on_settled  # 커밋된 uid 알림 (다른 워커 캐시 무효화)
+        self._pending = pending or (lambda uids: {})  # uid -> 아직 커밋되지 않은 money 증감 합계
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # uid -> (profile, fetched_at)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, uid: str) -> Optional[Profile]:
+        return self.get_many([uid]).get(uid)
+
+    def get_many(self, uids: Iterable[str]) -> Dict[str, Profile]:
+        """캐시된 것은 그대로, 없거나 만료된 uid는 한 번의 조회로 채움. 조회 실패 시 그 uid들은 결과에서 빠짐"""
+        now = time.time()
+        found: Dict[str, Profile] = {}
+        missing: List[str] = []
+        with self._lock:
+            for uid in dict.fromkeys(uids):
+                entry = self._entries.get(uid)
+                if entry is not None and now - entry[1] < self.ttl:
+                    self._entries.move_to_end(uid)
+                    found[uid] = dict(entry[0])
+                else:
+                    missing.append(uid)
+        if found:
+            metrics.profile_cache_requests.inc("hit", len(found))
+        if not missing:
+            return found
+        metrics.profile_cache_requests.inc("miss", len(missing))
+
+        # 조회 전후로 대기 중인 정산 확인: 조회 도중 커밋/접수된 uid도 캐시하지 않음
+        pending_before = self._pending(missing)
+        try:
+            fetched = self._fetch(missing)
+        except Exception as e:
+            metrics.profile_cache_requests.inc("error", len(missing))
+            log.warning("⚠️ Profile fetch failed (%d users): %s", len(missing), e)
+            return found
+        pending = self._pending(list(fetched))
+
+        with self._lock:
+            now = time.time()
+            for uid, profile in fetched.items():
+                profile = _clean(profile)
+                if uid in pending or uid in pending_before:
+                    if "money" in profile:
+                        profile["money"] += pending.get(uid, 0)
+                else:
+                    self._store(uid, profile, now)
+                found[uid] = dict(profile)
+        return found
+
+    def apply_delta(self, uid: str, amount: int, committed: bool = False) -> None:
+        """
+        정산 반영: 캐시된 money를 amount만큼 증감 (없으면 다음 조회를 기다림).
+        committed=True면 이미 저장소에 반영된 증감 -> 바로 다른 워커에 알림 (아니면 writer의 settled()가 알림)
+        """
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is not None and "money" in entry[0]:
+                entry[0]["money"] += amount
+        if committed:
+            self._notify([uid])
+
+    def settled(self, uids: Iterable[str]) -> None:
+        """money_writer가 uids의 대기 중인 정산을 모두 커밋함 -> 다른 워커에 알림"""
+        self._notify(list(uids))
+
+    def invalidate(self, uid: str) -> None:
+        with self._lock:
+            self._entries.pop(uid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _notify(self, uids: List[str]) -> None:
+        if self._on_settled is None or not uids:
+            return
+        try:
+            self._on_settled(uids)
+        except Exception as e:
+            log.warning("⚠️ Profile invalidation broadcast failed (%d users): %s", len(uids), e)
+
+    def _store(self, uid: str, profile: Profile, now: float) -> None:
+        self._entries[uid] = (dict(profile), now)
+        self._entries.move_to_end(uid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def apply_profile(data: Dict[str, Any], profile: Optional[Profile]) -> Dict[str, Any]:
+    """클라이언트가 보낸 입장 데이터(dict)에 서버 프로필 값을 덮어씀 (프로필에 있는 필드만)"""
+    if profile:
+        data.update(profile)
+    return data
+
+
+@remote
+def invalidate_profiles(uids: List[str]) -> None:
+    """다른 워커에서 정산이 커밋됨 -> 이 워커에 캐시된 그 uid들의 프로필(옛 money) 제거"""
+    for uid in uids:
+        profile_cache.invalidate(uid)
+
+
+def broadcast_invalidation(uids: List[str]) -> None:
+    call_on_others(invalidate_profiles, None, list(uids))
+
+
+def _writer_pending(uids: List[str]) -> Dict[str, int]:
+    from money_writer import money_writer
+    return money_writer.pending(uids)
+
+
+profile_cache = ProfileCache(fetch_profiles, on_settled=broadcast_invalidation, pending=_writer_pending)
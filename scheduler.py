@@ -0,0 +1,122 @@
+# scheduler.py
+import os
+import time
+from typing import Any, Callable, List, Optional, Set
+
+from logs import get_logger
+
+log = get_logger("turn")
+
+# 🔥 [NEW] 방마다 threading.Timer(OS 스레드)를 만들지 않고,
+# 서버 런타임(eventlet 그린스레드) 위에서 도는 타이머 휠 하나로 모든 턴 타이머를 관리합니다.
+TIMER_TICK_SECONDS = float(os.environ.get("TIMER_TICK_SECONDS", "0.05"))
+TIMER_WHEEL_SLOTS = int(os.environ.get("TIMER_WHEEL_SLOTS", "1024"))
+
+
+class TimerHandle:
+    """call_later()가 반환하는 핸들. cancel()은 O(1)"""
+    __slots__ = ("deadline", "expire_tick", "callback", "args", "cancelled", "_slot")
+
+    def __init__(self, deadline: float, expire_tick: int, callback: Callable, args: tuple):
+        self.deadline = deadline
+        self.expire_tick = expire_tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self._slot: Optional[Set["TimerHandle"]] = None
+
+    def cancel(self):
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self._slot is not None:
+            self._slot.discard(self)
+            self._slot = None
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+
+class TimerWheel:
+    """
+    해시 타이머 휠 (Varghese & Lauck).
+    - 슬롯 = expire_tick % slots, 예약/취소는 세트 추가/삭제라 O(1)
+    - 틱마다 현재 슬롯만 확인 (한 바퀴보다 먼 타이머는 expire_tick으로 걸러냄)
+    - 콜백은 휠 루프(백그라운드 태스크)에서 순서대로 실행
+    """
+
+    def __init__(self, tick: float = TIMER_TICK_SECONDS, slots: int = TIMER_WHEEL_SLOTS,
+                 spawn: Optional[Callable] = None, sleep: Optional[Callable[[float], Any]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.tick = tick
+        self._slots: List[Set[TimerHandle]] = [set() for _ in range(slots)]
+        self._spawn = spawn
+        self._sleep = sleep
+        self._clock = clock
+        self._origin = clock()
+        self._current_tick = 0  # 다음에 처리할 틱 번호
+        self._running = False
+
+    def __len__(self):
+        return sum(len(s) for s in self._slots)
+
+    def call_later(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        """delay초 뒤 callback(*args) 실행 예약"""
+        self._ensure_started()
+        deadline = self._clock() + max(0.0, delay)
+        expire_tick = max(self._current_tick, int((deadline - self._origin) / self.tick + 0.999999))
+        handle = TimerHandle(deadline, expire_tick, callback, args)
+        slot = self._slots[expire_tick % len(self._slots)]
+        slot.add(handle)
+        handle._slot = slot
+        return handle
+
+    def stop(self):
+        self._running = False
+
+    def _ensure_started(self):
+        if self._running:
+            return
+        self._running = True
+        if self._spawn is None or self._sleep is None:
+            from extensions import socketio
+            self._spawn = self._spawn or socketio.start_background_task
+            self._sleep = self._sleep or socketio.sleep
+        self._spawn(self._run)
+
+    def _run(self):
+        while self._running:
+            now = self._clock()
+            next_at = self._origin + self._current_tick * self.tick
+            if now < next_at:
+                self._sleep(next_at - now)
+                continue
+            # 밀린 틱까지 모두 처리 (루프가 늦게 깨어난 경우)
+            target_tick = int((now - self._origin) / self.tick)
+            while self._current_tick <= target_tick:
+                # 콜백 안에서 새로 예약되는 타이머가 다음 틱 이후로 잡히도록 먼저 증가
+                tick_no = self._current_tick
+                self._current_tick += 1
+                self._fire_slot(tick_no)
+
+    def _fire_slot(self, tick_no: int):
+        slot = self._slots[tick_no % len(self._slots)]
+        if not slot:
+            return
+        due = [h for h in slot if h.expire_tick <= tick_no]
+        for handle in due:
+            slot.discard(handle)
+            handle._slot = None
+        due.sort(key=lambda h: h.deadline)
+        for handle in due:
+            if handle.cancelled:
+                continue
+            handle.cancelled = True  # 한 번만 실행 (이후 cancel()은 무시됨)
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                log.exception("❌ Timer callback error (%s): %s",
+                              getattr(handle.callback, "__name__", handle.callback), e)
+
+
+timer_wheel = TimerWheel()
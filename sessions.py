@@ -0,0 +1,49 @@
+# sessions.py
+# 🔥 [NEW] 세션 디렉터리: sid -> (room_id, Player), uid -> room_id
+#
+# 연결 끊김/이벤트 처리 때 모든 방을 순회하지 않고 O(1)로 플레이어를 찾기 위한 인덱스.
+# 플레이어가 방에 들어가거나(bind), 재접속으로 sid가 바뀌거나(bind old_sid=...),
+# 방에서 빠지거나(unbind), 방이 삭제/인계될 때(drop_room) 함께 갱신해야 합니다.
+# 워커마다 자기 메모리에 있는 방만 색인합니다.
+from typing import Dict, Optional, Tuple
+
+from models import GameState, Player
+
+
+class SessionDirectory:
+    def __init__(self):
+        self._by_sid: Dict[str, Tuple[str, Player]] = {}
+        self._by_uid: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_sid)
+
+    def bind(self, room_id: str, player: Player, old_sid: Optional[str] = None) -> None:
+        if old_sid and old_sid != player.sid:
+            self._drop_sid(old_sid, player)
+        self._by_sid[player.sid] = (room_id, player)
+        self._by_uid[player.uid] = room_id
+
+    def unbind(self, room_id: str, player: Player) -> None:
+        self._drop_sid(player.sid, player)
+        if self._by_uid.get(player.uid) == room_id:
+            del self._by_uid[player.uid]
+
+    def bind_room(self, room_id: str, gs: GameState) -> None:
+        for p in gs.players:
+            self.bind(room_id, p)
+
+    def drop_room(self, room_id: str, gs: GameState) -> None:
+        for p in gs.players:
+            self.unbind(room_id, p)
+
+    def lookup_sid(self, sid: str) -> Optional[Tuple[str, Player]]:
+        return self._by_sid.get(sid)
+
+    def room_of_uid(self, uid: str) -> Optional[str]:
+        return self._by_uid.get(uid)
+
+    def _drop_sid(self, sid: str, player: Player) -> None:
+        entry = self._by_sid.get(sid)
+        if entry is not None and entry[1] is player:
+            del self._by_sid[sid]
@@ -0,0 +1,45 @@
+# sharding.py
+# 🔥 [NEW] room_id -> 워커 일관 해싱 링
+#
+# 워커마다 가상 노드(VNODES개)를 링에 올리고, room_id의 해시 다음에 오는 첫 노드가 소유자입니다.
+# 워커가 하나 늘거나 줄어도 약 1/N의 방만 소유자가 바뀝니다.
+import bisect
+import hashlib
+import os
+from typing import Iterable, List, Optional, Tuple
+
+VNODES = int(os.environ.get("SHARD_VNODES", "64"))
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = VNODES):
+        self.vnodes = vnodes
+        self._nodes: Tuple[str, ...] = ()
+        self._keys: List[int] = []
+        self._owners: List[str] = []
+        self.set_nodes(nodes)
+
+    @property
+    def nodes(self) -> Tuple[str, ...]:
+        return self._nodes
+
+    def set_nodes(self, nodes: Iterable[str]) -> bool:
+        """노드 집합 교체. 바뀌었으면 True"""
+        nodes = tuple(sorted(set(nodes)))
+        if nodes == self._nodes:
+            return False
+        points = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(self.vnodes))
+        self._keys = [h for h, _ in points]
+        self._owners = [node for _, node in points]
+        self._nodes = nodes
+        return True
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._keys:
+            return None
+        i = bisect.bisect(self._keys, _hash(key))
+        return self._owners[i % len(self._owners)]
@@ -0,0 +1,400 @@
+# simulator.py
+# 🔥 [NEW] 헤드리스 게임 시뮬레이터 (Socket.IO/Firestore 없이 game_logic 규칙만으로 게임 전체 진행)
+#
+#   python simulator.py --games 1000000 --procs 8 --players 4 --policies deductive,random
+#
+# - 턴 진행은 game_events와 같음: 더미가 있으면 뽑기(조커면 배치) -> 추리 -> 맞히면 계속/멈춤, 틀리면 턴 넘김
+#   탈락 순위/정산은 game_logic의 rank_newly_eliminated / assign_final_ranks / payout_for_rank를 그대로 씀
+# - 정책(Policy)은 자기 패 + 공개된 정보(상대 타일 색/위치, 공개된 값)만 보고 결정합니다
+# - 게임은 프로세스 풀에 청크 단위로 나눠 돌리고, 청크별 집계(Summary)를 합칩니다
+# - 결과: 처리량(games/s), 게임 길이, 탈락 순서, 조커 영향, 정산 분포
+#
+# 타임아웃/중도 퇴장/재접속은 시뮬레이션하지 않습니다.
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from models import GameState, Player, Color
+from game_logic import (
+    prepare_tiles, deal_initial_hands, start_turn_from, auto_place_drawn_tile, guess_tile,
+    is_player_eliminated, rank_newly_eliminated, assign_final_ranks, payout_for_rank, add_tile,
+)
+
+MAX_TURNS = 1000  # 규칙상 도달할 수 없는 안전장치 (넘으면 stalled로 집계)
+VALUES = range(12)
+
+
+# --- 정책 ---
+
+class Policy:
+    """한 좌석의 행동 결정. rng는 좌석별로 따로 받음"""
+    name = "base"
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def draw_color(self, gs: GameState, me: Player) -> Color:
+        return self.rng.choice([c for c in ("black", "white") if gs.piles[c]])
+
+    def joker_index(self, gs: GameState, me: Player) -> int:
+        return self.rng.randint(0, len(me.hand))
+
+    def guess(self, gs: GameState, me: Player) -> Optional[Tuple[int, int, object]]:
+        raise NotImplementedError
+
+    def keep_guessing(self, gs: GameState, me: Player) -> bool:
+        return False
+
+
+def _hidden_targets(gs: GameState, me: Player):
+    return [(p, i, t) for p in gs.players if p is not me and p.final_rank == 0
+            for i, t in enumerate(p.hand) if not t.revealed]
+
+
+class RandomPolicy(Policy):
+    """부하 테스트 봇과 같은 방식: 아무 가려진 타일에 아무 값 (5%는 조커), 맞히면 50% 확률로 계속"""
+    name = "random"
+
+    def guess(self, gs, me):
+        targets = _hidden_targets(gs, me)
+        if not targets:
+            return None
+        target, index, _ = self.rng.choice(targets)
+        value = "JOKER" if self.rng.random() < 0.05 else self.rng.randint(0, 11)
+        return target.id, index, value
+
+    def keep_guessing(self, gs, me):
+        return self.rng.random() < 0.5
+
+
+class DeductivePolicy(Policy):
+    """
+    보이는 정보로 후보 값을 좁혀서 추리:
+    - 이미 본 타일(내 패 + 공개된 타일)의 (색, 값)은 제외
+    - 숫자 타일은 패 안에서 정렬돼 있으므로 양옆의 공개된 숫자 타일 사이 값만 가능
+    후보가 가장 적은 타일을 고르고, 다음 후보가 continue_at개 이하일 때만 계속 추리
+    """
+    name = "deductive"
+    continue_at = 2
+
+    def _candidates(self, gs: GameState, me: Player):
+        order = 0 if gs.same_number_order == "black-first" else 1
+        seen = {(t.color, t.value) for t in me.hand}
+        seen_jokers = {t.color for t in me.hand if t.is_joker}
+        for p in gs.players:
+            for t in p.hand:
+                if t.revealed:
+                    seen.add((t.color, t.value))
+                    if t.is_joker:
+                        seen_jokers.add(t.color)
+
+        def key(color, value):
+            return value * 2 + ((0 if color == "black" else 1) ^ order)
+
+        out = []
+        for p, i, t in _hidden_targets(gs, me):
+            low = next((key(o.color, o.value) for o in reversed(p.hand[:i]) if o.revealed and not o.is_joker), -1)
+            high = next((key(o.color, o.value) for o in p.hand[i + 1:] if o.revealed and not o.is_joker), 99)
+            values = [v for v in VALUES if (t.color, v) not in seen and low < key(t.color, v) < high]
+            if t.color not in seen_jokers:
+                values.append("JOKER")
+            if values:
+                out.append((len(values), p, i, values))
+        return out
+
+    def guess(self, gs, me):
+        candidates = self._candidates(gs, me)
+        if not candidates:
+            return None
+        fewest = min(c[0] for c in candidates)
+        _, target, index, values = self.rng.choice([c for c in candidates if c[0] == fewest])
+        # 조커는 색마다 하나뿐이라 숫자보다 가능성이 낮음: 숫자 후보가 있으면 먼저
+        numbers = [v for v in values if v != "JOKER"]
+        return target.id, index, self.rng.choice(numbers or values)
+
+    def keep_guessing(self, gs, me):
+        candidates = self._candidates(gs, me)
+        return bool(candidates) and min(c[0] for c in candidates) <= self.continue_at
+
+
+POLICIES = {cls.name: cls for cls in (RandomPolicy, DeductivePolicy)}
+
+
+# --- 게임 한 판 ---
+
+def new_game(n_players: int, bets: List[int]) -> GameState:
+    gs = GameState(
+        players=[], piles={"black": [], "white": []}, same_number_order="black-first",
+        current_turn=-1, drawn_tile=None, pending_placement=False, can_place_anywhere=False,
+        next_tile_id=0,
+    )
+    for i in range(n_players):
+        gs.players.append(Player(sid=f"sim{i}", uid=f"sim{i}", id=i, name=f"p{i}", nickname=f"p{i}",
+                                 bet_amount=bets[i]))
+    prepare_tiles(gs)
+    deal_initial_hands(gs)
+    gs.game_started = True
+    return gs
+
+
+def _next_turn(gs: GameState) -> Player:
+    """start_next_turn과 같은 순서: 다음 순위 없는(final_rank == 0) 플레이어"""
+    for _ in range(len(gs.players)):
+        gs.current_turn = (gs.current_turn + 1) % len(gs.players)
+        if gs.players[gs.current_turn].final_rank == 0:
+            break
+    return gs.players[gs.current_turn]
+
+
+def play_game(policies: List[Policy], bets: List[int]) -> Dict:
+    """게임 한 판을 끝까지 진행하고 기록을 반환 (타일 섞기/페널티는 전역 random 사용)"""
+    gs = new_game(len(policies), bets)
+    record = {"turns": 0, "guesses": 0, "correct": 0, "jokers_drawn": 0, "eliminated": [], "stalled": False}
+
+    def settle_eliminated():
+        for p in rank_newly_eliminated(gs):
+            p.money += -p.bet_amount
+            p.settled = True
+            record["eliminated"].append(p.id)
+
+    while record["turns"] < MAX_TURNS:
+        player = _next_turn(gs)
+        policy = policies[player.id]
+        record["turns"] += 1
+
+        # DRAWING (더미가 남아 있을 때만)
+        if gs.piles["black"] or gs.piles["white"]:
+            tile = start_turn_from(gs, player, policy.draw_color(gs, player))
+            if tile is not None and tile.is_joker:
+                record["jokers_drawn"] += 1
+                index = max(0, min(policy.joker_index(gs, player), len(player.hand)))
+                add_tile(gs, player, index, tile)
+                player.last_drawn_index = index
+            elif tile is not None:
+                auto_place_drawn_tile(gs, player)
+            gs.drawn_tile = None
+            gs.pending_placement = False
+            gs.can_place_anywhere = False
+
+        # GUESSING / POST_SUCCESS_GUESS
+        while True:
+            choice = policy.guess(gs, player)
+            if choice is None:
+                break
+            result = guess_tile(gs, player, *choice)
+            if not result["ok"]:
+                break
+            record["guesses"] += 1
+            record["correct"] += bool(result["correct"])
+            settle_eliminated()
+
+            if len(gs.unranked) <= 1:
+                assign_final_ranks(gs)
+                for p in gs.players:
+                    if not p.settled:
+                        p.money += payout_for_rank(p.final_rank, p.bet_amount)
+                        p.settled = True
+                return _finish(gs, record)
+
+            if not (result["correct"] and not is_player_eliminated(player) and policy.keep_guessing(gs, player)):
+                break
+
+    record["stalled"] = True
+    return _finish(gs, record)
+
+
+def _finish(gs: GameState, record: Dict) -> Dict:
+    record["ranks"] = [p.final_rank for p in gs.players]
+    record["payouts"] = [p.money for p in gs.players]  # 시작 금액 0 기준 = 순변동
+    record["joker_holders"] = [p.id for p in gs.players if any(t.is_joker for t in p.hand)]
+    return record
+
+
+# --- 집계 ---
+
+class Summary:
+    """게임 기록 누적 (프로세스 간에는 to_dict()/merge()로 합침)"""
+
+    def __init__(self):
+        self.games = 0
+        self.stalled = 0
+        self.turns = Counter()           # 게임 길이(턴) 분포
+        self.guesses = 0
+        self.correct = 0
+        self.jokers_drawn = 0
+        self.wins_by_seat = Counter()
+        self.wins_by_policy = Counter()
+        self.seats_by_policy = Counter()
+        self.eliminated_at = defaultdict(Counter)  # 탈락 순서(0=첫 탈락) -> 정책별 횟수
+        self.joker_players = 0
+        self.joker_wins = 0
+        self.players = 0
+        self.net_change = Counter()      # 한 플레이어의 한 판 순변동 분포
+        self.bets = 0
+        self.money_created = 0           # 모든 플레이어 순변동 합 (양수면 돈이 새로 생김)
+
+    def add(self, record: Dict, names: List[str], bets: List[int]):
+        self.games += 1
+        self.stalled += record["stalled"]
+        self.turns[record["turns"]] += 1
+        self.guesses += record["guesses"]
+        self.correct += record["correct"]
+        self.jokers_drawn += record["jokers_drawn"]
+        for order, seat in enumerate(record["eliminated"]):
+            self.eliminated_at[order][names[seat]] += 1
+        holders = set(record["joker_holders"])
+        for seat, rank in enumerate(record["ranks"]):
+            self.players += 1
+            self.seats_by_policy[names[seat]] += 1
+            if rank == 1:
+                self.wins_by_seat[seat] += 1
+                self.wins_by_policy[names[seat]] += 1
+            if seat in holders:
+                self.joker_players += 1
+                self.joker_wins += rank == 1
+        for seat, net in enumerate(record["payouts"]):
+            self.net_change[net] += 1
+            self.money_created += net
+            self.bets += bets[seat]
+
+    def to_dict(self) -> Dict:
+        return {k: (dict(v) if isinstance(v, Counter) else
+                    {o: dict(c) for o, c in v.items()} if isinstance(v, defaultdict) else v)
+                for k, v in vars(self).items()}
+
+    def merge(self, raw: Dict):
+        for key, value in raw.items():
+            current = getattr(self, key)
+            if isinstance(current, defaultdict):
+                for order, counts in value.items():
+                    current[int(order)].update(counts)
+            elif isinstance(current, Counter):
+                current.update(value)
+            else:
+                setattr(self, key, current + value)
+
+    def report(self) -> Dict:
+        games = max(1, self.games)
+
+        def turn_pct(pct):
+            # 분포에서 바로 백분위 계산 (전개하지 않음)
+            target = pct / 100.0 * (self.games - 1)
+            seen = 0
+            for turns in sorted(self.turns):
+                seen += self.turns[turns]
+                if seen > target:
+                    return turns
+            return 0
+
+        non_joker_players = self.players - self.joker_players
+        return {
+            "games": self.games,
+            "stalled": self.stalled,
+            "turns": {"mean": round(sum(t * n for t, n in self.turns.items()) / games, 2),
+                      "p50": turn_pct(50), "p90": turn_pct(90), "p99": turn_pct(99),
+                      "max": max(self.turns) if self.turns else 0},
+            "guesses_per_game": round(self.guesses / games, 2),
+            "guess_accuracy": round(self.correct / max(1, self.guesses), 4),
+            "jokers_drawn_per_game": round(self.jokers_drawn / games, 3),
+            "win_rate_by_seat": {seat: round(n / games, 4) for seat, n in sorted(self.wins_by_seat.items())},
+            "win_rate_by_policy": {name: round(self.wins_by_policy[name] / n, 4)
+                                   for name, n in sorted(self.seats_by_policy.items())},
+            "elimination_order": {f"{order + 1}": {name: round(n / games, 4) for name, n in sorted(c.items())}
+                                  for order, c in sorted(self.eliminated_at.items())},
+            "joker": {
+                "holder_win_rate": round(self.joker_wins / max(1, self.joker_players), 4),
+                "non_holder_win_rate": round((sum(self.wins_by_seat.values()) - self.joker_wins)
+                                             / max(1, non_joker_players), 4),
+            },
+            "payout": {
+                "net_change_distribution": {str(k): round(n / max(1, self.players), 4)
+                                            for k, n in sorted(self.net_change.items())},
+                "money_created_per_game": round(self.money_created / games, 2),
+                "money_created_per_bet": round(self.money_created / max(1, self.bets), 4),
+            },
+        }
+
+
+# --- 실행 ---
+
+def seat_policies(spec: str, n_players: int) -> List[str]:
+    """"deductive,random" -> 좌석 수만큼 반복해서 채움"""
+    names = [s.strip() for s in spec.split(",") if s.strip()]
+    for name in names:
+        if name not in POLICIES:
+            raise ValueError(f"unknown policy: {name} (choose from {', '.join(POLICIES)})")
+    return [names[i % len(names)] for i in range(n_players)]
+
+
+def run_chunk(args: Tuple[int, int, int, List[str], List[int], bool]) -> Dict:
+    """games판을 돌린 Summary. rotate면 판마다 정책 좌석을 돌려서 선 플레이어 이점을 고르게 분배"""
+    seed, games, n_players, names, bets, rotate = args
+    random.seed(seed)
+    rng = random.Random(seed ^ 0x5EED)
+    summary = Summary()
+    for g in range(games):
+        shift = g % n_players if rotate else 0
+        seat_names = names[shift:] + names[:shift]
+        policies = [POLICIES[name](random.Random(rng.random())) for name in seat_names]
+        summary.add(play_game(policies, bets), seat_names, bets)
+    return summary.to_dict()
+
+
+def simulate(games: int, n_players: int = 4, policies: str = "deductive", bet: int = 10000, procs: int = 0,
+             chunk: int = 2000, seed: int = 0, rotate: bool = True) -> Dict:
+    """games판을 procs개 프로세스에 청크로 나눠 돌리고 집계 결과 + 처리량을 반환"""
+    names = seat_policies(policies, n_players)
+    bets = [bet] * n_players
+    jobs = []
+    for i, start in enumerate(range(0, games, chunk)):
+        jobs.append((seed * 1000003 + i, min(chunk, games - start), n_players, names, bets, rotate))
+
+    summary = Summary()
+    started = time.perf_counter()
+    procs = procs or os.cpu_count() or 1
+    if procs == 1:
+        for job in jobs:
+            summary.merge(run_chunk(job))
+    else:
+        import multiprocessing
+        with multiprocessing.get_context("spawn").Pool(procs) as pool:
+            for raw in pool.imap_unordered(run_chunk, jobs):
+                summary.merge(raw)
+    elapsed = time.perf_counter() - started
+
+    result = summary.report()
+    result["config"] = {"players": n_players, "policies": names, "bet": bet, "rotate": rotate, "seed": seed}
+    result["procs"] = procs
+    result["elapsed_s"] = round(elapsed, 2)
+    result["games_per_s"] = round(summary.games / elapsed, 1) if elapsed else 0.0
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="헤드리스 게임 시뮬레이터 (처리량 + 경제 밸런스 통계)")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=4, choices=[2, 3, 4])
+    parser.add_argument("--policies", default="deductive",
+                        help=f"좌석 순서대로 정책 (쉼표 구분, 모자라면 반복): {', '.join(POLICIES)}")
+    parser.add_argument("--bet", type=int, default=10000)
+    parser.add_argument("--procs", type=int, default=0, help="프로세스 수 (0: CPU 수)")
+    parser.add_argument("--chunk", type=int, default=2000, help="프로세스에 한 번에 넘기는 게임 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-rotate", action="store_true", help="정책 좌석을 고정 (기본: 판마다 회전)")
+    parser.add_argument("--out", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    result = simulate(args.games, args.players, args.policies, args.bet, args.procs, args.chunk, args.seed,
+                      rotate=not args.no_rotate)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
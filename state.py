@@ -1,10 +1,16 @@
 # state.py
 from typing import List, Dict, Any
 from models import GameState
+from matchmaking import MatchQueue
+from sessions import SessionDirectory
 
 # 🔥 여러 방을 관리하는 딕셔너리
 rooms: Dict[str, GameState] = {}
 
 # 🔥 매칭 대기열 (sid와 이름을 저장)
-queue: List[Dict[str, Any]] = []
+# 🔥 [NEW] deque + uid/sid 인덱스 (입장/이탈/재접속 O(1))
+queue: MatchQueue = MatchQueue()
+
+# 🔥 [NEW] sid -> (room_id, Player), uid -> room_id 인덱스 (이 워커의 방만)
+sessions: SessionDirectory = SessionDirectory()
 
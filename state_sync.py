@@ -0,0 +1,104 @@
+# state_sync.py
+# 🔥 [NEW] state_update 델타 프로토콜
+#
+# 서버는 방마다 단조 증가하는 state_version을 두고, 델타를 지원하는 클라이언트에게는
+# 마지막으로 보낸 뷰와 비교해 바뀐 필드만 "state_delta"로 보냅니다.
+#
+#   state_update : 전체 스냅샷 (+ "version")          <- 입장/재접속/버전 불일치/델타 미지원
+#   state_delta  : {"version", "baseVersion", "set", "players"}
+#       set      : 바뀐 최상위 필드 (phase, currentTurn, drawnTile, piles, remainingTime ...)
+#       players  : {"<index>": {바뀐 필드..., "handInsert": [[idx, tile]...],
+#                               "tiles": [[idx, tile]...], "hand": [...]}}
+#
+# 클라이언트는 자신의 버전이 baseVersion과 같을 때만 델타를 적용하고 "state_ack"로 버전을 알립니다.
+# 다르면 request_game_state로 전체 스냅샷을 다시 받습니다.
+# Socket.IO 전송은 순서가 보장되므로, 델타는 해당 클라이언트에게 '마지막으로 보낸' 뷰를 기준으로 합니다.
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# 매 브로드캐스트마다 값이 달라지는 필드: 다른 변경이 있을 때만 함께 보냄
+VOLATILE_KEYS = ("remainingTime",)
+
+# ack 없이 이만큼 버전이 앞서가면 클라이언트가 따라오지 못한 것으로 보고 전체 스냅샷 전송
+MAX_UNACKED_VERSIONS = 32
+
+
+@dataclass
+class ClientSync:
+    """수신자(sid)별 동기화 상태"""
+    delta: bool = False                       # 클라이언트가 델타 모드를 요청했는지
+    sent_version: int = 0
+    sent_view: Optional[Dict[str, Any]] = None
+    acked_version: Optional[int] = None
+
+    def can_send_delta(self) -> bool:
+        return (self.delta
+                and self.sent_view is not None
+                and self.acked_version is not None
+                and self.sent_version - self.acked_version <= MAX_UNACKED_VERSIONS)
+
+    def reset(self):
+        """다음 브로드캐스트에서 전체 스냅샷을 보내도록 초기화"""
+        self.sent_view = None
+        self.acked_version = None
+
+
+def _diff_hand(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """삽입만 있었다면 handInsert + 바뀐 타일만, 그 외(순서 변경/삭제)는 hand 전체"""
+    if old == new:
+        return None
+    inserts = []
+    changed = []
+    j = 0
+    for i, tile in enumerate(new):
+        if j < len(old) and old[j]["id"] == tile["id"]:
+            if old[j] != tile:
+                changed.append([i, tile])
+            j += 1
+        else:
+            inserts.append([i, tile])
+    if j != len(old):
+        return {"hand": new}
+    out: Dict[str, Any] = {}
+    if inserts:
+        out["handInsert"] = inserts
+    if changed:
+        out["tiles"] = changed
+    return out
+
+
+def diff_view(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    두 state_update 뷰의 차이를 계산.
+    플레이어 구성이 달라졌거나 필드가 빠졌으면 None (델타로 삭제를 표현하지 않으므로 전체 스냅샷 필요),
+    바뀐 게 없으면 빈 dict. 타일은 바뀌면 통째로 보냄
+    """
+    old_players = old["players"]
+    new_players = new["players"]
+    if len(old_players) != len(new_players) or not old.keys() <= new.keys():
+        return None
+
+    changes: Dict[str, Any] = {}
+    top = {k: v for k, v in new.items()
+           if k != "players" and k not in VOLATILE_KEYS and old.get(k) != v}
+
+    players: Dict[str, Any] = {}
+    for idx, (op, np_) in enumerate(zip(old_players, new_players)):
+        if op["uid"] != np_["uid"]:
+            return None
+        if op is np_ or op == np_:
+            continue
+        if not op.keys() <= np_.keys():
+            return None
+        pd = {k: v for k, v in np_.items() if k != "hand" and op.get(k) != v}
+        hand = _diff_hand(op["hand"], np_["hand"])
+        if hand:
+            pd.update(hand)
+        if pd:
+            players[str(idx)] = pd
+    if players:
+        changes["players"] = players
+    if top or players:
+        top.update({k: new[k] for k in VOLATILE_KEYS if k in new})
+        changes["set"] = top
+    return changes
@@ -0,0 +1,323 @@
+# store.py
+# 🔥 [NEW] 워커 간 공유 저장소 (매칭 대기열 + 방 소유 디렉터리 + 워커 목록 + 워커 간 메시지)
+#
+# STORE_URL (없으면 SOCKETIO_MESSAGE_QUEUE) 로 선택합니다.
+#   local://        : 단일 프로세스 (기본값, 기존과 동일하게 state.queue 사용)
+#   redis://host/db : 여러 워커/노드가 Redis(또는 bench/standin_broker.py)를 공유
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from logs import get_logger
+from state import queue as local_queue
+
+log = get_logger("cluster")
+
+STORE_URL = os.environ.get("STORE_URL") or os.environ.get("SOCKETIO_MESSAGE_QUEUE") or "local://"
+STORE_PREFIX = os.environ.get("STORE_PREFIX", "davinci")
+
+_worker_id: Optional[str] = None
+_worker_pid: Optional[int] = None
+
+
+def worker_id() -> str:
+    """이 워커 프로세스의 ID (gunicorn fork 이후 pid 기준으로 결정)"""
+    global _worker_id, _worker_pid
+    if _worker_id is None or _worker_pid != os.getpid():
+        _worker_pid = os.getpid()
+        _worker_id = os.environ.get("WORKER_ID") or f"{socket.gethostname()}-{_worker_pid}"
+    return _worker_id
+
+
+class LocalStore:
+    """단일 프로세스용 저장소: 대기열은 state.queue (MatchQueue), 방 디렉터리는 dict"""
+    is_shared = False
+
+    def __init__(self):
+        self.queue = local_queue
+        self._room_owners: Dict[str, str] = {}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+
+    # --- 매칭 대기열 ---
+
+    def queue_upsert(self, entry: Dict[str, Any], update_keys: Iterable[str]) -> Optional[str]:
+        """uid가 이미 있으면 update_keys만 갱신하고 기존 sid 반환, 없으면 뒤에 추가하고 None"""
+        return self.queue.upsert(entry, update_keys)
+
+    def queue_remove_sid(self, sid: str) -> bool:
+        return self.queue.remove_sid(sid)
+
+    def queue_len(self) -> int:
+        return len(self.queue)
+
+    def queue_sids(self) -> List[str]:
+        return self.queue.sids()
+
+    def queue_pop_groups(self, n: int) -> List[List[Dict[str, Any]]]:
+        """n명 그룹을 만들 수 있는 만큼 모두 꺼냄 (대기 순서)"""
+        return self.queue.pop_groups(n)
+
+    def queue_push_front(self, entries: List[Dict[str, Any]]) -> None:
+        self.queue.push_front(entries)
+
+    # --- 방 디렉터리 ---
+
+    def claim_room(self, room_id: str, owner: str) -> bool:
+        if room_id in self._room_owners:
+            return False
+        self._room_owners[room_id] = owner
+        return True
+
+    def room_owner(self, room_id: str) -> Optional[str]:
+        return self._room_owners.get(room_id)
+
+    def release_room(self, room_id: str) -> None:
+        self._room_owners.pop(room_id, None)
+
+    def set_room_owner(self, room_id: str, owner: str) -> None:
+        self._room_owners[room_id] = owner
+
+    def save_room_snapshot(self, room_id: str, snapshot: Dict[str, Any]) -> None:
+        self._snapshots[room_id] = snapshot
+
+    def take_room_snapshot(self, room_id: str) -> Optional[Dict[str, Any]]:
+        return self._snapshots.pop(room_id, None)
+
+    # --- 워커 목록 (단일 프로세스에서는 자기 자신뿐) ---
+
+    def heartbeat(self, worker: str, ttl: float) -> None:
+        pass
+
+    def live_workers(self) -> List[str]:
+        return [worker_id()]
+
+    def remove_worker(self, worker: str) -> None:
+        pass
+
+    # --- 워커 간 메시지 (단일 프로세스에서는 보낼 곳이 없음) ---
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        pass
+
+    def subscribe(self, channels: List[str], callback: Callable[[Dict[str, Any]], None]) -> None:
+        pass
+
+
+class RedisStore:
+    """
+    Redis 공유 저장소.
+    - 대기열: {prefix}:mm:queue (uid 리스트) + mm:entries (uid -> JSON) + mm:sids (sid -> uid)
+      변경은 짧은 분산 락(mm:lock, SET NX PX) 안에서만 수행.
+      MatchQueue와 달리 티켓 무효화를 하지 않으므로 이탈(queue_remove_sid)은 LREM = 대기 인원에 비례 (O(n))
+    - 방 디렉터리: {prefix}:rooms (room_id -> worker_id), HSETNX로 ID 충돌 방지
+    - 방 인계: {prefix}:handoff:{room_id} (GameState 스냅샷 JSON, 만료 있음)
+    - 워커 목록: {prefix}:workers (worker_id -> 하트비트 만료 시각)
+    - 워커 간 메시지: Pub/Sub
+    """
+    is_shared = True
+    LOCK_TTL_MS = 2000
+    SNAPSHOT_TTL_MS = 60000
+
+    def __init__(self, url: str):
+        import redis
+        self._redis_mod = redis
+        self.url = url
+        self.r = redis.Redis.from_url(url)
+        self.k_lock = f"{STORE_PREFIX}:mm:lock"
+        self.k_queue = f"{STORE_PREFIX}:mm:queue"
+        self.k_entries = f"{STORE_PREFIX}:mm:entries"
+        self.k_sids = f"{STORE_PREFIX}:mm:sids"
+        self.k_rooms = f"{STORE_PREFIX}:rooms"
+        self.k_workers = f"{STORE_PREFIX}:workers"
+
+    # --- 락 ---
+
+    def _lock(self):
+        token = uuid.uuid4().hex
+        delay = 0.001
+        while not self.r.set(self.k_lock, token, nx=True, px=self.LOCK_TTL_MS):
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        return token
+
+    def _unlock(self, token: str):
+        # 락이 만료되어 다른 워커가 잡았을 수 있으므로 내 토큰일 때만 해제
+        if self.r.get(self.k_lock) == token.encode():
+            self.r.delete(self.k_lock)
+
+    # --- 매칭 대기열 ---
+
+    def queue_upsert(self, entry: Dict[str, Any], update_keys: Iterable[str]) -> Optional[str]:
+        token = self._lock()
+        try:
+            raw = self.r.hget(self.k_entries, entry["uid"])
+            if raw is not None:
+                current = json.loads(raw)
+                old_sid = current["sid"]
+                for k in update_keys:
+                    current[k] = entry[k]
+                pipe = self.r.pipeline(transaction=False)
+                pipe.hdel(self.k_sids, old_sid)
+                pipe.hset(self.k_sids, current["sid"], current["uid"])
+                pipe.hset(self.k_entries, current["uid"], json.dumps(current))
+                pipe.execute()
+                return old_sid
+            pipe = self.r.pipeline(transaction=False)
+            pipe.hset(self.k_entries, entry["uid"], json.dumps(entry))
+            pipe.hset(self.k_sids, entry["sid"], entry["uid"])
+            pipe.rpush(self.k_queue, entry["uid"])
+            pipe.execute()
+            return None
+        finally:
+            self._unlock(token)
+
+    def queue_remove_sid(self, sid: str) -> bool:
+        """대기열에서 제거. LREM으로 리스트를 훑으므로 O(n) (O(1) 이탈은 LocalStore/MatchQueue만)"""
+        if not self.r.hexists(self.k_sids, sid):
+            return False
+        token = self._lock()
+        try:
+            uid = self.r.hget(self.k_sids, sid)
+            if uid is None:
+                return False
+            pipe = self.r.pipeline(transaction=False)
+            pipe.lrem(self.k_queue, 0, uid)
+            pipe.hdel(self.k_entries, uid)
+            pipe.hdel(self.k_sids, sid)
+            pipe.execute()
+            return True
+        finally:
+            self._unlock(token)
+
+    def queue_len(self) -> int:
+        return self.r.llen(self.k_queue)
+
+    def queue_sids(self) -> List[str]:
+        return [s.decode() for s in self.r.hkeys(self.k_sids)]
+
+    def queue_pop_groups(self, n: int) -> List[List[Dict[str, Any]]]:
+        """n명 그룹을 만들 수 있는 만큼 모두 꺼냄 (락 1회 + 명령 몇 번)"""
+        if self.r.llen(self.k_queue) < n:
+            return []
+        token = self._lock()
+        try:
+            want = (self.r.llen(self.k_queue) // n) * n
+            if not want:
+                return []
+            uids = self.r.lrange(self.k_queue, 0, want - 1)
+            raws = self.r.hmget(self.k_entries, uids)
+            picked = [json.loads(raw) for raw in raws if raw is not None]
+            pipe = self.r.pipeline(transaction=False)
+            pipe.ltrim(self.k_queue, len(uids), -1)
+            pipe.hdel(self.k_entries, *uids)
+            if picked:
+                pipe.hdel(self.k_sids, *[e["sid"] for e in picked])
+            pipe.execute()
+            usable = (len(picked) // n) * n
+            if usable < len(picked):
+                # 항목이 사라진 uid가 섞여 있었음 -> 남는 인원은 앞으로 되돌리고 다음 기회에 매칭
+                self._push_front(picked[usable:])
+            return [picked[i:i + n] for i in range(0, usable, n)]
+        finally:
+            self._unlock(token)
+
+    def queue_push_front(self, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        token = self._lock()
+        try:
+            self._push_front(entries)
+        finally:
+            self._unlock(token)
+
+    def _push_front(self, entries: List[Dict[str, Any]]) -> None:
+        pipe = self.r.pipeline(transaction=False)
+        for e in entries:
+            pipe.hset(self.k_entries, e["uid"], json.dumps(e))
+            pipe.hset(self.k_sids, e["sid"], e["uid"])
+        pipe.lpush(self.k_queue, *[e["uid"] for e in reversed(entries)])
+        pipe.execute()
+
+    # --- 방 디렉터리 ---
+
+    def claim_room(self, room_id: str, owner: str) -> bool:
+        return bool(self.r.hsetnx(self.k_rooms, room_id, owner))
+
+    def room_owner(self, room_id: str) -> Optional[str]:
+        owner = self.r.hget(self.k_rooms, room_id)
+        return owner.decode() if owner is not None else None
+
+    def release_room(self, room_id: str) -> None:
+        self.r.hdel(self.k_rooms, room_id)
+
+    def set_room_owner(self, room_id: str, owner: str) -> None:
+        self.r.hset(self.k_rooms, room_id, owner)
+
+    def save_room_snapshot(self, room_id: str, snapshot: Dict[str, Any]) -> None:
+        self.r.set(f"{STORE_PREFIX}:handoff:{room_id}", json.dumps(snapshot), px=self.SNAPSHOT_TTL_MS)
+
+    def take_room_snapshot(self, room_id: str) -> Optional[Dict[str, Any]]:
+        key = f"{STORE_PREFIX}:handoff:{room_id}"
+        # 스냅샷은 새 소유 워커만 가져가므로 GET + DEL 파이프라인으로 충분
+        pipe = self.r.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.delete(key)
+        raw, _ = pipe.execute()
+        return json.loads(raw) if raw is not None else None
+
+    # --- 워커 목록 ---
+
+    def heartbeat(self, worker: str, ttl: float) -> None:
+        self.r.hset(self.k_workers, worker, time.time() + ttl)
+
+    def live_workers(self) -> List[str]:
+        """하트비트가 살아 있는 워커 목록 (만료된 항목은 정리)"""
+        now = time.time()
+        live, dead = [], []
+        for worker, expires in self.r.hgetall(self.k_workers).items():
+            (live if float(expires) > now else dead).append(worker.decode())
+        if dead:
+            self.r.hdel(self.k_workers, *dead)
+        return live
+
+    def remove_worker(self, worker: str) -> None:
+        self.r.hdel(self.k_workers, worker)
+
+    # --- 워커 간 메시지 ---
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self.r.publish(f"{STORE_PREFIX}:{channel}", json.dumps(message))
+
+    def subscribe(self, channels: List[str], callback: Callable[[Dict[str, Any]], None]) -> None:
+        """백그라운드 태스크에서 채널을 구독하고 메시지마다 callback 호출 (연결이 끊기면 재시도)"""
+        from extensions import socketio
+
+        def _listen():
+            while True:
+                try:
+                    pubsub = self.r.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(*[f"{STORE_PREFIX}:{c}" for c in channels])
+                    for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        try:
+                            callback(json.loads(message["data"]))
+                        except Exception as e:
+                            log.exception("❌ Store message handler error: %s", e)
+                except self._redis_mod.RedisError as e:
+                    log.warning("⚠️ Store subscription lost (%s), reconnecting...", e)
+                    socketio.sleep(1)
+
+        socketio.start_background_task(_listen)
+
+
+def create_store(url: str = STORE_URL):
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStore(url)
+    return LocalStore()
+
+
+store = create_store()
@@ -0,0 +1,85 @@
+"""
+테스트 공용 픽스처: 서버(main.app)를 한 번 띄우고 socketio.test_client로 방/게임을 만듭니다.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+
+def wait_for(condition, timeout: float = 3.0):
+    """방 액터/타이머가 처리할 시간을 주면서 condition()이 참이 될 때까지 대기"""
+    from extensions import socketio
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        socketio.sleep(0.02)
+    return condition()
+
+
+@pytest.fixture(scope="session")
+def app():
+    import main
+    return main.app
+
+
+@pytest.fixture
+def make_client(app):
+    from extensions import socketio
+
+    clients = []
+
+    def make():
+        client = socketio.test_client(app)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        if client.is_connected():
+            client.disconnect()
+
+
+@pytest.fixture
+def make_room(make_client):
+    """uids 순서로 커스텀 방에 입장 (첫 번째가 방장). (room_id, clients) 반환"""
+    from state import rooms
+
+    def make(uids):
+        clients = [make_client() for _ in uids]
+        clients[0].emit("create_room", {"uid": uids[0], "name": uids[0]})
+        created = [e for e in clients[0].get_received() if e["name"] == "room_created"]
+        room_id = created[0]["args"][0]["roomId"]
+        for uid, client in zip(uids[1:], clients[1:]):
+            client.emit("enter_room", {"roomId": room_id, "uid": uid, "name": uid})
+        assert wait_for(lambda: len(rooms[room_id].players) == len(uids))
+        return room_id, clients
+
+    return make
+
+
+@pytest.fixture
+def make_game(make_room, monkeypatch):
+    """방을 만들고 게임 시작 -> 첫 턴(DRAWING)까지 대기. (room_id, clients, gs) 반환"""
+    import game_events
+    from state import rooms
+
+    monkeypatch.setattr(game_events, "GAME_START_DELAY", 0.0)
+
+    def make(uids):
+        room_id, clients = make_room(uids)
+        clients[0].emit("start_game", {"roomId": room_id})
+        gs = rooms[room_id]
+        assert wait_for(lambda: gs.turn_phase == "DRAWING")
+        for client in clients:
+            client.get_received()
+        return room_id, clients, gs
+
+    return make
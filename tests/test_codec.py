@@ -0,0 +1,102 @@
+"""
+Socket.IO 패킷 코덱(codec) 테스트: JSON/msgpack 왕복, 설치 시 버전 확인
+
+    python -m pytest -q tests
+"""
+import msgpack
+import pytest
+from engineio import packet as eio_packet
+from socketio import packet
+
+import codec
+from conftest import wait_for
+
+
+def test_json_and_msgpack_round_trip():
+    pkt = codec.CodecPacket(packet.EVENT, data=["state_update", {"players": [], "version": 3}], namespace="/")
+    encoded = pkt.encode()
+    assert isinstance(encoded, str)
+
+    back = codec.CodecPacket(encoded_packet=str(encoded))
+    assert back.data == pkt.data
+
+    frame = encoded.binary_frame()
+    assert frame is encoded.binary_frame()  # 한 번만 인코딩
+    back = codec.CodecPacket(encoded_packet=frame.data)
+    assert (back.packet_type, back.data, back.namespace) == (packet.EVENT, pkt.data, "/")
+
+
+def test_binary_event_is_inlined_for_msgpack():
+    pkt = codec.CodecPacket(packet.EVENT, data=["blob", b"\x00\x01"], namespace="/")
+    encoded = pkt.encode()
+    assert isinstance(encoded, list) and isinstance(encoded[1], codec._Attachment)
+    assert codec._frame_for_msgpack(eio_packet.Packet(eio_packet.MESSAGE, encoded[1])) is None
+    decoded = msgpack.unpackb(encoded[0].binary_frame().data)
+    assert decoded["type"] == packet.EVENT
+    assert decoded["data"] == ["blob", b"\x00\x01"]
+
+
+def test_install_rejects_untested_versions(monkeypatch):
+    from extensions import socketio
+
+    monkeypatch.setattr(codec, "_installed_version", lambda dist: "6.0.0")
+    with pytest.raises(RuntimeError, match="python-socketio"):
+        codec.install(socketio.server)
+
+
+def test_install_accepts_pinned_versions(app):
+    from extensions import socketio
+
+    codec.check_versions(socketio.server)
+
+
+def test_socketio_round_trip_per_connection(app, make_client, monkeypatch):
+    """JSON 클라이언트는 그대로, msgpack 프레임으로 말한 연결에는 msgpack 프레임으로 응답"""
+    from extensions import socketio
+
+    server = socketio.server
+    json_client = make_client()
+    mp_client = make_client()
+
+    # test_client가 심어 둔 전송 함수를 감싼 뒤 그 위에 코덱 설치 (실제 서버와 같은 순서)
+    json_frames, mp_frames = [], []
+    send_eio_packet = server._send_eio_packet
+
+    def capture_eio_packet(eio_sid, eio_pkt):
+        if eio_sid == mp_client.eio_sid:
+            mp_frames.append(eio_pkt.data)
+        else:
+            json_frames.append(eio_pkt.data)
+            send_eio_packet(eio_sid, eio_pkt)
+
+    monkeypatch.setattr(server, "_send_eio_packet", capture_eio_packet)
+    monkeypatch.setattr(server, "_send_packet", server._send_packet)
+    monkeypatch.setattr(server.eio, "handlers", dict(server.eio.handlers))
+    monkeypatch.setattr(server.eio, "send_packet", lambda eio_sid, pkt: mp_frames.append(pkt.data))
+    codec.install(server)
+
+    # msgpack 클라이언트: 바이너리 프레임으로 이벤트 전송
+    request = codec.encode_msgpack(packet.Packet(packet.EVENT, data=["create_room", {"uid": "mp1", "name": "mp1"}]))
+    server.eio.handlers["message"](mp_client.eio_sid, request)
+    assert mp_client.eio_sid in codec._msgpack_sids
+
+    assert wait_for(lambda: mp_frames)
+    decoded = [msgpack.unpackb(frame) for frame in mp_frames]
+    assert all(isinstance(frame, bytes) for frame in mp_frames)
+    created = [d for d in decoded if d["data"][0] == "room_created"]
+    room_id = created[0]["data"][1]["roomId"]
+    assert created[0]["nsp"] == "/"
+
+    # JSON 클라이언트는 같은 방 브로드캐스트를 JSON 텍스트로 받음
+    mp_frames.clear()
+    json_client.emit("enter_room", {"roomId": room_id, "uid": "js1", "name": "js1"})
+    received = []
+    assert wait_for(lambda: received.extend(e for e in json_client.get_received() if e["name"] == "room_state")
+                    or received)
+    assert [p["uid"] for p in received[-1]["args"][0]["players"]] == ["mp1", "js1"]
+    assert json_frames and all(isinstance(f, str) for f in json_frames)
+    states = [msgpack.unpackb(f) for f in mp_frames]
+    assert [d["data"][1]["players"][1]["uid"] for d in states if d["data"][0] == "room_state"] == ["js1"]
+
+    server.eio.handlers["disconnect"](mp_client.eio_sid, "client disconnect")
+    assert mp_client.eio_sid not in codec._msgpack_sids
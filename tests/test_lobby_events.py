@@ -0,0 +1,40 @@
+"""
+로비/방 이벤트(lobby_events) 테스트: 게임 중 퇴장, 두 번째 방 입장
+
+    python -m pytest -q tests
+"""
+from conftest import wait_for
+
+
+def test_turn_player_leaving_mid_game_advances_turn(make_game):
+    room_id, clients, gs = make_game(["t1", "t2", "t3"])
+    leaver = gs.players[gs.current_turn]
+    seq = gs.phase_seq
+
+    clients[0].emit("leave_room", {"roomId": room_id, "uid": leaver.uid})
+
+    assert wait_for(lambda: gs.phase_seq > seq)
+    assert leaver.uid not in [p.uid for p in gs.players]
+    assert len(gs.players) == 2
+    assert gs.turn_phase == "DRAWING"
+    assert gs.players[gs.current_turn].uid != leaver.uid
+    assert gs.turn_timer is not None
+
+
+def test_player_still_found_after_entering_a_second_room(make_game, make_room):
+    from state import sessions
+    from utils import find_player_by_sid
+
+    room_id, clients, gs = make_game(["g1", "g2"])
+    other_id, _ = make_room(["h1"])
+    player = gs.players[gs.current_turn]
+    client = clients[gs.current_turn]
+
+    # 같은 연결로 두 번째 방에 입장 -> 세션 디렉터리는 그 방을 가리킴
+    client.emit("enter_room", {"roomId": other_id, "uid": player.uid, "name": player.name})
+    assert wait_for(lambda: sessions.lookup_sid(player.sid)[0] == other_id)
+    assert find_player_by_sid(gs, player.sid) is player
+
+    # 원래 방의 게임 이벤트도 그대로 처리됨
+    client.emit("draw_tile", {"roomId": room_id, "color": "black"})
+    assert wait_for(lambda: gs.drawn_tile is not None or gs.turn_phase != "DRAWING")
@@ -0,0 +1,55 @@
+"""
+구조화 로깅(logs) 테스트: 큐에 넣을 때 메시지가 완성되는지, 걸러진 레코드는 포맷하지 않는지
+
+    python -m pytest -q tests
+"""
+import logging
+import queue
+
+from logs import SamplingFilter, _DeferredQueueHandler
+
+
+class CountingArg:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "arg"
+
+
+def make_logger(name, rates=None):
+    handler = _DeferredQueueHandler(queue.Queue())
+    handler.addFilter(SamplingFilter(rates or {}))
+    logger = logging.getLogger(f"test.{name}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger, handler.queue
+
+
+def test_args_are_snapshotted_when_enqueued():
+    logger, records = make_logger("snapshot")
+    results = [{"uid": "u1", "rank": 1}]
+
+    logger.info("정산 결과 (%s): %s", "room1", results)
+    results.append({"uid": "u2", "rank": 2})  # 방 액터가 이어서 바꿈
+    results[0]["rank"] = 9
+
+    record = records.get_nowait()
+    assert record.getMessage() == "정산 결과 (room1): [{'uid': 'u1', 'rank': 1}]"
+    assert record.args is None
+
+
+def test_filtered_records_are_not_formatted():
+    logger, records = make_logger("sampled", {"sampled": 0.0})
+    arg = CountingArg()
+
+    logger.debug("debug %s", arg)  # 레벨에서 걸러짐
+    logger.info("sampled out %s", arg)  # 샘플링에서 걸러짐
+    assert arg.formatted == 0
+    assert records.empty()
+
+    logger.warning("kept %s", arg)
+    assert arg.formatted == 1
+    assert records.get_nowait().getMessage() == "kept arg"
@@ -0,0 +1,84 @@
+"""
+매칭 대기열(matchmaking.MatchQueue) 테스트: 순서, 롤백, 이탈/재입장
+
+    python -m pytest -q tests
+"""
+from matchmaking import MatchQueue
+
+
+def entry(uid, sid=None, bet=1000):
+    return {"uid": uid, "sid": sid or f"sid-{uid}", "betAmount": bet}
+
+
+def uids(groups):
+    return [[e["uid"] for e in group] for group in groups]
+
+
+def make_queue(*names):
+    q = MatchQueue()
+    for name in names:
+        assert q.upsert(entry(name), ("sid",)) is None
+    return q
+
+
+def test_pop_groups_in_arrival_order():
+    q = make_queue("a", "b", "c", "d", "e", "f", "g")
+    assert uids(q.pop_groups(3)) == [["a", "b", "c"], ["d", "e", "f"]]
+    assert [e["uid"] for e in q] == ["g"]
+    assert q.sids() == ["sid-g"]
+    assert q.pop_groups(3) == []
+    assert len(q) == 1
+
+
+def test_push_front_requeues_group_ahead_of_waiting_players():
+    q = make_queue("a", "b", "c", "d", "e")
+    [group] = q.pop_groups(4)
+    q.push_front(group)  # 매칭 롤백 (방 생성 실패 등)
+    assert len(q) == 5
+    assert [e["uid"] for e in q] == ["a", "b", "c", "d", "e"]
+    assert uids(q.pop_groups(2)) == [["a", "b"], ["c", "d"]]
+    assert q.remove_sid("sid-a") is False
+    assert q.remove_sid("sid-e") is True
+
+
+def test_stale_ticket_is_skipped_after_leave_and_rejoin():
+    q = make_queue("a", "b", "c")
+    assert q.remove_sid("sid-a")
+    assert q.upsert(entry("a", sid="sid-a2"), ("sid",)) is None  # 다시 들어오면 맨 뒤
+    assert q.upsert(entry("d"), ("sid",)) is None
+
+    assert [e["uid"] for e in q] == ["b", "c", "a", "d"]
+    assert uids(q.pop_groups(2)) == [["b", "c"], ["a", "d"]]  # 맨 앞의 옛 자리는 건너뜀
+    assert len(q) == 0
+    assert q.sids() == []
+
+
+def test_upsert_existing_uid_keeps_place_and_moves_sid():
+    q = make_queue("a", "b")
+    assert q.upsert(entry("a", sid="sid-a2", bet=5000), ("sid",)) == "sid-a"
+    assert q.get("a")["sid"] == "sid-a2"
+    assert q.get("a")["betAmount"] == 1000  # update_keys에 없는 값은 그대로
+    assert q.remove_sid("sid-a") is False   # 옛 sid로는 지워지지 않음
+    assert [e["uid"] for e in q] == ["a", "b"]
+    assert q.remove_sid("sid-a2") is True
+    assert [e["uid"] for e in q] == ["b"]
+
+
+def test_remove_sid_not_in_queue():
+    q = make_queue("a", "b")
+    assert q.remove_sid("nobody") is False
+    assert q.remove_uid("nobody") is False
+    assert len(q) == 2
+    assert uids(q.pop_groups(2)) == [["a", "b"]]
+
+
+def test_compaction_keeps_order():
+    q = MatchQueue()
+    q.COMPACT_MIN = 2
+    for i in range(10):
+        q.upsert(entry(f"u{i}"), ("sid",))
+    for i in (0, 2, 4, 6, 8, 1):
+        assert q.remove_sid(f"sid-u{i}")
+    assert len(q._order) == 4  # 무효 자리가 남은 인원보다 많아져 정리됨
+    assert [e["uid"] for e in q] == ["u3", "u5", "u7", "u9"]
+    assert uids(q.pop_groups(4)) == [["u3", "u5", "u7", "u9"]]
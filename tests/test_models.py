@@ -0,0 +1,211 @@
+"""
+타일 코드/정렬 키(models.Tile, game_logic.compare_tiles/auto_insert_index)와
+GameState의 증분 카운터(alive/unranked/unrevealed) 테스트
+
+    python -m pytest -q tests
+"""
+import itertools
+import random
+
+import pytest
+
+from conftest import wait_for
+from game_logic import (
+    add_tile, auto_insert_index, compare_tiles, deal_initial_hands, prepare_tiles, rank_newly_eliminated,
+    remove_player, reveal_hand, reveal_tile, set_rank, sort_hand,
+)
+from models import GameState, Player, Tile
+
+ORDERS = ("black-first", "white-first")
+
+
+def all_tiles(revealed=False):
+    tiles = []
+    for color in ("black", "white"):
+        for value in range(12):
+            tiles.append(Tile(len(tiles), color, value, False, revealed))
+        tiles.append(Tile(len(tiles), color, None, True, revealed))
+    return tiles
+
+
+# --- 기존 구현 (코드/키 도입 전) ---
+
+def baseline_compare(a, b, same_number_order="black-first"):
+    if a.is_joker and b.is_joker:
+        return 0
+    if a.is_joker:
+        return 1
+    if b.is_joker:
+        return -1
+    if a.value != b.value:
+        return (a.value or 0) - (b.value or 0)
+    if same_number_order == "black-first":
+        return -1 if a.color == "black" else 1
+    return -1 if a.color == "white" else 1
+
+
+def baseline_insert_index(same_number_order, hand, tile):
+    if tile.is_joker:
+        return len(hand)
+    numeric_idx = [i for i, t in enumerate(hand) if not t.is_joker]
+    k = 0
+    while k < len(numeric_idx):
+        if baseline_compare(tile, hand[numeric_idx[k]], same_number_order) < 0:
+            break
+        k += 1
+    if not numeric_idx:
+        return 0
+    if k == len(numeric_idx):
+        return numeric_idx[-1] + 1
+    return numeric_idx[k]
+
+
+def sign(x):
+    return (x > 0) - (x < 0)
+
+
+def make_state(n=0, order="black-first"):
+    gs = GameState(players=[], piles={"black": [], "white": []}, same_number_order=order,
+                   current_turn=0, drawn_tile=None, pending_placement=False, can_place_anywhere=False,
+                   next_tile_id=0)
+    for i in range(n):
+        gs.players.append(Player(sid=f"sid{i}", uid=f"u{i}", id=i, name=f"p{i}"))
+    return gs
+
+
+# --- Tile ---
+
+@pytest.mark.parametrize("revealed", [False, True])
+def test_packed_round_trip(revealed):
+    for tile in all_tiles(revealed):
+        packed = tile.packed()
+        assert 0 <= packed < 128
+        back = Tile.from_packed(tile.id, packed)
+        assert back == tile
+        assert (back.color, back.value, back.is_joker, back.revealed) == \
+            (tile.color, tile.value, tile.is_joker, tile.revealed)
+        assert Tile.from_dict(tile.to_dict()) == tile
+
+
+def test_codes_are_unique_and_revealing_changes_only_packed():
+    tiles = all_tiles()
+    assert len({t.code for t in tiles}) == len(tiles)
+    t = tiles[5]
+    code, key, packed = t.code, t.key, t.packed()
+    t.revealed = True
+    assert (t.code, t.key) == (code, key)
+    assert t.packed() != packed
+
+
+@pytest.mark.parametrize("order", ORDERS)
+def test_compare_tiles_matches_baseline(order):
+    for a, b in itertools.product(all_tiles(), repeat=2):
+        if a is b:
+            continue
+        assert sign(compare_tiles(a, b, order)) == sign(baseline_compare(a, b, order)), (a, b)
+
+
+def test_sort_hand_matches_baseline():
+    rng = random.Random(7)
+    tiles = all_tiles()
+    for _ in range(200):
+        hand = rng.sample(tiles, rng.randint(0, 13))
+        expected = sorted(hand, key=lambda t: (t.value if not t.is_joker else 999, 0 if t.color == "black" else 1))
+        sort_hand(make_state(), hand)
+        assert hand == expected
+
+
+@pytest.mark.parametrize("order", ORDERS)
+def test_auto_insert_index_matches_baseline(order):
+    rng = random.Random(11)
+    gs = make_state(order=order)
+    tiles = all_tiles()
+    flip = order != "black-first"
+    for _ in range(500):
+        picked = rng.sample(tiles, rng.randint(0, 14))
+        tile, rest = picked[0] if picked else tiles[0], picked[1:]
+        numbers = sorted((t for t in rest if not t.is_joker), key=lambda t: t.key ^ flip)
+        hand = list(numbers)
+        for joker in (t for t in rest if t.is_joker):  # 조커는 아무 자리에나
+            hand.insert(rng.randint(0, len(hand)), joker)
+        assert auto_insert_index(gs, hand, tile) == baseline_insert_index(order, hand, tile), (hand, tile)
+
+
+# --- 증분 카운터 ---
+
+def assert_counters_match_recount(gs):
+    unrevealed = {p.uid: p.unrevealed for p in gs.players}
+    alive, unranked = set(gs.alive), set(gs.unranked)
+    gs.recount()
+    assert {p.uid: p.unrevealed for p in gs.players} == unrevealed
+    assert gs.alive == alive
+    assert gs.unranked == unranked
+
+
+def test_counters_follow_elimination_add_and_leave():
+    random.seed(3)
+    gs = make_state(4)
+    prepare_tiles(gs)
+    deal_initial_hands(gs)
+    assert_counters_match_recount(gs)
+    assert len(gs.alive) == len(gs.unranked) == 4
+
+    # u1의 카드를 모두 공개 -> 탈락 -> 순위
+    victim = gs.players[1]
+    for t in list(victim.hand):
+        reveal_tile(gs, victim, t)
+        assert_counters_match_recount(gs)
+    assert not reveal_tile(gs, victim, victim.hand[0])  # 이미 공개
+    assert [p.uid for p in rank_newly_eliminated(gs)] == ["u1"]
+    assert victim.final_rank == 4
+    assert_counters_match_recount(gs)
+
+    # 새 타일 추가 (공개/비공개)
+    drawn = gs.piles["black"].pop()
+    add_tile(gs, gs.players[0], auto_insert_index(gs, gs.players[0].hand, drawn), drawn)
+    revealed = gs.piles["white"].pop()
+    revealed.revealed = True
+    add_tile(gs, gs.players[2], 0, revealed)
+    assert_counters_match_recount(gs)
+
+    # 게임 중 퇴장
+    remove_player(gs, gs.players[3])
+    assert_counters_match_recount(gs)
+    assert gs.unranked == {"u0", "u2"}
+
+    # 재접속 패배 처리 (lobby_events.enter_room과 같은 순서)
+    player = gs.players[2]
+    reveal_hand(gs, player)
+    set_rank(gs, player, len(gs.alive))
+    assert_counters_match_recount(gs)
+    assert gs.alive == gs.unranked == {"u0"}
+
+
+def test_counters_survive_serialization():
+    random.seed(5)
+    gs = make_state(3)
+    prepare_tiles(gs)
+    deal_initial_hands(gs)
+    reveal_hand(gs, gs.players[0])
+    rank_newly_eliminated(gs)
+    copy = GameState.from_dict(gs.to_dict())
+    assert copy.alive == gs.alive and copy.unranked == gs.unranked
+    assert [p.unrevealed for p in copy.players] == [p.unrevealed for p in gs.players]
+
+
+def test_counters_after_reconnect_and_leave_in_game(make_game, make_client):
+    from state import rooms
+
+    room_id, clients, gs = make_game(["c1", "c2", "c3", "c4"])
+
+    # 턴이 아닌 플레이어가 새 연결로 재접속 -> 즉시 패배
+    make_client().emit("enter_room", {"roomId": room_id, "uid": "c3", "name": "c3"})
+    assert wait_for(lambda: gs.players[2].final_rank != 0)
+    assert gs.players[2].final_rank == 3  # 기존 규칙: 카드 공개 후 남은 생존자 수
+    assert_counters_match_recount(gs)
+
+    clients[3].emit("leave_room", {"roomId": room_id, "uid": "c4"})
+    assert wait_for(lambda: len(gs.players) == 3)
+    assert room_id in rooms
+    assert_counters_match_recount(gs)
+    assert gs.unranked == {"c1", "c2"}
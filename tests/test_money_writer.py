@@ -0,0 +1,179 @@
+"""
+정산 금액 writer(money_writer) + Firestore 배치 커밋(userdb.FirestoreUserDB.apply_increments) 회귀 테스트
+
+가짜 Firestore 클라이언트로 청크 커밋/개별 업데이트 실패를 주입해,
+재시도가 이미 반영된 증감을 다시 더하지 않는지 확인합니다.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.api_core import exceptions as gexc  # noqa: E402
+
+from money_writer import MoneyWriter  # noqa: E402
+from userdb import FirestoreUserDB, PartialCommit  # noqa: E402
+
+
+class FakeDoc:
+    def __init__(self, db, uid):
+        self.db = db
+        self.uid = uid
+
+    def update(self, fields):
+        self.db.doc_updates += 1
+        error = self.db.doc_failures.pop(self.db.doc_updates, None)
+        if error is not None:
+            raise error
+        if self.uid not in self.db.money:
+            raise gexc.NotFound(self.uid)
+        self.db.money[self.uid] += fields["money"].value
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+        self.ops = []
+
+    def update(self, ref, fields):
+        self.ops.append((ref.uid, fields["money"].value))
+
+    def commit(self):
+        self.db.batch_commits += 1
+        error = self.db.batch_failures.pop(self.db.batch_commits, None)
+        if error is not None:
+            raise error
+        if any(uid not in self.db.money for uid, _ in self.ops):
+            raise gexc.NotFound("missing document")
+        for uid, amount in self.ops:
+            self.db.money[uid] += amount
+
+
+class FakeFirestore:
+    """users 컬렉션의 money만 흉내. *_failures: n번째 호출(1부터)에서 던질 예외"""
+
+    def __init__(self, uids):
+        self.money = {uid: 0 for uid in uids}
+        self.batch_commits = 0
+        self.batch_failures = {}
+        self.doc_updates = 0
+        self.doc_failures = {}
+
+    def collection(self, name):
+        return self
+
+    def document(self, uid):
+        return FakeDoc(self, uid)
+
+    def batch(self):
+        return FakeBatch(self)
+
+
+def make_userdb(fake):
+    userdb = FirestoreUserDB()
+    userdb._db = lambda use_async=False: fake
+    return userdb
+
+
+def make_writer(userdb):
+    return MoneyWriter(commit=userdb.apply_increments, base_backoff=0, max_retries=3)
+
+
+def test_partial_chunk_failure_retries_only_uncommitted():
+    uids = [f"u{i}" for i in range(600)]
+    fake = FakeFirestore(uids)
+    fake.batch_failures[2] = gexc.DeadlineExceeded("chunk 2")  # 두 번째 청크(100명)만 한 번 실패
+
+    writer = make_writer(make_userdb(fake))
+    assert writer._commit_with_retry({uid: 100 for uid in uids})
+
+    assert set(fake.money.values()) == {100}
+    assert writer.stats()["ops"] == 600
+
+
+def test_not_found_fallback_failure_is_not_applied_twice():
+    uids = [f"u{i}" for i in range(10)]
+    fake = FakeFirestore(uids[1:])  # u0 문서 없음 -> 배치 실패 -> 개별 업데이트
+    fake.doc_failures[5] = gexc.ServiceUnavailable("doc 5")  # 개별 업데이트 도중 한 번 실패
+
+    writer = make_writer(make_userdb(fake))
+    assert writer._commit_with_retry({uid: 100 for uid in uids})
+
+    assert "u0" not in fake.money
+    assert set(fake.money.values()) == {100}
+
+
+def test_exhausted_retries_leave_only_uncommitted_deltas():
+    uids = [f"u{i}" for i in range(600)]
+    fake = FakeFirestore(uids)
+    for n in range(2, 10):
+        fake.batch_failures[n] = gexc.DeadlineExceeded("down")
+
+    writer = make_writer(make_userdb(fake))
+    deltas = {uid: 100 for uid in uids}
+    assert not writer._commit_with_retry(deltas)
+
+    # 첫 청크(500명)만 반영, 이월되는 deltas에는 나머지 100명만
+    assert sorted(deltas) == sorted(uids[500:])
+    assert sum(fake.money.values()) == 500 * 100
+
+
+def test_partial_commit_reports_done_uids():
+    uids = [f"u{i}" for i in range(600)]
+    fake = FakeFirestore(uids)
+    fake.batch_failures[2] = gexc.DeadlineExceeded("chunk 2")
+
+    try:
+        make_userdb(fake).apply_increments({uid: 1 for uid in uids})
+    except PartialCommit as e:
+        assert e.done == uids[:500]
+        assert isinstance(e.cause, gexc.DeadlineExceeded)
+    else:
+        raise AssertionError("PartialCommit not raised")
+
+
+def test_on_settled_waits_for_later_submissions():
+    fake = FakeFirestore(["a", "b"])
+    settled = []
+    writer = MoneyWriter(commit=make_userdb(fake).apply_increments, base_backoff=0, on_settled=settled.extend)
+
+    writer._submitted.update(a=2, b=1)  # a의 두 번째 요청은 아직 큐에 있다고 가정
+    writer._merged.update(a=1, b=1)
+    assert writer._commit_with_retry({"a": 100, "b": 100})
+    assert settled == ["b"]
+
+    writer._merged["a"] = 2
+    assert writer._commit_with_retry({"a": 50})
+    assert settled == ["b", "a"]
+
+
+def test_zero_sum_deltas_settle_without_a_write():
+    fake = FakeFirestore(["a"])
+    settled = []
+    writer = MoneyWriter(commit=make_userdb(fake).apply_increments, window=0.2, on_settled=settled.extend)
+
+    writer.submit("a", 100)
+    writer.submit("a", -100)
+    assert writer.flush(5)
+    assert settled == ["a"]
+    assert writer.pending(["a"]) == {}
+    assert fake.batch_commits == 0
+    writer.close()
+
+
+def test_closed_writer_keeps_deltas_it_cannot_write():
+    fake = FakeFirestore(["a", "b"])
+    writer = MoneyWriter(commit=make_userdb(fake).apply_increments, base_backoff=0, max_retries=1, window=0.01)
+    for n in range(1, 10):
+        fake.batch_failures[n] = gexc.ServiceUnavailable("down")
+    writer.submit("a", 100)
+
+    assert writer.close(5) == {"a": 100}  # 종료 직전 커밋 실패 -> 반환
+
+    writer.submit("b", -50)  # 닫힌 뒤 직접 쓰기도 실패
+    assert writer.unflushed() == {"a": 100, "b": -50}
+    assert writer.pending(["a", "b"]) == {"a": 100, "b": -50}
+    assert writer.close() == {"a": 100, "b": -50}
+    assert set(fake.money.values()) == {0}
@@ -0,0 +1,102 @@
+"""
+서버 측 프로필 캐시(profiles.ProfileCache) 테스트: 정산이 커밋되기 전에는 조회 결과를 캐시하지 않는지
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profiles import ProfileCache  # noqa: E402
+
+
+class FakeStore:
+    def __init__(self):
+        self.money = {"u1": 1000}
+        self.fetches = 0
+
+    def fetch(self, uids):
+        self.fetches += 1
+        return {uid: {"nickname": uid, "money": self.money[uid]} for uid in uids if uid in self.money}
+
+
+def test_pending_delta_is_added_but_not_cached_until_settled():
+    db = FakeStore()
+    notified = []
+    pending = {}
+    cache = ProfileCache(db.fetch, on_settled=notified.extend,
+                         pending=lambda uids: {uid: pending[uid] for uid in uids if uid in pending})
+
+    pending["u1"] = 500  # money_writer에 넘긴 정산, 아직 커밋 전
+    cache.apply_delta("u1", 500)
+    assert cache.get("u1")["money"] == 1500  # 저장소 값(1000) + 대기 중인 합계
+    assert cache.get("u1")["money"] == 1500
+    assert db.fetches == 2  # 옛 잔액은 캐시하지 않고 매번 다시 읽음
+
+    db.money["u1"] += 500  # writer 커밋
+    del pending["u1"]
+    cache.settled(["u1"])
+    assert notified == ["u1"]
+    assert cache.get("u1")["money"] == 1500
+    assert cache.get("u1")["money"] == 1500
+    assert db.fetches == 3
+
+
+def test_uid_committed_during_fetch_is_not_cached():
+    db = FakeStore()
+    pending = {"u1": 500}
+
+    def fetch(uids):
+        result = db.fetch(uids)
+        db.money["u1"] += 500  # 조회 직후 writer가 커밋
+        pending.clear()
+        return result
+
+    cache = ProfileCache(fetch, pending=lambda uids: {uid: pending[uid] for uid in uids if uid in pending})
+    cache.get("u1")
+    assert len(cache) == 0
+    assert cache.get("u1")["money"] == 1500
+    assert len(cache) == 1
+
+
+def test_pending_from_money_writer():
+    import threading
+
+    from money_writer import MoneyWriter
+
+    release = threading.Event()
+    db = FakeStore()
+
+    def commit(deltas):
+        release.wait(5)
+        for uid, amount in deltas.items():
+            db.money[uid] += amount
+
+    writer = MoneyWriter(commit=commit, window=0.01)
+    cache = ProfileCache(db.fetch, pending=writer.pending)
+    writer.submit("u1", 300)
+    writer.submit("u1", 200)
+    cache.apply_delta("u1", 500)
+    assert writer.pending(["u1", "u2"]) == {"u1": 500}
+    assert cache.get("u1")["money"] == 1500
+
+    release.set()
+    assert writer.flush(5)
+    assert writer.pending(["u1"]) == {}
+    assert cache.get("u1")["money"] == 1500
+    assert len(cache) == 1
+    writer.close()
+
+
+def test_committed_delta_updates_cache_and_notifies():
+    db = FakeStore()
+    notified = []
+    cache = ProfileCache(db.fetch, on_settled=notified.extend)
+    assert cache.get("u1")["money"] == 1000
+
+    db.money["u1"] -= 200
+    cache.apply_delta("u1", -200, committed=True)  # increment_user_money_now: 이미 반영됨
+    assert cache.get("u1")["money"] == 800
+    assert db.fetches == 1
+    assert notified == ["u1"]
@@ -0,0 +1,165 @@
+"""
+state_update 델타 프로토콜(state_sync.diff_view / ClientSync) 테스트
+
+    python -m pytest -q tests
+"""
+import copy
+
+from conftest import wait_for
+from state_sync import MAX_UNACKED_VERSIONS, ClientSync, diff_view
+
+
+def tile(tile_id, value, revealed=False):
+    return {"id": tile_id, "color": "black", "value": value, "revealed": revealed}
+
+
+def make_view():
+    return {
+        "players": [
+            {"uid": "a", "nickname": "A", "finalRank": 0, "hand": [tile(1, 3), tile(2, 7)]},
+            {"uid": "b", "nickname": "B", "finalRank": 0, "hand": [tile(3, 1), tile(4, 9)]},
+        ],
+        "piles": {"black": 10, "white": 10},
+        "currentTurn": 0,
+        "drawnTile": None,
+        "phase": "DRAWING",
+        "remainingTime": 60,
+    }
+
+
+# --- diff_view ---
+
+def test_unchanged_view_is_empty_diff():
+    old = make_view()
+    new = copy.deepcopy(old)
+    new["remainingTime"] = 42  # 매번 바뀌는 필드만 다르면 보낼 것 없음
+    assert diff_view(old, new) == {}
+
+
+def test_changed_top_level_fields_carry_volatile_keys():
+    old = make_view()
+    new = copy.deepcopy(old)
+    new["phase"] = "GUESSING"
+    new["remainingTime"] = 42
+    assert diff_view(old, new) == {"set": {"phase": "GUESSING", "remainingTime": 42}}
+
+
+def test_removed_key_needs_full_snapshot():
+    old = make_view()
+    new = copy.deepcopy(old)
+    del new["drawnTile"]
+    assert diff_view(old, new) is None
+
+    new = copy.deepcopy(old)
+    del new["players"][1]["finalRank"]
+    assert diff_view(old, new) is None
+
+
+def test_player_set_change_needs_full_snapshot():
+    old = make_view()
+    new = copy.deepcopy(old)
+    new["players"].pop()
+    assert diff_view(old, new) is None
+
+    new = copy.deepcopy(old)
+    new["players"][1]["uid"] = "c"
+    assert diff_view(old, new) is None
+
+
+def test_hand_insert_and_tile_change():
+    old = make_view()
+    new = copy.deepcopy(old)
+    new["players"][0]["hand"].insert(1, tile(5, 5))       # 뽑은 타일 배치
+    new["players"][1]["hand"][1] = tile(4, 9, revealed=True)  # 추리 성공으로 공개
+    new["players"][1]["finalRank"] = 2
+
+    changes = diff_view(old, new)
+    assert changes["players"] == {
+        "0": {"handInsert": [[1, tile(5, 5)]]},
+        "1": {"finalRank": 2, "tiles": [[1, tile(4, 9, revealed=True)]]},
+    }
+    assert changes["set"] == {"remainingTime": 60}
+
+
+def test_hand_reorder_sends_whole_hand():
+    old = make_view()
+    new = copy.deepcopy(old)
+    new["players"][0]["hand"].reverse()
+    assert diff_view(old, new)["players"] == {"0": {"hand": new["players"][0]["hand"]}}
+
+
+# --- ClientSync ---
+
+def test_client_sync_needs_ack_within_window():
+    sync = ClientSync(delta=True)
+    assert not sync.can_send_delta()  # 아직 보낸 뷰 없음
+
+    sync.sent_view, sync.sent_version = make_view(), 5
+    assert not sync.can_send_delta()  # ack 전
+    sync.acked_version = 5
+    assert sync.can_send_delta()
+
+    sync.sent_version = 5 + MAX_UNACKED_VERSIONS + 1  # 클라이언트가 따라오지 못함
+    assert not sync.can_send_delta()
+
+    sync.sent_version = 5
+    sync.reset()
+    assert not sync.can_send_delta()
+
+
+# --- broadcast_in_game_state ---
+
+def states(client):
+    return [(e["name"], e["args"][0]) for e in client.get_received() if e["name"] in ("state_update", "state_delta")]
+
+
+def next_states(client):
+    """방 액터가 처리한 뒤 받은 state_update/state_delta (하나 이상 올 때까지 대기)"""
+    received = []
+    wait_for(lambda: received.extend(states(client)) or received)
+    return received
+
+
+def test_broadcast_versions_deltas_and_resync(make_game):
+    from utils import broadcast_in_game_state
+
+    room_id, clients, gs = make_game(["s1", "s2"])
+    client = clients[1]
+
+    client.emit("request_game_state", {"roomId": room_id, "delta": True})
+    [(name, full)] = next_states(client)
+    assert name == "state_update" and full["version"] == gs.state_version
+
+    # ack 전에는 계속 전체 스냅샷
+    version = gs.state_version
+    broadcast_in_game_state(room_id)
+    assert gs.state_version == version + 1
+    assert [name for name, _ in states(client)] == ["state_update"]
+
+    client.emit("state_ack", {"roomId": room_id, "version": gs.state_version})
+    assert wait_for(lambda: gs.client_sync[gs.players[1].sid].acked_version == gs.state_version)
+
+    # 바뀐 게 없으면 버전만 오르고 전송 없음
+    broadcast_in_game_state(room_id)
+    assert states(client) == []
+
+    # 바뀐 필드만 state_delta로 (baseVersion = 마지막으로 보낸 버전)
+    base = gs.client_sync[gs.players[1].sid].sent_version
+    gs.pending_placement = True
+    broadcast_in_game_state(room_id)
+    [(name, delta)] = states(client)
+    assert name == "state_delta"
+    assert delta["baseVersion"] == base and delta["version"] == gs.state_version
+    assert delta["set"]["pendingPlacement"] is True
+
+    # ack가 MAX_UNACKED_VERSIONS보다 뒤처지면 다시 전체 스냅샷
+    for i in range(MAX_UNACKED_VERSIONS + 1):
+        gs.same_number_order = ["white", "black"] if i % 2 == 0 else ["black", "white"]
+        broadcast_in_game_state(room_id)
+    assert states(client)[-1][0] == "state_update"
+
+    # 버전이 어긋난 클라이언트는 request_game_state로 재동기화 -> 전체 스냅샷
+    client.emit("request_game_state", {"roomId": room_id})
+    name, full = next_states(client)[-1]
+    assert name == "state_update" and full["version"] == gs.state_version
+    assert gs.client_sync[gs.players[1].sid].delta  # 델타 모드는 유지
@@ -0,0 +1,133 @@
+"""
+턴 페이즈 전이표(turn_phases)와 예약된 후속 작업(game_events.schedule / run_continuation) 테스트
+
+    python -m pytest -q tests
+"""
+import pytest
+
+from conftest import wait_for
+from models import GameState
+from turn_phases import ACCEPTS, TIMED, TRANSITIONS, accepts, can_transition, transition
+
+
+def make_state(phase="INIT"):
+    gs = GameState(players=[], piles={"black": [], "white": []}, same_number_order="black-first",
+                   current_turn=0, drawn_tile=None, pending_placement=False, can_place_anywhere=False,
+                   next_tile_id=0)
+    gs.turn_phase = phase
+    return gs
+
+
+# --- 전이표 ---
+
+@pytest.mark.parametrize("current,target", [
+    ("INIT", "ANIMATING_GUESS"),
+    ("DRAWING", "PROCESSING"),
+    ("GUESSING", "POST_SUCCESS_GUESS"),
+    ("PLACE_JOKER", "ANIMATING_GUESS"),
+    ("ANIMATING_GUESS", "POST_SUCCESS_GUESS"),
+    ("GAME_OVER", "DRAWING"),
+    ("GAME_OVER", "GUESSING"),
+])
+def test_illegal_transition_is_rejected(current, target):
+    gs = make_state(current)
+    gs.continuation = {"step": "resolve_guess", "seq": gs.phase_seq, "due": 0, "args": {}}
+    assert not can_transition(current, target)
+    assert not transition(gs, target)
+    assert gs.turn_phase == current
+    assert gs.phase_seq == 0
+    assert gs.continuation is not None  # 거부된 전이는 예약도 건드리지 않음
+
+
+def test_legal_transition_bumps_seq_and_drops_continuation():
+    gs = make_state("GUESSING")
+    gs.continuation = {"step": "resolve_guess", "seq": gs.phase_seq, "due": 0, "args": {}}
+    assert transition(gs, "ANIMATING_GUESS")
+    assert gs.turn_phase == "ANIMATING_GUESS"
+    assert gs.phase_seq == 1
+    assert gs.continuation is None
+
+
+def test_every_phase_can_start_a_turn_or_end_except_game_over():
+    for phase, targets in TRANSITIONS.items():
+        assert "INIT" in targets
+        if phase != "GAME_OVER":
+            assert {"DRAWING", "GUESSING", "GAME_OVER"} <= targets
+
+
+def test_accepts():
+    assert accepts(make_state("DRAWING"), "draw_tile")
+    assert not accepts(make_state("GUESSING"), "draw_tile")
+    assert accepts(make_state("POST_SUCCESS_GUESS"), "guess_value")
+    assert not accepts(make_state("PROCESSING"), "animation_done")
+    for phase in TRANSITIONS:
+        assert accepts(make_state(phase), "stop_guessing") == (phase in TIMED)
+    assert set(ACCEPTS["stop_guessing"]) == set(TIMED)
+
+
+# --- 게임 진행 ---
+
+def start_guess(room_id, clients, gs):
+    """현재 턴 플레이어(clients[0])가 GUESSING에서 틀린 추리 -> ANIMATING_GUESS"""
+    assert transition(gs, "GUESSING")
+    target = gs.players[1]
+    clients[0].emit("guess_value", {"roomId": room_id, "targetId": target.id, "index": 0, "value": -1})
+    assert wait_for(lambda: gs.turn_phase == "ANIMATING_GUESS")
+
+
+def test_stale_continuation_is_dropped(make_game, monkeypatch):
+    import game_events
+    from actors import room_actors
+
+    monkeypatch.setattr(game_events, "RESOLVE_DELAY", 0.2)
+    room_id, clients, gs = make_game(["p1", "p2", "p3"])
+    start_guess(room_id, clients, gs)
+
+    clients[0].emit("game:animation_done", {"roomId": room_id, "guesserUid": "p1", "correct": False})
+    assert wait_for(lambda: gs.continuation is not None)
+    assert gs.continuation["step"] == "resolve_guess"
+    assert gs.turn_phase == "PROCESSING"
+
+    # resolve_guess가 실행되기 전에 턴이 이미 넘어감 (타임아웃/턴 플레이어 퇴장과 같은 경로)
+    room_actors.post(room_id, game_events.start_next_turn, room_id, "timeout")
+    assert wait_for(lambda: gs.turn_phase == "DRAWING")
+    assert gs.current_turn == 1
+    assert gs.continuation is None
+
+    # 예약된 resolve_guess(오답 -> 다음 턴)가 실행됐다면 턴이 한 번 더 넘어갔을 것
+    seq = gs.phase_seq
+    wait_for(lambda: False, timeout=0.4)
+    assert gs.current_turn == 1
+    assert gs.phase_seq == seq
+
+
+def test_continuation_runs_in_its_own_phase(make_game, monkeypatch):
+    import game_events
+
+    monkeypatch.setattr(game_events, "RESOLVE_DELAY", 0.05)
+    room_id, clients, gs = make_game(["q1", "q2", "q3"])
+    start_guess(room_id, clients, gs)
+
+    clients[0].emit("game:animation_done", {"roomId": room_id, "guesserUid": "q1", "correct": False})
+    assert wait_for(lambda: gs.turn_phase == "DRAWING" and gs.current_turn == 1)
+    assert gs.continuation is None
+
+
+def test_stop_guessing_is_refused_outside_timed_phases(make_game):
+    room_id, clients, gs = make_game(["r1", "r2", "r3"])
+    start_guess(room_id, clients, gs)
+
+    seq = gs.phase_seq
+    clients[0].emit("stop_guessing", {"roomId": room_id})
+    wait_for(lambda: gs.phase_seq != seq, timeout=0.3)
+    assert gs.turn_phase == "ANIMATING_GUESS"
+    assert gs.current_turn == 0
+
+
+def test_stop_guessing_passes_the_turn_in_timed_phase(make_game):
+    room_id, clients, gs = make_game(["s1", "s2", "s3"])
+    assert transition(gs, "GUESSING")
+
+    clients[0].emit("stop_guessing", {"roomId": room_id})
+    assert wait_for(lambda: gs.current_turn == 1)
+    assert gs.turn_phase == "DRAWING"
@@ -0,0 +1,58 @@
+# turn_phases.py
+# 🔥 [NEW] 턴 페이즈 상태 기계 (전이표)
+#
+#   INIT ─▶ DRAWING ─▶ PLACE_JOKER ─▶ GUESSING ─▶ ANIMATING_GUESS ─▶ PROCESSING ─▶ POST_SUCCESS_GUESS
+#              └──────(자동 배치)──────▶ ┘              ▲                                     │
+#                                                      └─────────────(연속 추리)─────────────┘
+#   - 새 턴 시작(DRAWING/GUESSING)은 게임 중 어느 페이즈에서든 가능 (오답, 추리 중단, 타임아웃, 턴 플레이어 퇴장)
+#   - GAME_OVER(정산 완료)와 INIT(로비로 되돌림)는 어디서든 진입 가능. GAME_OVER 뒤에는 INIT만 가능
+#
+# 페이즈 변경은 모두 transition()을 거칩니다. 표에 없는 전이는 상태를 건드리지 않고 False (dict/frozenset 조회 한 번).
+# phase_seq는 전이마다 1씩 증가 -> 예약된 후속 작업(game_events.schedule)이 자기가 예약된 페이즈에서만 실행되도록 비교용.
+from typing import Dict, FrozenSet
+
+from models import GameState, TurnPhase
+
+TURN_START: FrozenSet[TurnPhase] = frozenset({"DRAWING", "GUESSING"})
+_ANYWHERE: FrozenSet[TurnPhase] = frozenset({"INIT", "GAME_OVER"})
+
+TRANSITIONS: Dict[TurnPhase, FrozenSet[TurnPhase]] = {
+    "INIT": TURN_START | _ANYWHERE,
+    "DRAWING": TURN_START | _ANYWHERE | {"PLACE_JOKER"},
+    "PLACE_JOKER": TURN_START | _ANYWHERE,
+    "GUESSING": TURN_START | _ANYWHERE | {"ANIMATING_GUESS"},
+    "ANIMATING_GUESS": TURN_START | _ANYWHERE | {"PROCESSING"},
+    "PROCESSING": TURN_START | _ANYWHERE | {"POST_SUCCESS_GUESS"},
+    "POST_SUCCESS_GUESS": TURN_START | _ANYWHERE | {"ANIMATING_GUESS"},
+    "GAME_OVER": frozenset({"INIT"}),
+}
+
+# 턴 타이머(TURN_TIMER_SECONDS)가 도는 페이즈 = 플레이어 입력을 기다리는 페이즈
+TIMED: FrozenSet[TurnPhase] = frozenset({"DRAWING", "PLACE_JOKER", "GUESSING", "POST_SUCCESS_GUESS"})
+
+# 클라이언트 이벤트별로 받아들이는 페이즈 (핸들러 입구에서 확인)
+ACCEPTS: Dict[str, FrozenSet[TurnPhase]] = {
+    "draw_tile": frozenset({"DRAWING"}),
+    "place_joker": frozenset({"PLACE_JOKER"}),
+    "guess_value": frozenset({"GUESSING", "POST_SUCCESS_GUESS"}),
+    "animation_done": frozenset({"ANIMATING_GUESS"}),
+    "stop_guessing": TIMED,
+}
+
+
+def can_transition(current: TurnPhase, target: TurnPhase) -> bool:
+    return target in TRANSITIONS.get(current, ())
+
+
+def accepts(gs: GameState, event: str) -> bool:
+    return gs.turn_phase in ACCEPTS[event]
+
+
+def transition(gs: GameState, target: TurnPhase) -> bool:
+    """gs.turn_phase를 target으로 변경. 표에 없는 전이면 그대로 두고 False"""
+    if target not in TRANSITIONS.get(gs.turn_phase, ()):
+        return False
+    gs.turn_phase = target
+    gs.phase_seq += 1
+    gs.continuation = None  # 예약된 후속 작업은 예약한 페이즈에 속함
+    return True
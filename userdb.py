@@ -0,0 +1,343 @@
+# userdb.py
+# 🔥 [NEW] 사용자 저장소 (users 컬렉션: nickname / major / year / money)
+#
+# 서버가 쓰는 연산은 네 가지뿐입니다.
+#   get_profiles(uids)      : 프로필 일괄 조회 (왕복 1회)              <- profiles.profile_cache
+#   increment(uid, amount)  : money 즉시 증감                         <- utils.increment_user_money_now
+#   apply_increments(deltas): uid별 증감을 배치로 커밋                  <- money_writer
+#   top_users(limit)        : money 내림차순 상위 N명                  <- leaderboard
+#
+# USERDB_URL 로 선택합니다. (없으면 firestore://, FIREBASE_DISABLED=1이면 memory://)
+#   firestore://                 : Firebase Admin SDK (기본값, 기존 동작)
+#   memory://                    : 프로세스 안 dict (워커마다 따로)
+#   sqlite:///tmp/users.db       : SQLite 파일 (같은 파일을 쓰는 워커끼리 공유, sqlite:// 만 쓰면 메모리 DB)
+# 대역(memory/sqlite)은 쿼리 파라미터로 Firestore 같은 I/O 지연을 흉내 냅니다. (부하 테스트/벤치마크를 오프라인으로)
+#   latency=0.02   : 왕복마다 기본 지연 (초)
+#   jitter=0.01    : 0~jitter초 추가 지연 (균등 분포)
+#   autocreate=N   : 없는 uid를 money=N으로 만들어 둠 (생략하면 Firestore처럼 없는 문서는 조회 결과에서 빠지고 증감은 실패)
+#   예) USERDB_URL="sqlite:///tmp/users.db?latency=0.03&jitter=0.02&autocreate=100000"
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from logs import get_logger
+
+log = get_logger("payout")
+
+USERDB_URL = os.environ.get("USERDB_URL") or (
+    "memory://" if os.environ.get("FIREBASE_DISABLED") == "1" else "firestore://"
+)
+
+PROFILE_FIELDS = ("nickname", "major", "year", "money")
+FIRESTORE_BATCH_LIMIT = 500  # Firestore WriteBatch 최대 연산 수
+
+Profile = Dict[str, Any]
+
+
+class UserNotFound(Exception):
+    """증감 대상 사용자 문서가 없음"""
+
+
+class PartialCommit(Exception):
+    """
+    apply_increments가 일부만 반영한 뒤 실패 (Firestore는 500개씩 나눠 커밋하므로 앞 청크는 이미 반영됨).
+    done: 반영됐거나 문서가 없어 버린 uid (다시 증감하면 안 됨), dropped: 그중 문서가 없던 uid, cause: 원래 예외
+    """
+
+    def __init__(self, done: List[str], dropped: List[str], cause: Exception):
+        super().__init__(f"{len(done)} users committed before failure: {cause}")
+        self.done = done
+        self.dropped = dropped
+        self.cause = cause
+
+
+class FirestoreUserDB:
+    """Firebase Admin SDK. 키가 없거나 FIREBASE_DISABLED=1이면 get_db()가 None -> 조회는 빈 결과, 쓰기는 건너뜀"""
+
+    def __init__(self):
+        try:
+            import firebase_admin_config  # noqa: F401
+            from firebase_admin import firestore  # noqa: F401
+            self.available = True
+        except Exception as e:
+            log.warning("⚠️ Firebase Admin not available: %s", e)
+            self.available = False
+
+    def _db(self, use_async: bool = False):
+        if not self.available:
+            return None
+        if use_async:
+            from firebase_admin_config import get_async_db
+            return get_async_db()
+        from firebase_admin_config import get_db
+        return get_db()
+
+    def get_profiles(self, uids: List[str], timeout: Optional[float] = None) -> Dict[str, Profile]:
+        from aio import in_bridge, await_only
+
+        bridged = in_bridge()
+        db = self._db(use_async=bridged)
+        if not db:
+            return {}
+        refs = [db.collection("users").document(uid) for uid in uids]
+        if bridged:
+            async def collect():
+                return [snap async for snap in db.get_all(refs, field_paths=PROFILE_FIELDS, timeout=timeout)]
+            snapshots = await_only(collect())
+        else:
+            snapshots = db.get_all(refs, field_paths=PROFILE_FIELDS, timeout=timeout)
+        return {snap.id: snap.to_dict() or {} for snap in snapshots if snap.exists}
+
+    def increment(self, uid: str, amount: int) -> bool:
+        """asyncio 서버 모드의 핸들러 안에서는 AsyncClient를 await하므로 이벤트 루프를 막지 않음"""
+        from aio import in_bridge, await_only
+        from google.api_core import exceptions as gexc
+        from firebase_admin import firestore as admin_firestore
+
+        bridged = in_bridge()
+        db = self._db(use_async=bridged)
+        if not db:
+            return False
+        update = {'money': admin_firestore.Increment(amount)}
+        try:
+            if bridged:
+                await_only(db.collection('users').document(uid).update(update))
+            else:
+                db.collection('users').document(uid).update(update)
+        except gexc.NotFound:
+            raise UserNotFound(uid)
+        return True
+
+    def apply_increments(self, deltas: Dict[str, int]) -> List[str]:
+        """WriteBatch(최대 500개)로 커밋. 반환: 문서가 없어 버려진 uid. 중간에 실패하면 PartialCommit"""
+        from google.api_core import exceptions as gexc
+        from firebase_admin import firestore as admin_firestore
+
+        db = self._db()
+        if not db:
+            # Firebase 미설정 환경 (기존 동작과 동일하게 건너뜀)
+            return []
+
+        done: List[str] = []  # 반영됐거나 버린 uid (청크/문서 단위로 쌓음)
+        dropped = []
+        items = list(deltas.items())
+        try:
+            for start in range(0, len(items), FIRESTORE_BATCH_LIMIT):
+                chunk = items[start:start + FIRESTORE_BATCH_LIMIT]
+                batch = db.batch()
+                for uid, amount in chunk:
+                    batch.update(db.collection('users').document(uid), {
+                        'money': admin_firestore.Increment(amount)
+                    })
+                try:
+                    batch.commit()
+                    done.extend(uid for uid, _ in chunk)
+                except gexc.NotFound:
+                    # 문서가 없는 uid 하나 때문에 배치 전체가 실패 -> 개별 업데이트로 격리
+                    for uid, amount in chunk:
+                        try:
+                            db.collection('users').document(uid).update({
+                                'money': admin_firestore.Increment(amount)
+                            })
+                        except gexc.NotFound:
+                            dropped.append(uid)
+                        done.append(uid)
+        except Exception as e:
+            if not done:
+                raise
+            # 재시도가 이미 반영된 증감을 또 더하지 않도록 어디까지 됐는지 알려 줌
+            raise PartialCommit(done, dropped, e) from e
+        return dropped
+
+    def top_users(self, limit: int, timeout: Optional[float] = None) -> Optional[List[Profile]]:
+        """money 내림차순 상위 limit명 (uid 포함). DB 연결이 없으면 None"""
+        from firebase_admin import firestore as admin_firestore
+
+        db = self._db()
+        if not db:
+            return None
+        query = db.collection("users").order_by("money", direction=admin_firestore.Query.DESCENDING).limit(limit)
+        return [{"uid": doc.id, **doc.to_dict()} for doc in query.stream(timeout=timeout)]
+
+
+class _StandIn:
+    """오프라인 대역 공통: URL 파라미터(latency/jitter/autocreate)와 왕복 지연"""
+    available = True
+
+    def __init__(self, params: Dict[str, str]):
+        self.latency = float(params.get("latency", 0))
+        self.jitter = float(params.get("jitter", 0))
+        self.autocreate = int(params["autocreate"]) if "autocreate" in params else None
+        self.round_trips = 0
+
+    def _round_trip(self):
+        """네트워크 왕복 1회 흉내. eventlet에선 time.sleep이 green, asyncio 브리지에선 루프에 양보"""
+        self.round_trips += 1
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay <= 0:
+            return
+        from aio import in_bridge, await_only
+        if in_bridge():
+            import asyncio
+            await_only(asyncio.sleep(delay))
+        else:
+            time.sleep(delay)
+
+    def _new_user(self, uid: str) -> Profile:
+        return {"nickname": uid, "major": "", "year": 0, "money": self.autocreate}
+
+
+class MemoryUserDB(_StandIn):
+    """프로세스 안 dict. 워커 간 공유되지 않음 (단일 워커 부하 테스트/벤치마크용)"""
+
+    def __init__(self, params: Dict[str, str]):
+        super().__init__(params)
+        self._lock = threading.Lock()
+        self._users: Dict[str, Profile] = {}
+
+    def put_user(self, uid: str, **fields) -> None:
+        with self._lock:
+            self._users.setdefault(uid, {}).update(fields)
+
+    def _get(self, uid: str) -> Optional[Profile]:
+        user = self._users.get(uid)
+        if user is None and self.autocreate is not None:
+            user = self._users[uid] = self._new_user(uid)
+        return user
+
+    def get_profiles(self, uids: List[str], timeout: Optional[float] = None) -> Dict[str, Profile]:
+        self._round_trip()
+        with self._lock:
+            found = {uid: self._get(uid) for uid in uids}
+            return {uid: {k: user[k] for k in PROFILE_FIELDS if k in user} for uid, user in found.items() if user}
+
+    def increment(self, uid: str, amount: int) -> bool:
+        self._round_trip()
+        with self._lock:
+            user = self._get(uid)
+            if user is None:
+                raise UserNotFound(uid)
+            user["money"] = user.get("money", 0) + amount
+        return True
+
+    def apply_increments(self, deltas: Dict[str, int]) -> List[str]:
+        self._round_trip()
+        dropped = []
+        with self._lock:
+            for uid, amount in deltas.items():
+                user = self._get(uid)
+                if user is None:
+                    dropped.append(uid)
+                else:
+                    user["money"] = user.get("money", 0) + amount
+        return dropped
+
+    def top_users(self, limit: int, timeout: Optional[float] = None) -> Optional[List[Profile]]:
+        self._round_trip()
+        with self._lock:
+            ranked = sorted(self._users.items(), key=lambda item: item[1].get("money", 0), reverse=True)
+            return [{"uid": uid, **user} for uid, user in ranked[:limit]]
+
+
+class SQLiteUserDB(_StandIn):
+    """SQLite 파일. 같은 파일을 가리키는 워커끼리 잔액/리더보드를 공유 (WAL)"""
+
+    def __init__(self, path: str, params: Dict[str, str]):
+        super().__init__(params)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """프로세스마다 연결 하나 (gunicorn fork 이후 처음 쓸 때 연결)"""
+        if self._db is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+            if self.path != ":memory:":
+                self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " uid TEXT PRIMARY KEY, nickname TEXT, major TEXT, year INTEGER, money INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS users_money ON users (money DESC)")
+        return self._db
+
+    def put_user(self, uid: str, **fields) -> None:
+        user = {**self._new_user(uid), "money": 0, **fields}
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO users (uid, nickname, major, year, money) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(uid) DO UPDATE SET nickname=excluded.nickname, major=excluded.major,"
+                " year=excluded.year, money=excluded.money",
+                (uid, user["nickname"], user["major"], user["year"], user["money"]),
+            )
+
+    def _create_missing(self, uids: Iterable[str]) -> None:
+        if self.autocreate is not None:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO users (uid, nickname, major, year, money) VALUES (?, ?, '', 0, ?)",
+                [(uid, uid, self.autocreate) for uid in uids],
+            )
+
+    def get_profiles(self, uids: List[str], timeout: Optional[float] = None) -> Dict[str, Profile]:
+        self._round_trip()
+        if not uids:
+            return {}
+        with self._lock:
+            self._create_missing(uids)
+            rows = self._conn.execute(
+                "SELECT uid, nickname, major, year, money FROM users WHERE uid IN (%s)" % ",".join("?" * len(uids)),
+                list(uids),
+            ).fetchall()
+        return {uid: {"nickname": nickname, "major": major, "year": year, "money": money}
+                for uid, nickname, major, year, money in rows}
+
+    def increment(self, uid: str, amount: int) -> bool:
+        if self.apply_increments({uid: amount}):
+            raise UserNotFound(uid)
+        return True
+
+    def apply_increments(self, deltas: Dict[str, int]) -> List[str]:
+        self._round_trip()
+        dropped = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._create_missing(deltas)
+                for uid, amount in deltas.items():
+                    cur = self._conn.execute("UPDATE users SET money = money + ? WHERE uid = ?", (amount, uid))
+                    if cur.rowcount == 0:
+                        dropped.append(uid)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return dropped
+
+    def top_users(self, limit: int, timeout: Optional[float] = None) -> Optional[List[Profile]]:
+        self._round_trip()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT uid, nickname, major, year, money FROM users ORDER BY money DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [{"uid": uid, "nickname": nickname, "major": major, "year": year, "money": money}
+                for uid, nickname, major, year, money in rows]
+
+
+def create_userdb(url: str = USERDB_URL):
+    parts = urlsplit(url)
+    params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    if parts.scheme == "memory":
+        return MemoryUserDB(params)
+    if parts.scheme == "sqlite":
+        return SQLiteUserDB((parts.netloc + parts.path) or ":memory:", params)
+    return FirestoreUserDB()
+
+
+userdb = create_userdb()
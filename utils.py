@@ -1,9 +1,16 @@
 # utils.py
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from models import Tile, Player, GameState
-from state import rooms
+from state_sync import ClientSync, diff_view
+from state import rooms, sessions
+from store import store
 from extensions import socketio
 import time # 👈 time 임포트
+from logs import get_logger
+import metrics # 🔥 [NEW] /metrics
+import outbox # 🔥 [NEW] 방 작업 단위 emit 버퍼
+
+log = get_logger("broadcast")
 
 # 🔥 [FIX] 순환 참조 방지를 위해 상수 직접 정의하거나 game_events에서 가져오지 않음
 # (game_events가 utils를 임포트하므로 여기서 game_events를 임포트하면 안됨)
@@ -53,6 +60,55 @@ def serialize_player(p: Player, is_self: bool = False) -> Dict[str, Any]:
         "lastDrawnIndex": p.last_drawn_index,
     }
 
+# 🔥 [NEW] 공개 뷰 캐시 (broadcast_in_game_state 전용)
+# 타일/플레이어 dict를 수신자마다 새로 만들지 않고 방 단위로 재사용합니다.
+# - 타일: (타일 객체, revealed) 가 같으면 재사용 -> 공개되면 자동으로 무효화
+# - 플레이어: 프로필/순위 필드와 손패 타일 뷰가 모두 같으면 재사용 -> 손패가 바뀌면 무효화
+# 캐시된 dict는 여러 수신자/버전이 공유하므로 절대 제자리 수정하지 않습니다.
+
+def _cached_tile_views(cache: Dict[int, tuple], t: Tile) -> tuple:
+    """(public, private) 타일 뷰 반환"""
+    entry = cache.get(t.id)
+    if entry is None or entry[0] is not t or entry[1] != t.revealed:
+        public = serialize_tile(t, is_self=False)
+        private = public if t.revealed else serialize_tile(t, is_self=True)
+        entry = cache[t.id] = (t, t.revealed, public, private)
+    return entry[2], entry[3]
+
+def _cached_player_view(gs: GameState, p: Player, is_self: bool) -> Dict[str, Any]:
+    tile_cache = gs.view_cache.setdefault("tiles", {})
+    player_cache = gs.view_cache.setdefault("players", {})
+
+    k = 1 if is_self else 0
+    hand = [_cached_tile_views(tile_cache, t)[k] for t in p.hand]
+    sig = (p.sid, p.uid, p.id, p.name, p.nickname, p.major, p.year,
+           p.money, p.bet_amount, p.final_rank, p.last_drawn_index)
+
+    key = (p.uid, is_self)
+    entry = player_cache.get(key)
+    if entry is not None:
+        old_sig, view = entry
+        old_hand = view["hand"]
+        if old_sig == sig and len(old_hand) == len(hand) and all(a is b for a, b in zip(old_hand, hand)):
+            return view
+
+    view = {
+        "sid": p.sid,
+        "uid": p.uid,
+        "id": p.id,
+        "name": p.name,
+        "nickname": p.nickname,
+        "major": p.major,
+        "year": p.year,
+        "money": p.money,
+        "betAmount": p.bet_amount,
+        "rank": p.final_rank,
+        "hand": hand,
+        "lastDrawnIndex": p.last_drawn_index,
+    }
+    player_cache[key] = (sig, view)
+    return view
+
 # (신규) 이 함수는 이제 '로비'에서만 사용합니다.
 # (게임 중에는 아래의 broadcast_in_game_state가 사용됩니다)
 def serialize_state_for_lobby(gs: GameState) -> Dict[str, Any]:
@@ -84,13 +140,38 @@ def get_room(room_id: str) -> GameState:
         )
     return rooms[room_id]
 
+def remove_room(room_id: str):
+    """🔥 [NEW] 방 삭제 (메모리 + 세션 디렉터리 + 공유 저장소의 방 디렉터리)"""
+    gs = rooms.pop(room_id, None)
+    if gs is not None:
+        sessions.drop_room(room_id, gs)
+    store.release_room(room_id)
+
+def find_room_and_player_by_sid(sid: str) -> Optional[Tuple[str, GameState, Player]]:
+    """🔥 [NEW] 세션 디렉터리로 sid가 속한 (room_id, GameState, Player) 조회 (O(1))"""
+    entry = sessions.lookup_sid(sid)
+    if entry is None:
+        return None
+    room_id, player = entry
+    gs = rooms.get(room_id)
+    if gs is None:
+        return None
+    return room_id, gs, player
+
 def find_player_by_sid(gs: GameState, sid: str) -> Optional[Player]:
+    # 🔥 [NEW] 세션 디렉터리 조회 (O(1))
+    found = find_room_and_player_by_sid(sid)
+    if found is not None and found[1] is gs:
+        return found[2]
+    # 디렉터리는 sid당 마지막으로 묶인 방 하나만 기억함 (같은 연결로 다른 방에 들어간 경우 등)
+    # -> 이 방의 플레이어(최대 4명)를 직접 확인
     for p in gs.players:
         if p.sid == sid:
             return p
     return None
 
 def find_player_by_uid(gs: GameState, uid: str) -> Optional[Player]:
+    # 방 안의 플레이어(최대 4명)만 보므로 순회로 충분
     for p in gs.players:
         if p.uid == uid:
             return p
@@ -99,71 +180,133 @@ def find_player_by_uid(gs: GameState, uid: str) -> Optional[Player]:
 # ▼▼▼ (핵심 수정 3) ▼▼▼
 # 기존 broadcast_state 함수를 '인게임용'으로 완전히 교체합니다.
 def broadcast_in_game_state(room_id: str):
-    """(신규) 인게임 전용, 각 플레이어에게 '개인화된' 상태 전송"""
+    """(신규) 인게임 전용, 각 플레이어에게 '개인화된' 상태 전송
+    🔥 [NEW] 방 단위 state_version을 올리고, 델타 모드 클라이언트에게는 바뀐 필드만 전송 (state_sync 참고)
+    """
     gs = get_room(room_id)
     if not gs or not gs.players:
         return
 
+    started = time.perf_counter()
+    sent = 0
+    gs.state_version += 1
+    version = gs.state_version
+
     current_player_sid = None
     if gs.drawn_tile and gs.current_turn < len(gs.players):
          # current_turn은 '인덱스'이므로 바로 사용
         current_player_sid = gs.players[gs.current_turn].sid
 
-    for p_to_send in gs.players:
+    # 🔥 [NEW] 방을 떠난(SID가 바뀐) 수신자의 동기화 상태 정리
+    live_sids = {p.sid for p in gs.players}
+    for sid in [sid for sid in gs.client_sync if sid not in live_sids]:
+        del gs.client_sync[sid]
+
+    # 🔥 [NEW] 모든 수신자에게 공통인 부분은 이번 버전에서 한 번만 만듦
+    public_players = [_cached_player_view(gs, p, is_self=False) for p in gs.players]
+    piles = {
+        "black": len(gs.piles["black"]),
+        "white": len(gs.piles["white"]),
+    }
+    remaining_time = max(0, TURN_TIMER_SECONDS - (time.time() - gs.turn_start_time)) if gs.turn_start_time else 0
+    payout_results = list(gs.payout_results) # 델타 비교를 위해 복사본
+    drawn_tile_public = serialize_tile(gs.drawn_tile, is_self=False)
+    drawn_tile_private = serialize_tile(gs.drawn_tile, is_self=True) if gs.drawn_tile else None
+
+    # 🔥 [NEW] 방 작업 안이면 수신자별로 버퍼에 넣고(같은 수신자의 이전 상태는 버림) 작업이 끝날 때 전송
+    box = outbox.current()
+
+    for idx, p_to_send in enumerate(gs.players):
         # 이 사람(p_to_send)이 현재 턴의 플레이어인가?
         is_current_turn_player = (p_to_send.sid == current_player_sid)
 
+        # 본인(is_self=True) 자리만 개인화, 나머지는 공용 뷰 재사용
+        players_view = list(public_players)
+        players_view[idx] = _cached_player_view(gs, p_to_send, is_self=True)
+
         state_for_player = {
-            "players": [
-                # 본인(is_self=True)과 타인(is_self=False)을 구분하여 직렬화
-                serialize_player(p, is_self=(p.sid == p_to_send.sid)) 
-                for p in gs.players
-                    ],
-            "piles": {
-                            "black": len(gs.piles["black"]),
-                            "white": len(gs.piles["white"]),
-            },
+            "players": players_view,
+            "piles": piles,
             "sameNumberOrder": gs.same_number_order,
             "currentTurn": gs.current_turn, # 프론트가 턴을 식별하기 위함
             "pendingPlacement": gs.pending_placement,
             "canPlaceAnywhere": gs.can_place_anywhere,
 
             # (보안) '뽑은 타일'은 현재 턴인 사람에게만 값을 보여줌
-            "drawnTile": serialize_tile(gs.drawn_tile, is_self=is_current_turn_player),
+            "drawnTile": drawn_tile_private if is_current_turn_player else drawn_tile_public,
             "phase": gs.turn_phase, # 🔥 [FIX] Refresh 시 페이즈 정보 전송
-            "remainingTime": max(0, TURN_TIMER_SECONDS - (time.time() - gs.turn_start_time)) if gs.turn_start_time else 0, # 🔥 [NEW] 남은 시간 전송
-            "payoutResults": gs.payout_results, # 🔥 [NEW] 정산 결과 전송
+            "remainingTime": remaining_time, # 🔥 [NEW] 남은 시간 전송
+            "payoutResults": payout_results, # 🔥 [NEW] 정산 결과 전송
         }
-        
-        # 'state_update' 이벤트로 개인화된 상태 전송
-        try:
-            socketio.emit("state_update", state_for_player, to=p_to_send.sid)
-        except Exception as e:
-            print(f"⚠️ Failed to send state to {p_to_send.nickname} ({p_to_send.sid}): {e}")
+
+        if box is not None:
+            box.add(_send_state, (gs, p_to_send, state_for_player, version), key=("state", p_to_send.sid))
+            sent += 1
+        elif _send_state(gs, p_to_send, state_for_player, version):
+            sent += 1
             
-    print(f"📡 [Broadcast] Completed for room {room_id}") # Debug
+    metrics.broadcast_duration.observe(time.perf_counter() - started)
+    metrics.broadcast_fanout.observe(sent)
+    log.debug("📡 [Broadcast] Completed for room %s (v%s)", room_id, version)
+
+
+def _send_state(gs: GameState, p_to_send, state_for_player: Dict[str, Any], version: int) -> bool:
+    """한 수신자에게 state_update(전체) 또는 state_delta(마지막으로 보낸 뷰 대비 변경분) 전송. 보냈으면 True"""
+    sync = gs.client_sync.get(p_to_send.sid)
+    if sync is None:
+        sync = gs.client_sync[p_to_send.sid] = ClientSync()
+
+    event, payload = "state_update", None
+    if sync.can_send_delta():
+        changes = diff_view(sync.sent_view, state_for_player)
+        if changes is not None:
+            if not changes:
+                return False # 이 수신자에게는 바뀐 것이 없음 (버전만 건너뜀)
+            event = "state_delta"
+            payload = {"version": version, "baseVersion": sync.sent_version, **changes}
+    if payload is None:
+        payload = dict(state_for_player, version=version)
+
+    sync.sent_version = version
+    sync.sent_view = state_for_player
+
+    try:
+        socketio.emit(event, payload, to=p_to_send.sid)
+    except Exception as e:
+        log.warning("⚠️ Failed to send state to %s (%s): %s", p_to_send.nickname, p_to_send.sid, e)
+        sync.reset()
+        return False
+    return True
 
 # (기존 broadcast_state 함수는 삭제하고 위 함수로 대체)
 
 # 🔥 [NEW] 비동기 Firestore 업데이트 함수
 def update_user_money_async(uid: str, amount: int, nickname: str = "Unknown"):
     """
-    Firestore 업데이트를 별도 스레드에서 실행하여 메인 스레드(Socket.IO) 차단을 방지함.
+    Firestore 업데이트를 백그라운드 writer(money_writer)에 맡겨 메인 스레드(Socket.IO) 차단을 방지함.
+    (요청마다 스레드를 만들지 않고, uid별로 합쳐서 WriteBatch로 커밋)
     """
-    def _update():
-        try:
-            from firebase_admin_config import get_db
-            from firebase_admin import firestore as admin_firestore
-            
-            db = get_db()
-            if db:
-                user_ref = db.collection('users').document(uid)
-                user_ref.update({
-                    'money': admin_firestore.Increment(amount)
-                })
-                print(f"💰 Firestore updated (async): {nickname} {amount:+d}")
-        except Exception as e:
-            print(f"❌ Firestore async update error for {nickname} ({uid}): {e}")
-
-    import threading
-    threading.Thread(target=_update, daemon=True).start()
+    from money_writer import money_writer
+    from profiles import profile_cache
+    money_writer.submit(uid, amount, nickname)
+    profile_cache.apply_delta(uid, amount)  # 🔥 [NEW] 캐시된 잔액도 같이 갱신 (writer에 먼저 접수 -> 조회 시 pending으로 보임)
+
+
+def increment_user_money_now(uid: str, amount: int) -> bool:
+    """
+    🔥 [NEW] money를 바로 증감 (money_writer 배치를 거치지 않음). 저장소(Firebase) 미설정이면 False.
+    asyncio 서버 모드의 핸들러 안에서는 AsyncClient를 await하므로 이벤트 루프를 막지 않음.
+    """
+    from userdb import userdb
+
+    started = time.perf_counter()
+    try:
+        if not userdb.increment(uid, amount):
+            return False
+    except Exception:
+        metrics.firestore_write_errors.inc("direct")
+        raise
+    metrics.firestore_write_duration.observe(time.perf_counter() - started, "direct")
+    from profiles import profile_cache
+    profile_cache.apply_delta(uid, amount, committed=True)  # 🔥 [NEW] 캐시된 잔액도 같이 갱신 (다른 워커 캐시는 무효화)
+    return True